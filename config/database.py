@@ -14,11 +14,38 @@ DATABASE_CONFIG = {
     'timeout': 30
 }
 
+# Einstellungen für den Verbindungspool
+POOL_CONFIG = {
+    'min_size': 1,             # Verbindungen, die auch im Leerlauf offen bleiben
+    'max_size': 10,            # Obergrenze gleichzeitig geöffneter Verbindungen
+    'checkout_timeout': 30,    # Sekunden Wartezeit auf eine freie Verbindung
+    'idle_timeout': 300,       # Sekunden, nach denen überzählige Verbindungen geschlossen werden
+    'max_lifetime': 1800,      # Sekunden, nach denen eine Verbindung erneuert wird
+    'ping_after': 30,          # Leerlauf in Sekunden, ab dem vor der Ausgabe geprüft wird
+}
+
+# Einstellungen für den Ergebnis-Cache der Raumbuch-Daten
+RAUMBUCH_CACHE_CONFIG = {
+    'enabled': True,
+    'ttl': 300,                         # Sekunden bis zur erneuten Versionsprüfung
+    'max_entries': 50,                  # Maximale Anzahl gecachter Standorte
+    'max_bytes': 100 * 1024 * 1024,     # Geschätzte Obergrenze für den Speicherbedarf
+}
+
+# Anzahl Zeilen, die beim Streaming pro fetchmany()-Aufruf gelesen werden
+FETCH_BATCH_SIZE = 1000
+
+# Einstellungen für die im Speicher gehaltene Standortliste
+STANDORT_INDEX_CONFIG = {
+    'refresh_interval': 600,  # Sekunden, nach denen im Hintergrund neu geladen wird
+}
+
 # Default ID für den Standort, falls nicht explizit angegeben
 DEFAULT_STANDORT_ID = 1
 
-# SQL-Query für die Raumbuch-Auswertung
-RAUMBUCH_QUERY = """
+# SQL-Query für die Raumbuch-Auswertung, aufgeteilt in Spalten/Joins, Standortfilter
+# und Sortierung, damit zusätzliche Filterbedingungen eingefügt werden können
+RAUMBUCH_BASE_QUERY = """
 SELECT
   Raumbuch.ID
  ,Raumbuch.Raumnummer
@@ -51,8 +78,12 @@ INNER JOIN BIRD.Reinigungsintervall WITH (NOLOCK) ON Reinigungsintervall.ID = Ra
 LEFT OUTER JOIN BIRD.ReinigungsTage WITH (NOLOCK) ON ReinigungsTage.ID = Raumbuch.ReinigungsTage_ID
 LEFT OUTER JOIN BIRD.ReinigungsintervallTage WITH (NOLOCK) ON ReinigungsintervallTage.Reinigungsintervall_ID = Raumbuch.Reinigungsintervall_ID
   AND ReinigungsintervallTage.Anzahl = Raumbuch.Anzahl
-WHERE Raumbuch.Standort_ID = ?
-ORDER BY
+"""
+
+RAUMBUCH_WHERE = """WHERE Raumbuch.Standort_ID = ?
+"""
+
+RAUMBUCH_ORDER_BY = """ORDER BY
   Gebaeudeteil.Bezeichnung
  ,Etage.Bezeichnung
  ,Bereich.Bezeichnung
@@ -60,6 +91,105 @@ ORDER BY
  ,Raumbuch.Bezeichnung
 """
 
+RAUMBUCH_QUERY = RAUMBUCH_BASE_QUERY + RAUMBUCH_WHERE + RAUMBUCH_ORDER_BY
+
+# Filter der Auswertung: Name des Request-Parameters -> Ergebnisspalte und SQL-Ausdruck
+RAUMBUCH_FILTERS = {
+    'bereich': {'column': 'Bereich', 'sql': 'Bereich.Bezeichnung'},
+    'gebaeudeteil': {'column': 'Gebaeudeteil', 'sql': 'Gebaeudeteil.Bezeichnung'},
+    'etage': {'column': 'Etage', 'sql': 'Etage.Bezeichnung'},
+    'rg': {'column': 'RG', 'sql': 'Reinigungsgruppe.Bezeichnung'},
+}
+
+# Aggregation für die Zusammenfassung (Kennzahlen gesamt, je Bereich und je
+# Reinigungsgruppe) in einem Roundtrip. Aggregiert wird über die Spalten und Joins
+# der Raumbuch-Abfrage; {where} wird durch RAUMBUCH_WHERE und Filter ersetzt.
+RAUMBUCH_SUMMARY_QUERY = """
+SELECT
+  GROUPING(Raumbuch.Bereich) GruppeBereich
+ ,GROUPING(Raumbuch.RG) GruppeRG
+ ,Raumbuch.Bereich
+ ,Raumbuch.RG
+ ,COUNT(*) Anzahl
+ ,SUM(Raumbuch.qm) qm
+ ,SUM(Raumbuch.qmMonat) qmMonat
+ ,SUM(Raumbuch.WertMonat) WertMonat
+ ,SUM(Raumbuch.WertJahr) WertJahr
+ ,SUM(Raumbuch.StundenMonat) StundenMonat
+FROM (""" + RAUMBUCH_BASE_QUERY + """{where}) Raumbuch
+GROUP BY GROUPING SETS ((), (Raumbuch.Bereich), (Raumbuch.RG))
+ORDER BY
+  GruppeBereich
+ ,GruppeRG
+ ,Raumbuch.Bereich
+ ,Raumbuch.RG
+"""
+
+# Auswahlwerte der Filter (vorkommende Bereiche, Gebäudeteile, Etagen und
+# Reinigungsgruppen) in einem Roundtrip; {where} wie bei RAUMBUCH_SUMMARY_QUERY
+RAUMBUCH_FILTER_OPTIONS_QUERY = """
+SELECT
+  GROUPING(Raumbuch.Bereich) GruppeBereich
+ ,GROUPING(Raumbuch.Gebaeudeteil) GruppeGebaeudeteil
+ ,GROUPING(Raumbuch.Etage) GruppeEtage
+ ,GROUPING(Raumbuch.RG) GruppeRG
+ ,Raumbuch.Bereich
+ ,Raumbuch.Gebaeudeteil
+ ,Raumbuch.Etage
+ ,Raumbuch.RG
+FROM (""" + RAUMBUCH_BASE_QUERY + """{where}) Raumbuch
+GROUP BY GROUPING SETS ((Raumbuch.Bereich), (Raumbuch.Gebaeudeteil), (Raumbuch.Etage), (Raumbuch.RG))
+"""
+
+# Eine sortierte Seite der Raumbuch-Abfrage; {columns} und {order_by} enthalten nur
+# Spalten aus RAUMBUCH_COLUMNS, {where} wie bei RAUMBUCH_SUMMARY_QUERY.
+# Gesamt liefert die Anzahl aller gefilterten Räume ohne zweite Abfrage.
+RAUMBUCH_PAGE_QUERY = """
+SELECT
+  {columns}
+ ,COUNT(*) OVER () Gesamt
+FROM (""" + RAUMBUCH_BASE_QUERY + """{where}) Raumbuch
+ORDER BY
+  {order_by}
+OFFSET ? ROWS FETCH NEXT ? ROWS ONLY
+"""
+
+# Standardsortierung einer Seite, entspricht RAUMBUCH_ORDER_BY
+RAUMBUCH_PAGE_ORDER_BY = ('Gebaeudeteil', 'Etage', 'Bereich', 'Raumnummer', 'Bezeichnung')
+
+# Günstige Versionsabfrage für den Raumbuch-Cache: ändert sich, sobald Räume
+# eines Standorts hinzukommen, gelöscht oder bearbeitet werden, die Preise des
+# Standorts (WertMonat, WertJahr) oder die Bezeichnungen und Reinigungstage der
+# verknüpften Tabellen geändert werden. Die Standort-ID wird nur einmal übergeben,
+# damit die Abfrage anderen Abfragen vorangestellt werden kann.
+RAUMBUCH_VERSION_QUERY = """
+SELECT
+  Version.Anzahl
+ ,Version.MaxID
+ ,Version.Pruefsumme
+ ,BINARY_CHECKSUM(Standort.Preis, Standort.Preis7Tage) PruefsummeStandort
+ ,(SELECT CHECKSUM_AGG(BINARY_CHECKSUM(Bereich.ID, Bereich.Bezeichnung)) FROM BIRD.Bereich WITH (NOLOCK)
+   WHERE Bereich.Standort_ID = Parameter.Standort_ID) PruefsummeBereich
+ ,(SELECT CHECKSUM_AGG(BINARY_CHECKSUM(Gebaeudeteil.ID, Gebaeudeteil.Bezeichnung)) FROM BIRD.Gebaeudeteil WITH (NOLOCK)
+   WHERE Gebaeudeteil.Standort_ID = Parameter.Standort_ID) PruefsummeGebaeudeteil
+ ,(SELECT CHECKSUM_AGG(BINARY_CHECKSUM(Etage.ID, Etage.Bezeichnung)) FROM BIRD.Etage WITH (NOLOCK)
+   WHERE Etage.Standort_ID = Parameter.Standort_ID) PruefsummeEtage
+ ,(SELECT CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM BIRD.Reinigungsgruppe WITH (NOLOCK)) PruefsummeRG
+ ,(SELECT CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM BIRD.Reinigungsintervall WITH (NOLOCK)) PruefsummeIntervall
+ ,(SELECT CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM BIRD.ReinigungsintervallTage WITH (NOLOCK)) PruefsummeIntervallTage
+ ,(SELECT CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM BIRD.ReinigungsTage WITH (NOLOCK)) PruefsummeReinigungstage
+FROM (SELECT ? Standort_ID) Parameter
+LEFT OUTER JOIN BIRD.Standort WITH (NOLOCK) ON Standort.ID = Parameter.Standort_ID
+CROSS APPLY (
+  SELECT
+    COUNT(*) Anzahl
+   ,MAX(Raumbuch.ID) MaxID
+   ,CHECKSUM_AGG(BINARY_CHECKSUM(*)) Pruefsumme
+  FROM BIRD.Raumbuch WITH (NOLOCK)
+  WHERE Raumbuch.Standort_ID = Parameter.Standort_ID
+) Version
+"""
+
 # Query, um alle verfügbaren Standorte zu bekommen
 STANDORTE_QUERY = """
 SELECT ID, Bezeichnung 
@@ -20,6 +20,43 @@ BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 STATIC_FOLDER = os.path.join(BASE_DIR, 'src', 'web', 'static')
 TEMPLATE_FOLDER = os.path.join(BASE_DIR, 'src', 'web', 'templates')
 
+# Kompilierte Templates (Jinja2-Bytecode), gemeinsam für Webseiten und PDF-Export
+TEMPLATE_CONFIG = {
+    'bytecode_cache_dir': os.environ.get('TEMPLATE_CACHE_DIR', os.path.join(BASE_DIR, '.cache', 'jinja2')),
+    'auto_reload': False,    # Templates bei Änderungen ohne Neustart neu laden (Flask: im Debug-Modus aktiv)
+}
+
+# Darstellung der Report-Seite
+REPORT_CONFIG = {
+    'stream': False,            # Tabelle gestreamt ausliefern (je Aufruf über ?stream=1 bzw. ?stream=0 wählbar)
+    'virtual': False,           # Nur sichtbare Zeilen rendern und seitenweise über /api/raumbuch laden (?virtual=1)
+    'client_filter': False,     # Zeilen einmal spaltenweise laden, Filter/Summen/Diagramme im Browser (?client_filter=1)
+    'chunk_size': 16 * 1024,    # Mindestgröße eines gesendeten HTML-Blocks in Zeichen
+}
+
+# JSON-API der Raumbuch-Zeilen
+API_CONFIG = {
+    'page_size': 100,           # Zeilen pro Seite, wenn kein limit angegeben ist
+    'max_page_size': 1000,      # Obergrenze für limit
+}
+
+# Bedingte Anfragen: ETag aus Datenversion und Parametern, 304 bei If-None-Match
+ETAG_CONFIG = {
+    'enabled': True,
+}
+
+# Komprimierung der Antworten (gzip, Brotli falls das Paket installiert ist)
+COMPRESSION_CONFIG = {
+    'enabled': True,
+    'level': 6,                 # gzip-Stufe 1-9
+    'brotli_quality': 5,        # Brotli-Qualität 0-11
+    'min_size': 500,            # Kleinere Antworten bleiben unkomprimiert (Bytes)
+    'mimetypes': (
+        'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript',
+        'application/javascript', 'application/json', 'image/svg+xml',
+    ),
+}
+
 # Export-Einstellungen
 EXPORT_CONFIG = {
     'excel': {
@@ -29,9 +66,45 @@ EXPORT_CONFIG = {
     'pdf': {
         'enabled': True,
         'folder': os.path.join(BASE_DIR, 'exports'),
+        'engine': os.environ.get('PDF_ENGINE', 'html'),   # 'html' (wkhtmltopdf, max. 100 Räume) oder 'native' (alle Räume)
     }
 }
 
+# Wiederverwendung und Aufräumen erzeugter Exportdateien
+EXPORT_CACHE_CONFIG = {
+    'enabled': True,
+    'max_bytes': 500 * 1024 * 1024,   # Obergrenze für alle Dateien in den Export-Ordnern
+    'max_age': 24 * 60 * 60,          # Sekunden, nach denen Dateien gelöscht werden
+    'cleanup_interval': 300,          # Sekunden zwischen zwei Aufräumläufen
+}
+
+# Hintergrund-Warteschlange für Exporte
+EXPORT_JOB_CONFIG = {
+    'max_workers': 2,       # Gleichzeitig ausgeführte Exporte
+    'max_pending': 20,      # Maximale Anzahl wartender und laufender Aufträge
+    'result_ttl': 3600,     # Sekunden, die ein abgeschlossener Auftrag abrufbar bleibt
+}
+
+# Diagramme im PDF-Export
+CHART_CONFIG = {
+    'figsize': (10, 6),      # Bildgröße in Zoll
+    'dpi': 100,
+    'cache_entries': 64,     # Im Speicher gehaltene PNG-Bilder
+}
+
+# Dauerhaft laufende PDF-Renderer für den PDF-Export
+PDF_RENDERER_CONFIG = {
+    'renderer': os.environ.get('PDF_RENDERER', 'wkhtmltopdf'),   # 'wkhtmltopdf' oder 'fake' (ohne wkhtmltopdf)
+    'wkhtmltopdf_path': os.environ.get('WKHTMLTOPDF_PATH'),       # Standard: Suche im PATH
+    'workers': 2,             # Gleichzeitig laufende Renderer
+    'timeout': 60,            # Sekunden je PDF, danach wird der Renderer neu gestartet
+    'acquire_timeout': 120,   # Sekunden, die ein Export auf einen freien Renderer wartet
+    'options': {              # --log-level setzt der Renderer selbst, um Abschluss und Fehler zu erkennen
+        'encoding': 'UTF-8',
+        'page-size': 'A4',
+    },
+}
+
 # Erstellen des Export-Ordners, falls er nicht existiert
 if not os.path.exists(EXPORT_CONFIG['excel']['folder']):
     os.makedirs(EXPORT_CONFIG['excel']['folder'])
\ No newline at end of file
@@ -11,7 +11,7 @@ from src.database import (
     get_standort_by_id
 )
 
-from src.models import RaumbuchEntry
+from src.models import RaumbuchEntry, RaumbuchTable
 
 from src.analysis import (
     calculate_summary,
@@ -29,6 +29,7 @@ __all__ = [
     'get_standorte',
     'get_standort_by_id',
     'RaumbuchEntry',
+    'RaumbuchTable',
     'calculate_summary',
     'prepare_data_for_visualization',
     'export_to_excel',
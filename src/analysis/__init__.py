@@ -4,15 +4,19 @@ Stellt Funktionen zur Datenanalyse und -aufbereitung bereit.
 """
 
 from src.analysis.raumbuch_analysis import (
+    RaumbuchAnalysis,
     calculate_summary,
     prepare_data_for_visualization,
+    prepare_visualization_from_summary,
     export_to_excel,
     export_to_pdf
 )
 
 __all__ = [
+    'RaumbuchAnalysis',
     'calculate_summary',
     'prepare_data_for_visualization',
+    'prepare_visualization_from_summary',
     'export_to_excel',
     'export_to_pdf'
 ]
\ No newline at end of file
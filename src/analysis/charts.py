@@ -0,0 +1,207 @@
+"""
+Thread-sichere Erzeugung der Diagramme für den PDF-Export.
+
+Jedes Diagramm wird auf einer eigenen Figure mit Agg-Canvas in einen BytesIO-Puffer
+gezeichnet, ohne den globalen Zustand von pyplot und ohne temporäre Dateien. Fertige
+PNG-Bilder werden im Speicher zwischengespeichert, sodass wiederholte Exporte mit
+denselben Daten nicht erneut zeichnen.
+"""
+
+import base64
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from config.settings import CHART_CONFIG
+from src.models.coercion import coerce_numeric
+
+# Diagramme des PDF-Exports: Name -> (Schlüssel in den Visualisierungsdaten, Titel,
+# Beschriftung der x-Achse, Beschriftung der y-Achse)
+CHART_DEFINITIONS = OrderedDict([
+    ('bereich_chart', ('bereich_data', 'Quadratmeter nach Bereich', 'Bereich', 'Quadratmeter')),
+    ('rg_chart', ('rg_data', 'Kosten pro Monat nach Reinigungsgruppe', 'Reinigungsgruppe', 'Kosten pro Monat (€)')),
+    ('etage_chart', ('etage_data', 'Stunden pro Monat nach Etage', 'Etage', 'Stunden pro Monat'))
+])
+
+
+def to_data_uri(png: bytes) -> str:
+    """
+    Kodiert ein PNG-Bild als data:-URI.
+
+    Args:
+        png (bytes): PNG-Daten
+
+    Returns:
+        str: URI für das src-Attribut eines img-Elements
+    """
+    return 'data:image/png;base64,' + base64.b64encode(png).decode('ascii')
+
+
+class ChartRenderer:
+    """
+    Zeichnet Balkendiagramme als PNG und hält die Ergebnisse in einem LRU-Cache.
+
+    Der Schlüssel eines Bildes ist ein Hash aus Diagrammname, Daten und Bildgröße.
+    Das Zeichnen selbst benötigt keine Sperre, da jede Abfrage eine eigene Figure
+    verwendet; nur der Cache ist durch eine Sperre geschützt.
+    """
+
+    def __init__(self, max_entries: int = 64, figsize=(10, 6), dpi: int = 100):
+        """
+        Args:
+            max_entries (int): Maximale Anzahl zwischengespeicherter Bilder
+            figsize (tuple): Bildgröße in Zoll
+            dpi (int): Auflösung
+        """
+        self.max_entries = max_entries
+        self.figsize = tuple(figsize)
+        self.dpi = dpi
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def make_key(self, name: str, data: Mapping[Any, Any]) -> str:
+        """
+        Bildet den Cache-Schlüssel eines Diagramms.
+
+        Args:
+            name (str): Name aus CHART_DEFINITIONS
+            data (Mapping): Beschriftung -> Wert
+
+        Returns:
+            str: Hexadezimaler SHA-256-Wert
+        """
+        content = repr((name, [(str(label), float(value)) for label, value in data.items()],
+                        self.figsize, self.dpi))
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def render(self, name: str, data: Mapping[Any, Any]) -> Optional[bytes]:
+        """
+        Liefert ein Diagramm als PNG, aus dem Cache oder neu gezeichnet.
+
+        Args:
+            name (str): Name aus CHART_DEFINITIONS, z.B. 'bereich_chart'
+            data (Mapping): Beschriftung -> Wert, z.B. viz_data['bereich_data']
+
+        Returns:
+            Optional[bytes]: PNG-Daten oder None, wenn keine Daten vorhanden sind
+        """
+        if not data:
+            return None
+
+        data = dict(zip(data.keys(), coerce_numeric(list(data.values())).tolist()))
+        key = self.make_key(name, data)
+
+        with self._lock:
+            png = self._cache.get(key)
+            if png is not None:
+                self._cache.move_to_end(key)
+                self._stats['hits'] += 1
+                return png
+            self._stats['misses'] += 1
+
+        png = self._draw(name, data)
+
+        with self._lock:
+            self._cache[key] = png
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return png
+
+    def render_all(self, charts_data: Optional[Mapping[str, Any]]) -> Dict[str, bytes]:
+        """
+        Erzeugt alle Diagramme, für die Daten vorhanden sind.
+
+        Args:
+            charts_data (Mapping, optional): Visualisierungsdaten wie von prepare_data_for_visualization
+
+        Returns:
+            Dict[str, bytes]: Diagrammname -> PNG-Daten
+        """
+        charts = {}
+        for name, (data_key, _, _, _) in CHART_DEFINITIONS.items():
+            png = self.render(name, (charts_data or {}).get(data_key))
+            if png is not None:
+                charts[name] = png
+        return charts
+
+    def render_data_uris(self, charts_data: Optional[Mapping[str, Any]]) -> Dict[str, str]:
+        """
+        Erzeugt alle Diagramme als data:-URIs zum direkten Einbetten in HTML.
+
+        Args:
+            charts_data (Mapping, optional): Visualisierungsdaten wie von prepare_data_for_visualization
+
+        Returns:
+            Dict[str, str]: Diagrammname -> data:image/png;base64,...
+        """
+        return {name: to_data_uri(png) for name, png in self.render_all(charts_data).items()}
+
+    def clear(self):
+        """Leert den Cache."""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Liefert die Kennzahlen des Caches.
+
+        Returns:
+            Dict[str, int]: Treffer, Fehlzugriffe und Anzahl gespeicherter Bilder
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._cache)
+        return stats
+
+    def draw(self, ax, name: str, data: Mapping[Any, Any], fontsize: Optional[float] = None):
+        """
+        Zeichnet ein Diagramm in vorhandene Achsen, z.B. auf einer Seite des
+        matplotlib-PDF-Exports. Das Ergebnis wird nicht zwischengespeichert.
+
+        Args:
+            ax (Axes): Zielachsen
+            name (str): Name aus CHART_DEFINITIONS, z.B. 'bereich_chart'
+            data (Mapping): Beschriftung -> Wert
+            fontsize (float, optional): Schriftgröße der Beschriftungen, Titel etwas größer
+        """
+        _, title, xlabel, ylabel = CHART_DEFINITIONS[name]
+        values = coerce_numeric(list(data.values())).tolist()
+
+        ax.bar([str(label) for label in data], values)
+        if fontsize:
+            ax.set_title(title, fontsize=fontsize + 3)
+            ax.set_xlabel(xlabel, fontsize=fontsize + 1)
+            ax.set_ylabel(ylabel, fontsize=fontsize + 1)
+            ax.tick_params(labelsize=fontsize)
+        else:
+            ax.set_title(title)
+            ax.set_xlabel(xlabel)
+            ax.set_ylabel(ylabel)
+        ax.tick_params(axis='x', labelrotation=45)
+
+    def _draw(self, name: str, data: Dict[Any, float]) -> bytes:
+        """Zeichnet ein Balkendiagramm auf einer eigenen Figure."""
+        fig = Figure(figsize=self.figsize, dpi=self.dpi)
+        canvas = FigureCanvasAgg(fig)
+        self.draw(fig.add_subplot(), name, data)
+        fig.tight_layout()
+
+        buffer = io.BytesIO()
+        canvas.print_png(buffer)
+        return buffer.getvalue()
+
+
+# Gemeinsamer Renderer für die PDF-Exporte
+chart_renderer = ChartRenderer(
+    max_entries=CHART_CONFIG['cache_entries'],
+    figsize=CHART_CONFIG['figsize'],
+    dpi=CHART_CONFIG['dpi']
+)
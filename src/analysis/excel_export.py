@@ -0,0 +1,171 @@
+"""
+Excel-Export, der Raumbuch-Zeilen in einem Durchlauf mit konstantem Speicherbedarf schreibt.
+"""
+
+import os
+from itertools import islice
+
+import xlsxwriter
+
+from src.models.coercion import coerce_numeric_rows
+from src.models.raumbuch import RAUMBUCH_NUMERIC_COLUMNS
+
+# Kennzahlen der Zusammenfassung und der Gruppenstatistiken
+SUMMARY_TOTAL_FIELDS = {
+    'total_qm': 'qm',
+    'total_qm_monat': 'qmMonat',
+    'total_wert_monat': 'WertMonat',
+    'total_wert_jahr': 'WertJahr',
+    'total_stunden_monat': 'StundenMonat'
+}
+SUMMARY_GROUP_FIELDS = ('qm', 'WertMonat', 'WertJahr', 'StundenMonat')
+
+
+class SummaryAccumulator:
+    """
+    Summiert die Kennzahlen von calculate_summary blockweise während eines Durchlaufs.
+    """
+
+    def __init__(self):
+        self.total_rooms = 0
+        self.totals = {key: 0.0 for key in SUMMARY_TOTAL_FIELDS}
+        self.groups = {'Bereich': {}, 'RG': {}}
+
+    def add(self, rows):
+        """
+        Übernimmt einen Block bereits umgewandelter Zeilen.
+
+        Args:
+            rows (list): Zeilen-Dictionaries mit float-Kennzahlen
+        """
+        if not rows:
+            return
+
+        self.total_rooms += len(rows)
+        for key, field in SUMMARY_TOTAL_FIELDS.items():
+            if field in rows[0]:
+                self.totals[key] += sum(row[field] for row in rows)
+
+        for column, groups in self.groups.items():
+            if column not in rows[0]:
+                continue
+            fields = [field for field in SUMMARY_GROUP_FIELDS if field in rows[0]]
+            for row in rows:
+                key = row[column]
+                if key is None:
+                    continue
+                sums = groups.get(key)
+                if sums is None:
+                    sums = groups[key] = dict.fromkeys(fields, 0.0)
+                for field in fields:
+                    sums[field] += row[field]
+
+    def summary(self):
+        """
+        Liefert die Zusammenfassung in der Struktur von calculate_summary.
+
+        Returns:
+            dict: Zusammenfassende Statistiken, leer wenn keine Zeilen verarbeitet wurden
+        """
+        if not self.total_rooms:
+            return {}
+
+        def group_stats(column):
+            groups = self.groups[column]
+            return [dict({column: key}, **groups[key]) for key in sorted(groups)]
+
+        summary = {'total_rooms': self.total_rooms}
+        summary.update(self.totals)
+        summary['bereich_stats'] = group_stats('Bereich')
+        summary['rg_stats'] = group_stats('RG')
+        return summary
+
+
+def write_rows_to_excel(rows, excel_path, batch_size=1000):
+    """
+    Schreibt Raumbuch-Zeilen blockweise im constant_memory-Modus von xlsxwriter.
+
+    Jede Zeile wird sofort auf die Festplatte geschrieben; gleichzeitig werden die
+    Kennzahlen für die Zusammenfassung summiert, sodass kein DataFrame und kein
+    zweiter Durchlauf nötig sind. Die Zusammenfassungsblätter entsprechen denen
+    von export_to_excel.
+
+    Args:
+        rows (iterable): Raumbuch-Zeilen als Dictionaries, z.B. aus iter_raumbuch_rows
+        excel_path (str): Pfad der zu erstellenden Datei
+        batch_size (int): Anzahl Zeilen, die gemeinsam umgewandelt werden
+
+    Returns:
+        dict: Zusammenfassung wie von calculate_summary, leer (und ohne Datei) wenn keine
+        Zeilen vorhanden sind
+
+    Raises:
+        Exception: Fehler der Zeilenquelle, z.B. des Cursors; die angefangene Datei wird gelöscht
+    """
+    iterator = iter(rows)
+    batch = list(islice(iterator, batch_size))
+    if not batch:
+        return {}
+
+    workbook = xlsxwriter.Workbook(excel_path, {'constant_memory': True})
+    try:
+        format_header = workbook.add_format({'bold': True, 'bg_color': '#DDDDDD', 'border': 1})
+        format_number = workbook.add_format({'num_format': '#,##0.00'})
+
+        # Haupttabelle: Kopfzeile aus der ersten Zeile, danach Zeile für Zeile
+        worksheet = workbook.add_worksheet('Raumbuchdaten')
+        columns = list(batch[0].keys())
+        numeric = [column for column in columns if column in RAUMBUCH_NUMERIC_COLUMNS]
+        for col_num, column in enumerate(columns):
+            if column in numeric:
+                worksheet.set_column(col_num, col_num, None, format_number)
+        worksheet.write_row(0, 0, columns, format_header)
+
+        accumulator = SummaryAccumulator()
+        row_num = 1
+        while batch:
+            batch = [dict(row) for row in batch]
+            coerce_numeric_rows(batch, numeric)
+            for row in batch:
+                worksheet.write_row(row_num, 0, [row.get(column) for column in columns])
+                row_num += 1
+            accumulator.add(batch)
+            batch = list(islice(iterator, batch_size))
+
+        summary = accumulator.summary()
+
+        # Zusammenfassung aus den im selben Durchlauf gesammelten Summen
+        worksheet = workbook.add_worksheet('Zusammenfassung')
+        worksheet.write_row(0, 0, ['Metrik', 'Wert'], format_header)
+        metrics = [
+            ('Anzahl Räume', summary['total_rooms']),
+            ('Gesamtfläche (qm)', summary['total_qm']),
+            ('Gesamtkosten pro Monat (€)', summary['total_wert_monat']),
+            ('Gesamtkosten pro Jahr (€)', summary['total_wert_jahr']),
+            ('Gesamtstunden pro Monat', summary['total_stunden_monat'])
+        ]
+        for row_num, metric in enumerate(metrics, start=1):
+            worksheet.write_row(row_num, 0, metric)
+
+        for sheet_name, column, stats in (('Nach Bereich', 'Bereich', summary['bereich_stats']),
+                                          ('Nach Reinigungsgruppe', 'RG', summary['rg_stats'])):
+            if not stats:
+                continue
+            worksheet = workbook.add_worksheet(sheet_name)
+            header = [column] + [field for field in SUMMARY_GROUP_FIELDS if field in stats[0]]
+            worksheet.set_column(1, len(header) - 1, None, format_number)
+            worksheet.write_row(0, 0, header, format_header)
+            for row_num, item in enumerate(stats, start=1):
+                worksheet.write_row(row_num, 0, [item[field] for field in header])
+    except Exception:
+        # Keine unvollständige Arbeitsmappe im Export-Ordner zurücklassen
+        try:
+            workbook.close()
+        except Exception:
+            pass
+        if os.path.exists(excel_path):
+            os.remove(excel_path)
+        raise
+
+    workbook.close()
+    return summary
@@ -0,0 +1,204 @@
+"""
+Wiederverwendung erzeugter Exportdateien und Aufräumen der Export-Ordner.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from config.settings import EXPORT_CONFIG, EXPORT_CACHE_CONFIG
+
+# Logging konfigurieren
+logger = logging.getLogger(__name__)
+
+# Dateiendung je Exportformat
+EXPORT_EXTENSIONS = {
+    'excel': 'xlsx',
+    'pdf': 'pdf'
+}
+
+
+class ExportCache:
+    """
+    Inhaltsadressierter Cache für Exportdateien.
+
+    Der Dateiname einer Exportdatei wird aus Standort, Filtern, Datenversion und Format
+    abgeleitet. Existiert die Datei bereits, wird sie ausgeliefert statt neu erzeugt.
+    Beim Ablegen werden die Export-Ordner (einschließlich Unterordnern wie charts/)
+    nach Alter und Gesamtgröße aufgeräumt.
+    """
+
+    def __init__(self, folders: Dict[str, str], max_bytes: int = 500 * 1024 * 1024,
+                 max_age: float = 24 * 60 * 60, cleanup_interval: float = 300):
+        """
+        Args:
+            folders (Dict[str, str]): Export-Ordner je Format, z.B. {'excel': ..., 'pdf': ...}
+            max_bytes (int): Obergrenze für die Größe aller Dateien in den Export-Ordnern
+            max_age (float): Sekunden, nach denen Dateien gelöscht werden
+            cleanup_interval (float): Mindestabstand zwischen zwei Aufräumläufen in Sekunden
+        """
+        self.folders = dict(folders)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.cleanup_interval = cleanup_interval
+
+        self._lock = threading.Lock()
+        self._last_cleanup = 0.0
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'removed': 0}
+
+    @staticmethod
+    def make_key(standort_id: int, filters: Tuple, version: Any, export_format: str) -> str:
+        """
+        Bildet den Schlüssel einer Exportdatei.
+
+        Args:
+            standort_id (int): ID des Standorts
+            filters (tuple): Normalisierte Filter aus normalize_filters
+            version: Datenversion aus get_raumbuch_version
+            export_format (str): 'excel' oder 'pdf'
+
+        Returns:
+            str: Hexadezimaler SHA-256-Wert
+        """
+        content = repr((standort_id, tuple(filters), version, export_format))
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str, export_format: str) -> str:
+        """
+        Liefert den Pfad der Exportdatei zu einem Schlüssel.
+
+        Args:
+            key (str): Schlüssel aus make_key
+            export_format (str): 'excel' oder 'pdf'
+
+        Returns:
+            str: Dateipfad im Export-Ordner des Formats
+        """
+        return os.path.join(self.folders[export_format],
+                            f"Raumbuch_{key[:32]}.{EXPORT_EXTENSIONS[export_format]}")
+
+    def get(self, key: str, export_format: str) -> Optional[str]:
+        """
+        Liefert eine vorhandene, nicht abgelaufene Exportdatei.
+
+        Args:
+            key (str): Schlüssel aus make_key
+            export_format (str): 'excel' oder 'pdf'
+
+        Returns:
+            Optional[str]: Dateipfad oder None
+        """
+        path = self.path_for(key, export_format)
+        try:
+            if time.time() - os.path.getmtime(path) < self.max_age:
+                # Zugriffszeitpunkt für die Verdrängung der am längsten ungenutzten Dateien
+                os.utime(path)
+                with self._lock:
+                    self._stats['hits'] += 1
+                return path
+        except OSError:
+            pass
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def put(self, key: str, export_format: str, source_path: str,
+            keep: Optional[Iterable[str]] = None) -> str:
+        """
+        Übernimmt eine frisch erzeugte Exportdatei unter ihrem Schlüssel.
+
+        Args:
+            key (str): Schlüssel aus make_key
+            export_format (str): 'excel' oder 'pdf'
+            source_path (str): Pfad der erzeugten Datei, sie wird verschoben
+            keep (Iterable[str], optional): Weitere Dateien, die beim Aufräumen erhalten bleiben,
+                z.B. Ergebnisse noch abrufbarer Exportaufträge
+
+        Returns:
+            str: Neuer Pfad der Datei
+        """
+        path = self.path_for(key, export_format)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(source_path, path)
+
+        with self._lock:
+            self._stats['stores'] += 1
+
+        self.cleanup(keep=[path, *(keep or ())])
+        return path
+
+    def cleanup(self, keep: Optional[Iterable[str]] = None, force: bool = False) -> int:
+        """
+        Löscht abgelaufene Dateien und danach die am längsten ungenutzten Dateien,
+        bis die Größenobergrenze eingehalten wird.
+
+        Args:
+            keep (Iterable[str], optional): Dateien, die in jedem Fall erhalten bleiben
+            force (bool): Auch vor Ablauf des Aufräumintervalls aufräumen
+
+        Returns:
+            int: Anzahl gelöschter Dateien
+        """
+        now = time.time()
+        with self._lock:
+            if not force and now - self._last_cleanup < self.cleanup_interval:
+                return 0
+            self._last_cleanup = now
+
+        files = []
+        for folder in set(self.folders.values()):
+            for root, _, names in os.walk(folder):
+                for name in names:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+
+        keep = {os.path.abspath(path) for path in keep or ()}
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        removed = 0
+
+        for mtime, size, path in files:
+            if os.path.abspath(path) in keep:
+                continue
+            if now - mtime < self.max_age and total <= self.max_bytes:
+                continue
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Exportdatei konnte nicht gelöscht werden: {e}")
+                continue
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"Export-Ordner aufgeräumt: {removed} Dateien gelöscht")
+            with self._lock:
+                self._stats['removed'] += removed
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Liefert die Kennzahlen des Caches.
+
+        Returns:
+            Dict[str, int]: Treffer, Fehlzugriffe, abgelegte und gelöschte Dateien
+        """
+        with self._lock:
+            return dict(self._stats)
+
+
+# Gemeinsamer Cache für die Export-Routen
+export_cache = ExportCache(
+    {export_format: EXPORT_CONFIG[export_format]['folder'] for export_format in EXPORT_EXTENSIONS},
+    max_bytes=EXPORT_CACHE_CONFIG['max_bytes'],
+    max_age=EXPORT_CACHE_CONFIG['max_age'],
+    cleanup_interval=EXPORT_CACHE_CONFIG['cleanup_interval']
+)
@@ -0,0 +1,238 @@
+"""
+PDF-Export, der Tabelle, Zusammenfassung und Diagramme direkt mit matplotlib zeichnet.
+
+Anders als der HTML-Export über wkhtmltopdf enthält er alle Räume: Die Zeilen werden
+seitenweise gelesen und geschrieben, sodass der Speicherbedarf nicht mit der Anzahl
+der Räume wächst.
+"""
+
+import threading
+from datetime import datetime
+from itertools import islice
+
+import matplotlib
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+from src.analysis.charts import chart_renderer
+from src.analysis.excel_export import SummaryAccumulator
+from src.models.coercion import coerce_numeric_rows
+
+# DIN A4 quer in Zoll
+PAGE_SIZE = (11.69, 8.27)
+
+# Tabellenzeilen pro Seite
+PDF_ROWS_PER_PAGE = 40
+
+# Spalten der Raumtabelle: (Spalte, Überschrift, linke Kante als Anteil der Seitenbreite,
+# maximale Zeichen, numerisch)
+PDF_TABLE_COLUMNS = (
+    ('Raumnummer', 'Raum', 0.03, 10, False),
+    ('Bezeichnung', 'Bezeichnung', 0.10, 28, False),
+    ('Bereich', 'Bereich', 0.28, 18, False),
+    ('Gebaeudeteil', 'Gebäudeteil', 0.40, 16, False),
+    ('Etage', 'Etage', 0.51, 8, False),
+    ('RG', 'RG', 0.57, 4, False),
+    ('Intervall', 'Intervall', 0.61, 12, False),
+    ('qm', 'qm', 0.75, None, True),
+    ('WertMonat', 'Wert/Monat', 0.83, None, True),
+    ('StundenMonat', 'Std./Monat', 0.90, None, True),
+    ('WertJahr', 'Wert/Jahr', 0.97, None, True)
+)
+
+# Kennzahlen der Zusammenfassungsseite
+SUMMARY_METRICS = (
+    ('Anzahl Räume', 'total_rooms', False),
+    ('Gesamtfläche (qm)', 'total_qm', True),
+    ('Gesamtkosten pro Monat (€)', 'total_wert_monat', True),
+    ('Gesamtkosten pro Jahr (€)', 'total_wert_jahr', True),
+    ('Gesamtstunden pro Monat', 'total_stunden_monat', True)
+)
+
+FONT_SIZE = 7
+LINE_SPACING = 1.6
+
+# Standardschriften des PDF-Formats statt eingebetteter Glyphen: deutlich schneller und kleiner
+PDF_RC_PARAMS = {
+    'pdf.use14corefonts': True,
+    'font.family': 'sans-serif',
+    'font.sans-serif': ['Helvetica']
+}
+
+# rcParams sind prozessweit; gleichzeitige Exporte dürfen sie nicht gegenseitig zurücksetzen.
+# Die Sperre wird nur für das Schreiben einzelner Seiten gehalten, siehe _save_page.
+_rc_lock = threading.Lock()
+
+
+def format_number(value):
+    """
+    Formatiert eine Zahl mit zwei Nachkommastellen im deutschen Format.
+
+    Args:
+        value: Zahl oder None
+
+    Returns:
+        str: Formatierte Zahl, leer für None
+    """
+    if value is None:
+        return ''
+    return f"{value:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+
+
+def _format_cell(value, max_chars, numeric):
+    """Formatiert einen Tabellenwert und kürzt zu lange Texte."""
+    if numeric:
+        return format_number(value)
+    text = '' if value is None else str(value)
+    if max_chars and len(text) > max_chars:
+        text = text[:max_chars - 1] + '…'
+    return text
+
+
+def _draw_columns(fig, columns, rows, top):
+    """
+    Zeichnet eine Tabelle mit einem Textobjekt je Spalte statt je Zelle.
+
+    Args:
+        fig (Figure): Seite
+        columns (Sequence): Spaltendefinitionen wie PDF_TABLE_COLUMNS
+        rows (list): Zeilen-Dictionaries
+        top (float): Obere Kante der Kopfzeile als Anteil der Seitenhöhe
+    """
+    for column, label, x, max_chars, numeric in columns:
+        align = 'right' if numeric else 'left'
+        fig.text(x, top, label, ha=align, va='top', fontsize=FONT_SIZE, fontweight='bold')
+        fig.text(
+            x, top - 0.025,
+            '\n'.join(_format_cell(row.get(column), max_chars, numeric) for row in rows),
+            ha=align, va='top', multialignment=align, fontsize=FONT_SIZE, linespacing=LINE_SPACING
+        )
+    fig.add_artist(_rule(top - 0.02))
+
+
+def _rule(y):
+    """Erstellt eine waagerechte Linie unter einer Kopfzeile."""
+    return Line2D([0.03, 0.97], [y, y], linewidth=0.5, color='#888888')
+
+
+def _new_page(title, timestamp, page):
+    """Erstellt eine Seite mit Kopf- und Fußzeile."""
+    fig = Figure(figsize=PAGE_SIZE)
+    fig.text(0.03, 0.96, title, ha='left', va='top', fontsize=12, fontweight='bold')
+    fig.text(0.97, 0.96, timestamp, ha='right', va='top', fontsize=8)
+    fig.text(0.97, 0.02, f"Seite {page}", ha='right', va='bottom', fontsize=7)
+    return fig
+
+
+def _save_page(pdf, fig):
+    """
+    Schreibt eine Seite mit den Standardschriften des PDF-Formats.
+
+    Schriften werden erst beim Zeichnen aufgelöst, daher genügt es, die rcParams
+    nur währenddessen zu setzen. Gleichzeitige Exporte lesen und formatieren ihre
+    Zeilen außerhalb der Sperre und warten nur auf das Zeichnen einer Seite.
+    """
+    with _rc_lock, matplotlib.rc_context(PDF_RC_PARAMS):
+        pdf.savefig(fig)
+
+
+def _write_overview(pdf, title, timestamp, summary, charts_data, page):
+    """
+    Schreibt Zusammenfassung, Diagramme und Gruppenstatistiken.
+
+    Returns:
+        int: Nummer der nächsten Seite
+    """
+    fig = _new_page(title, timestamp, page)
+    fig.text(0.03, 0.88, 'Zusammenfassung', fontsize=11, fontweight='bold', va='top')
+    fig.text(0.03, 0.84, '\n'.join(label for label, _, _ in SUMMARY_METRICS),
+             va='top', fontsize=9, linespacing=LINE_SPACING)
+    fig.text(0.40, 0.84, '\n'.join(
+        format_number(summary.get(key, 0)) if numeric else str(summary.get(key, 0))
+        for _, key, numeric in SUMMARY_METRICS
+    ), ha='right', va='top', multialignment='right', fontsize=9, linespacing=LINE_SPACING)
+
+    charts_data = charts_data or {}
+    bereich_data = charts_data.get('bereich_data') or {
+        item['Bereich']: item['qm'] for item in summary.get('bereich_stats') or []
+    }
+    rg_data = charts_data.get('rg_data') or {
+        item['RG']: item['WertMonat'] for item in summary.get('rg_stats') or []
+    }
+    if bereich_data:
+        chart_renderer.draw(fig.add_axes([0.08, 0.12, 0.38, 0.38]), 'bereich_chart', bereich_data, fontsize=7)
+    if rg_data:
+        chart_renderer.draw(fig.add_axes([0.57, 0.12, 0.38, 0.38]), 'rg_chart', rg_data, fontsize=7)
+    _save_page(pdf, fig)
+    page += 1
+
+    for column, heading in (('Bereich', 'Nach Bereich'), ('RG', 'Nach Reinigungsgruppe')):
+        stats = summary.get('bereich_stats' if column == 'Bereich' else 'rg_stats')
+        if not stats:
+            continue
+        columns = [(column, column, 0.03, 30, False)] + [
+            (field, field, 0.30 + 0.12 * i, None, True)
+            for i, field in enumerate(f for f in ('qm', 'WertMonat', 'WertJahr', 'StundenMonat') if f in stats[0])
+        ]
+        for start in range(0, len(stats), PDF_ROWS_PER_PAGE):
+            fig = _new_page(title, timestamp, page)
+            fig.text(0.03, 0.90, heading, fontsize=11, fontweight='bold', va='top')
+            _draw_columns(fig, columns, stats[start:start + PDF_ROWS_PER_PAGE], 0.85)
+            _save_page(pdf, fig)
+            page += 1
+
+    return page
+
+
+def write_rows_to_pdf(rows, pdf_path, title, summary=None, charts_data=None,
+                      rows_per_page=PDF_ROWS_PER_PAGE, columns=PDF_TABLE_COLUMNS):
+    """
+    Schreibt alle Raumbuch-Zeilen seitenweise mit dem PdfPages-Backend von matplotlib.
+
+    Jede Tabellenseite wird sofort in die Datei geschrieben. Ist eine Zusammenfassung
+    übergeben, steht sie mit den Diagrammen am Anfang; andernfalls wird sie während
+    des Durchlaufs summiert und am Ende angefügt.
+
+    Args:
+        rows (iterable): Raumbuch-Zeilen als Dictionaries, z.B. aus iter_raumbuch_rows
+        pdf_path (str): Pfad der zu erstellenden Datei
+        title (str): Titel in der Kopfzeile jeder Seite
+        summary (dict, optional): Zusammenfassung wie von calculate_summary
+        charts_data (dict, optional): Diagrammdaten wie von prepare_visualization_from_summary
+        rows_per_page (int): Tabellenzeilen pro Seite
+        columns (Sequence): Spaltendefinitionen wie PDF_TABLE_COLUMNS
+
+    Returns:
+        dict: Verwendete Zusammenfassung, leer (und ohne Datei) wenn keine Zeilen vorhanden sind
+    """
+    iterator = iter(rows)
+    batch = list(islice(iterator, rows_per_page))
+    if not batch:
+        return {}
+
+    timestamp = datetime.now().strftime("%d.%m.%Y %H:%M:%S")
+    accumulator = None if summary else SummaryAccumulator()
+
+    with PdfPages(pdf_path, metadata={'Title': title}) as pdf:
+        page = 1
+        if summary:
+            page = _write_overview(pdf, title, timestamp, summary, charts_data, page)
+
+        while batch:
+            batch = coerce_numeric_rows([dict(row) for row in batch])
+            if accumulator is not None:
+                accumulator.add(batch)
+
+            fig = _new_page(title, timestamp, page)
+            _draw_columns(fig, columns, batch, 0.90)
+            _save_page(pdf, fig)
+            page += 1
+
+            batch = list(islice(iterator, rows_per_page))
+
+        if accumulator is not None:
+            summary = accumulator.summary()
+            _write_overview(pdf, title, timestamp, summary, charts_data, page)
+
+    return summary
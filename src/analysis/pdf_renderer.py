@@ -0,0 +1,448 @@
+"""
+Dienst zum Rendern von PDF-Dateien aus HTML mit dauerhaft laufenden Renderern.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import pdfkit
+
+from config.settings import PDF_RENDERER_CONFIG
+
+# Logging konfigurieren
+logger = logging.getLogger(__name__)
+
+
+class PdfRenderError(Exception):
+    """Wird ausgelöst, wenn ein PDF nicht erzeugt werden konnte."""
+
+
+class PdfRenderTimeout(PdfRenderError):
+    """Wird ausgelöst, wenn ein Renderauftrag sein Zeitlimit überschreitet."""
+
+
+def _pdf_complete(path: str) -> bool:
+    """Prüft, ob eine PDF-Datei vollständig geschrieben wurde (Endmarke %%EOF)."""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 1024))
+            return b'%%EOF' in f.read()
+    except OSError:
+        return False
+
+
+# Meldungen von wkhtmltopdf auf stderr (ab --log-level info), die das Ende eines Auftrags anzeigen
+WKHTMLTOPDF_DONE = 'Done'
+WKHTMLTOPDF_ERRORS = ('Error:', 'Exit with code')
+
+# Optionen, die der Renderer selbst setzt, weil er die Meldungen je Auftrag auswertet
+WKHTMLTOPDF_RESERVED_OPTIONS = ('quiet', 'q', 'log-level')
+
+
+def _quote_argument(value: str) -> str:
+    """Setzt ein Argument für eine Befehlszeile von --read-args-from-stdin in Anführungszeichen."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class WkhtmltopdfRenderer:
+    """
+    Hält einen wkhtmltopdf-Prozess im Modus --read-args-from-stdin offen.
+
+    Jeder Auftrag wird als eigene Befehlszeile an den laufenden Prozess geschickt,
+    sodass Prozessstart und Initialisierung von Qt nur einmal anfallen. Ein Hilfsthread
+    liest die Meldungen von stderr: "Done" schließt einen Auftrag ab, "Error: ..." oder
+    "Exit with code ..." lassen ihn sofort fehlschlagen, statt bis zum Zeitlimit zu warten.
+    """
+
+    def __init__(self, binary: Optional[str] = None, options: Optional[Dict[str, str]] = None,
+                 poll_interval: float = 0.05):
+        """
+        Args:
+            binary (str, optional): Pfad zu wkhtmltopdf, sonst Suche über pdfkit
+            options (Dict[str, str], optional): wkhtmltopdf-Optionen ohne führende Striche;
+                quiet und log-level werden ignoriert
+            poll_interval (float): Sekunden zwischen zwei Prüfungen, ob der Prozess noch läuft
+        """
+        self.binary = binary
+        self.options = {name: value for name, value in (options or {}).items()
+                        if name not in WKHTMLTOPDF_RESERVED_OPTIONS}
+        self.poll_interval = poll_interval
+        self._process = None
+        self._messages = None
+
+    @property
+    def alive(self) -> bool:
+        """bool: True, wenn der wkhtmltopdf-Prozess läuft."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        """Startet den wkhtmltopdf-Prozess, falls er nicht bereits läuft."""
+        if self.alive:
+            return
+
+        binary = self.binary or pdfkit.configuration().wkhtmltopdf
+        if isinstance(binary, bytes):
+            binary = binary.decode('utf-8')
+
+        self._process = subprocess.Popen(
+            [binary, '--read-args-from-stdin'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        )
+        self._messages = queue.Queue()
+        threading.Thread(
+            target=self._read_messages,
+            args=(self._process.stderr, self._messages),
+            name=f'wkhtmltopdf-{self._process.pid}',
+            daemon=True
+        ).start()
+        logger.info(f"wkhtmltopdf-Renderer gestartet (PID {self._process.pid})")
+
+    @staticmethod
+    def _read_messages(stream, messages: queue.Queue):
+        """Überträgt die Meldungen von stderr zeilenweise in die Queue, bis der Prozess endet."""
+        for line in stream:
+            line = line.strip()
+            if line:
+                messages.put(line)
+
+    def render(self, html: str, output_path: str, timeout: float):
+        """
+        Rendert HTML in eine PDF-Datei.
+
+        Args:
+            html (str): Vollständiges HTML-Dokument
+            output_path (str): Pfad der zu erstellenden PDF-Datei
+            timeout (float): Maximale Dauer in Sekunden
+
+        Raises:
+            PdfRenderTimeout: Wenn das Zeitlimit überschritten wird
+            PdfRenderError: Wenn wkhtmltopdf einen Fehler meldet, der Prozess beendet wurde
+                oder nicht gestartet werden konnte
+        """
+        self.start()
+
+        # HTML im temporären Verzeichnis, damit das Aufräumen der Export-Ordner es nicht erfasst
+        fd, html_path = tempfile.mkstemp(suffix='.html')
+        partial_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.part.pdf"
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(html)
+
+            arguments = ['--log-level', 'info']
+            for name, value in self.options.items():
+                arguments.append(f'--{name}')
+                if value not in (None, ''):
+                    arguments.append(_quote_argument(str(value)))
+            arguments += [_quote_argument(html_path), _quote_argument(partial_path)]
+
+            # Verbliebene Meldungen früherer Aufträge verwerfen
+            while not self._messages.empty():
+                self._messages.get_nowait()
+
+            try:
+                self._process.stdin.write(' '.join(arguments) + '\n')
+                self._process.stdin.flush()
+            except (OSError, ValueError) as e:
+                self.close()
+                raise PdfRenderError(f"wkhtmltopdf ist nicht erreichbar: {e}")
+
+            self._wait_for_result(partial_path, timeout)
+            os.replace(partial_path, output_path)
+        finally:
+            for path in (html_path, partial_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _wait_for_result(self, partial_path: str, timeout: float):
+        """
+        Wartet auf die Abschlussmeldung des laufenden Auftrags.
+
+        Args:
+            partial_path (str): Vorläufige Ausgabedatei des Auftrags
+            timeout (float): Maximale Dauer in Sekunden
+
+        Raises:
+            PdfRenderTimeout: Wenn das Zeitlimit überschritten wird
+            PdfRenderError: Bei einer Fehlermeldung, unvollständiger Datei oder beendetem Prozess
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # Ein hängender Prozess kann keine weiteren Aufträge bearbeiten
+                self.close()
+                raise PdfRenderTimeout(f"PDF-Erstellung nach {timeout} Sekunden abgebrochen")
+
+            try:
+                message = self._messages.get(timeout=min(self.poll_interval, remaining))
+            except queue.Empty:
+                if not self.alive:
+                    self.close()
+                    raise PdfRenderError("wkhtmltopdf wurde während des Renderns beendet")
+                continue
+
+            if message.startswith(WKHTMLTOPDF_ERRORS):
+                raise PdfRenderError(f"wkhtmltopdf: {message}")
+            if message == WKHTMLTOPDF_DONE:
+                if not _pdf_complete(partial_path):
+                    raise PdfRenderError("wkhtmltopdf hat keine vollständige PDF-Datei geschrieben")
+                return
+
+    def close(self):
+        """Beendet den wkhtmltopdf-Prozess."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+class FakePdfRenderer:
+    """
+    Renderer ohne wkhtmltopdf für Tests und Entwicklungsumgebungen.
+
+    Schreibt ein minimales, gültiges PDF mit einer leeren Seite und zählt Starts und
+    Aufträge, damit sich Wiederverwendung und Nebenläufigkeit des Pools prüfen lassen.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        """
+        Args:
+            delay (float): Simulierte Renderdauer in Sekunden
+        """
+        self.delay = delay
+        self.starts = 0
+        self.renders = 0
+        self.closed = False
+        self._started = False
+
+    @property
+    def alive(self) -> bool:
+        """bool: True, wenn der Renderer gestartet und nicht geschlossen wurde."""
+        return self._started and not self.closed
+
+    def start(self):
+        """Simuliert den Start eines Renderprozesses."""
+        if not self._started:
+            self._started = True
+            self.starts += 1
+
+    def render(self, html: str, output_path: str, timeout: float):
+        """
+        Schreibt ein minimales PDF.
+
+        Args:
+            html (str): HTML-Dokument, wird nur gezählt
+            output_path (str): Pfad der zu erstellenden PDF-Datei
+            timeout (float): Maximale Dauer in Sekunden
+
+        Raises:
+            PdfRenderTimeout: Wenn delay das Zeitlimit überschreitet
+        """
+        self.start()
+        if self.delay > timeout:
+            time.sleep(timeout)
+            raise PdfRenderTimeout(f"PDF-Erstellung nach {timeout} Sekunden abgebrochen")
+        time.sleep(self.delay)
+
+        objects = [
+            b'<< /Type /Catalog /Pages 2 0 R >>',
+            b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >>'
+        ]
+        content = b'%PDF-1.4\n'
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(content))
+            content += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+        xref = len(content)
+        content += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+        content += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+        content += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+
+        with open(output_path, 'wb') as f:
+            f.write(content)
+        self.renders += 1
+
+    def close(self):
+        """Markiert den Renderer als geschlossen."""
+        self.closed = True
+
+
+class PdfRendererPool:
+    """
+    Begrenzte Anzahl warm gehaltener Renderer für die PDF-Exporte.
+
+    Renderer werden bei Bedarf erzeugt und nach einem erfolgreichen Auftrag für den
+    nächsten wiederverwendet. Schlägt ein Auftrag fehl oder überschreitet er sein
+    Zeitlimit, wird der Renderer verworfen und beim nächsten Auftrag neu gestartet.
+    """
+
+    def __init__(self, factory: Callable[[], object], size: int = 2, timeout: float = 60,
+                 acquire_timeout: float = 120):
+        """
+        Args:
+            factory (Callable): Erzeugt einen Renderer mit start(), render() und close()
+            size (int): Maximale Anzahl gleichzeitig laufender Renderaufträge
+            timeout (float): Standard-Zeitlimit je Auftrag in Sekunden
+            acquire_timeout (float): Maximale Wartezeit auf einen freien Renderer in Sekunden
+        """
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.acquire_timeout = acquire_timeout
+
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._stats = {'started': 0, 'rendered': 0, 'failed': 0, 'timeouts': 0}
+
+    def warm_up(self, count: Optional[int] = None):
+        """
+        Startet Renderer im Voraus, damit der erste Export nicht auf den Prozessstart wartet.
+
+        Args:
+            count (int, optional): Anzahl zu startender Renderer, standardmäßig size
+        """
+        for _ in range(min(count or self.size, self.size) - self._idle.qsize()):
+            renderer = self._create()
+            self._idle.put(renderer)
+
+    def render_to_file(self, html: str, output_path: str, timeout: Optional[float] = None) -> str:
+        """
+        Rendert HTML in eine PDF-Datei.
+
+        Args:
+            html (str): Vollständiges HTML-Dokument, z.B. aus report_pdf.html
+            output_path (str): Pfad der zu erstellenden PDF-Datei
+            timeout (float, optional): Zeitlimit in Sekunden, sonst das des Pools
+
+        Returns:
+            str: Pfad der erstellten PDF-Datei
+
+        Raises:
+            PdfRenderTimeout: Wenn das Zeitlimit überschritten wird
+            PdfRenderError: Wenn kein Renderer frei wird oder das Rendern fehlschlägt
+        """
+        timeout = self.timeout if timeout is None else timeout
+
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise PdfRenderError("Kein PDF-Renderer verfügbar, bitte später erneut versuchen")
+        try:
+            try:
+                renderer = self._idle.get_nowait()
+            except queue.Empty:
+                renderer = self._create()
+
+            try:
+                renderer.render(html, output_path, timeout)
+            except Exception as e:
+                renderer.close()
+                with self._lock:
+                    self._stats['timeouts' if isinstance(e, PdfRenderTimeout) else 'failed'] += 1
+                if isinstance(e, PdfRenderError):
+                    raise
+                raise PdfRenderError(str(e)) from e
+
+            with self._lock:
+                self._stats['rendered'] += 1
+            self._idle.put(renderer)
+            return output_path
+        finally:
+            self._slots.release()
+
+    def render(self, html: str, timeout: Optional[float] = None) -> bytes:
+        """
+        Rendert HTML und liefert das PDF als Bytes.
+
+        Args:
+            html (str): Vollständiges HTML-Dokument
+            timeout (float, optional): Zeitlimit in Sekunden, sonst das des Pools
+
+        Returns:
+            bytes: Inhalt der PDF-Datei
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            path = self.render_to_file(html, os.path.join(folder, 'render.pdf'), timeout)
+            with open(path, 'rb') as f:
+                return f.read()
+
+    def close(self):
+        """Beendet alle freien Renderer."""
+        while True:
+            try:
+                renderer = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            renderer.close()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Liefert die Kennzahlen des Pools.
+
+        Returns:
+            Dict[str, int]: Gestartete Renderer, erfolgreiche, fehlgeschlagene und abgebrochene Aufträge
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['idle'] = self._idle.qsize()
+        return stats
+
+    def _create(self):
+        renderer = self.factory()
+        renderer.start()
+        with self._lock:
+            self._stats['started'] += 1
+        return renderer
+
+
+# Verfügbare Renderer, auswählbar über PDF_RENDERER_CONFIG['renderer']
+PDF_RENDERERS = {
+    'wkhtmltopdf': lambda config: WkhtmltopdfRenderer(config.get('wkhtmltopdf_path'), config.get('options')),
+    'fake': lambda config: FakePdfRenderer()
+}
+
+
+def create_pdf_renderer_pool(config: Dict) -> PdfRendererPool:
+    """
+    Erstellt einen Renderer-Pool aus einer Konfiguration wie PDF_RENDERER_CONFIG.
+
+    Args:
+        config (Dict): Konfiguration mit renderer, workers, timeout und acquire_timeout
+
+    Returns:
+        PdfRendererPool: Pool; Renderer werden erst beim ersten Auftrag gestartet
+    """
+    renderer = PDF_RENDERERS[config.get('renderer', 'wkhtmltopdf')]
+    return PdfRendererPool(
+        lambda: renderer(config),
+        size=config.get('workers', 2),
+        timeout=config.get('timeout', 60),
+        acquire_timeout=config.get('acquire_timeout', 120)
+    )
+
+
+# Gemeinsamer Pool für die PDF-Exporte
+pdf_renderer = create_pdf_renderer_pool(PDF_RENDERER_CONFIG)
+atexit.register(pdf_renderer.close)
@@ -4,14 +4,21 @@ Mit verbesserter Behandlung von NULL-Werten.
 """
 
 import os
+import uuid
+from functools import cached_property
+from itertools import islice
 import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
-import pdfkit
-from jinja2 import Environment, FileSystemLoader
 import logging
 
-from config.settings import EXPORT_CONFIG, TEMPLATE_FOLDER
+from config.settings import EXPORT_CONFIG
+from src.analysis.charts import chart_renderer
+from src.analysis.excel_export import write_rows_to_excel
+from src.analysis.pdf_export import write_rows_to_pdf
+from src.analysis.pdf_renderer import pdf_renderer
+from src.analysis.templating import template_env
+from src.database.frames import RaumbuchFrameBuilder
+from src.models.coercion import coerce_numeric_columns
 
 # Logging konfigurieren
 logger = logging.getLogger(__name__)
@@ -35,27 +42,89 @@ def safe_number(value, default=0.0):
     except (ValueError, TypeError):
         return default
 
+def is_dataframe(data):
+    """
+    Prüft, ob Daten bereits als DataFrame vorliegen.
+
+    Args:
+        data: Zu prüfende Daten
+
+    Returns:
+        bool: True für einen pandas DataFrame
+    """
+    return isinstance(data, pd.core.frame.DataFrame)
+
+def ensure_numeric(df, columns, copy=False):
+    """
+    Stellt sicher, dass die angegebenen Spalten numerisch sind.
+    Die Umwandlung erfolgt spaltenweise mit den Regeln von safe_number; bereits
+    als float64 geladene Spalten, z.B. aus get_raumbuch_frame, werden übersprungen.
+
+    Args:
+        df (pd.DataFrame): DataFrame mit Raumbuch-Daten
+        columns (list): Zu prüfende Spalten
+        copy (bool): DataFrame vor einer Änderung kopieren, damit der Aufrufer unverändert bleibt
+
+    Returns:
+        pd.DataFrame: DataFrame mit numerischen Spalten
+    """
+    return coerce_numeric_columns(df, columns, copy=copy)
+
+def frame_from_rows(rows, batch_size=1000):
+    """
+    Erstellt einen DataFrame blockweise aus einer Zeilenquelle, z.B. einem Generator.
+
+    Blockweise erfolgt nur das Lesen und Umwandeln der Dictionaries; der Ergebnis-
+    DataFrame enthält alle Zeilen und wächst mit der Anzahl der Räume. Konstanten
+    Speicherbedarf bietet nur export_to_excel(..., streaming=True).
+
+    Args:
+        rows (iterable): Raumbuch-Zeilen als Dictionaries
+        batch_size (int): Anzahl Zeilen pro Block
+
+    Returns:
+        pd.DataFrame: DataFrame mit allen Zeilen, None wenn keine Zeilen vorhanden sind
+    """
+    if is_dataframe(rows):
+        return rows if not rows.empty else None
+
+    iterator = iter(rows)
+    frames = []
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            break
+        frames.append(pd.DataFrame(batch))
+
+    if not frames:
+        return None
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
 def calculate_summary(data):
     """
     Berechnet zusammenfassende Statistiken für die Raumbuch-Daten.
 
     Args:
-        data (list): Liste von Raumbuch-Objekten
+        data (list | pd.DataFrame): Liste von Raumbuch-Objekten oder fertiger DataFrame
 
     Returns:
         dict: Dictionary mit zusammenfassenden Statistiken
     """
-    if not data:
+    if is_dataframe(data):
+        if data.empty:
+            return {}
+        df = data
+    elif not data:
         return {}
-
-    # Konvertieren zu DataFrame für einfachere Analyse
-    df = pd.DataFrame(data)
+    else:
+        # Konvertieren zu DataFrame für einfachere Analyse
+        df = pd.DataFrame(data)
 
     # Sicherstellen, dass numerische Spalten tatsächlich numerisch sind
     numeric_columns = ['qm', 'WertMonat', 'WertJahr', 'StundenMonat', 'qmMonat']
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = df[col].apply(lambda x: safe_number(x))
+    df = ensure_numeric(df, numeric_columns, copy=df is data)
 
     # Allgemeine Statistiken
     total_rooms = len(df)
@@ -68,7 +137,7 @@ def calculate_summary(data):
     # Statistiken nach Bereichen
     bereich_stats = None
     if 'Bereich' in df.columns:
-        bereich_stats = df.groupby('Bereich').agg({
+        bereich_stats = df.groupby('Bereich', observed=True).agg({
             'qm': 'sum',
             'WertMonat': 'sum',
             'WertJahr': 'sum',
@@ -78,7 +147,7 @@ def calculate_summary(data):
     # Reinigungsgruppen-Statistiken
     rg_stats = None
     if 'RG' in df.columns:
-        rg_stats = df.groupby('RG').agg({
+        rg_stats = df.groupby('RG', observed=True).agg({
             'qm': 'sum',
             'WertMonat': 'sum',
             'WertJahr': 'sum',
@@ -101,38 +170,39 @@ def prepare_data_for_visualization(data):
     Bereitet Daten für Visualisierungen auf.
 
     Args:
-        data (list): Liste von Raumbuch-Objekten
+        data (list | pd.DataFrame): Liste von Raumbuch-Objekten oder fertiger DataFrame
 
     Returns:
         dict: Dictionary mit aufbereiteten Daten für verschiedene Visualisierungen
     """
-    if not data:
+    if is_dataframe(data):
+        if data.empty:
+            return {}
+    elif not data:
         return {}
 
     try:
         # Konvertieren zu DataFrame für einfachere Analyse
-        df = pd.DataFrame(data)
+        df = data if is_dataframe(data) else pd.DataFrame(data)
 
         # Sicherstellen, dass numerische Spalten tatsächlich numerisch sind
         numeric_columns = ['qm', 'WertMonat', 'StundenMonat']
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: safe_number(x))
+        df = ensure_numeric(df, numeric_columns, copy=df is data)
 
         # Daten für Kreisdiagramm der Bereiche
         bereich_data = None
         if 'Bereich' in df.columns and 'qm' in df.columns:
-            bereich_data = df.groupby('Bereich')['qm'].sum().to_dict()
+            bereich_data = df.groupby('Bereich', observed=True)['qm'].sum().to_dict()
 
         # Daten für Balkendiagramm der Reinigungsgruppen
         rg_data = None
         if 'RG' in df.columns and 'WertMonat' in df.columns:
-            rg_data = df.groupby('RG')['WertMonat'].sum().to_dict()
+            rg_data = df.groupby('RG', observed=True)['WertMonat'].sum().to_dict()
 
         # Daten für Stunden pro Etage
         etage_data = None
         if 'Etage' in df.columns and 'StundenMonat' in df.columns:
-            etage_data = df.groupby('Etage')['StundenMonat'].sum().to_dict()
+            etage_data = df.groupby('Etage', observed=True)['StundenMonat'].sum().to_dict()
 
         return {
             'bereich_data': bereich_data,
@@ -143,33 +213,172 @@ def prepare_data_for_visualization(data):
         logger.error(f"Fehler bei der Datenvorbereitung für Visualisierung: {e}")
         return {}
 
-def export_to_excel(data, standort_name):
+def prepare_visualization_from_summary(summary):
+    """
+    Leitet die Diagrammdaten für Bereiche und Reinigungsgruppen aus einer Zusammenfassung ab.
+    Damit lassen sich die Diagramme ohne die einzelnen Räume erstellen, z.B. aus get_raumbuch_summary.
+
+    Args:
+        summary (dict): Zusammenfassung im Format von calculate_summary
+
+    Returns:
+        dict: Dictionary mit 'bereich_data' (qm je Bereich) und 'rg_data' (Wert pro Monat je RG)
+    """
+    if not summary:
+        return {}
+
+    bereich_data = None
+    if summary.get('bereich_stats'):
+        bereich_data = {item['Bereich']: item['qm'] for item in summary['bereich_stats']}
+
+    rg_data = None
+    if summary.get('rg_stats'):
+        rg_data = {item['RG']: item['WertMonat'] for item in summary['rg_stats']}
+
+    return {
+        'bereich_data': bereich_data,
+        'rg_data': rg_data
+    }
+
+# Filteroptionen der Auswertung: Schlüssel im Template -> Spalte
+FILTER_OPTION_COLUMNS = {
+    'bereiche': 'Bereich',
+    'gebaeudeteil': 'Gebaeudeteil',
+    'etage': 'Etage',
+    'rg': 'RG'
+}
+
+def frame_to_records(df):
+    """
+    Wandelt einen DataFrame in Zeilen-Dictionaries um, fehlende Werte werden zu None.
+
+    Args:
+        df (pd.DataFrame): DataFrame mit Raumbuch-Daten
+
+    Returns:
+        list: Zeilen als Dictionaries
+    """
+    if df is None or df.empty:
+        return []
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+class RaumbuchAnalysis:
+    """
+    Auswertung eines Raumbuch-Ergebnisses auf Basis eines einzigen typisierten DataFrames.
+
+    Der DataFrame wird beim ersten Zugriff einmal erstellt; Zusammenfassung,
+    Diagrammdaten, Filteroptionen und Tabellenzeilen werden daraus abgeleitet
+    und je Instanz nur einmal berechnet. Eine Instanz gehört zu einem Request.
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data (list | pd.DataFrame): Raumbuch-Zeilen als Dictionaries, z.B. aus
+                get_raumbuch_data, oder DataFrame aus get_raumbuch_frame
+        """
+        self._data = data
+
+    @cached_property
+    def frame(self):
+        """pd.DataFrame: Typisierter DataFrame mit float64-Kennzahlen und Kategorien."""
+        if is_dataframe(self._data):
+            return self._data
+
+        rows = self._data or []
+        if not rows:
+            return pd.DataFrame()
+        builder = RaumbuchFrameBuilder(list(rows[0].keys()))
+        builder.append_dicts(rows)
+        return builder.build()
+
+    @cached_property
+    def records(self):
+        """list: Zeilen für Tabellen und Exporte, NULL-Kennzahlen sind durch 0.0 ersetzt."""
+        return frame_to_records(self.frame)
+
+    @cached_property
+    def summary(self):
+        """dict: Zusammenfassende Statistiken wie von calculate_summary."""
+        return calculate_summary(self.frame)
+
+    @cached_property
+    def viz_data(self):
+        """dict: Diagrammdaten wie von prepare_data_for_visualization."""
+        return prepare_data_for_visualization(self.frame)
+
+    @cached_property
+    def filter_options(self):
+        """dict: Sortierte, nicht leere Werte je Filterspalte."""
+        df = self.frame
+        options = {}
+        for key, column in FILTER_OPTION_COLUMNS.items():
+            if column not in df.columns:
+                options[key] = []
+            elif isinstance(df[column].dtype, pd.CategoricalDtype):
+                # Kategorien sind bereits sortiert und enthalten nur vorkommende Werte
+                options[key] = [value for value in df[column].cat.categories if value]
+            else:
+                options[key] = sorted(value for value in df[column].dropna().unique() if value)
+        return options
+
+def export_filename(standort_name, extension):
+    """
+    Erstellt einen eindeutigen Dateinamen für eine neu erzeugte Exportdatei.
+
+    Neben dem Zeitstempel enthält der Name einen Zufallsanteil, damit gleichzeitige
+    Exporte desselben Standorts mit unterschiedlichen Filtern nicht dieselbe Datei
+    schreiben, bevor sie in den Export-Cache verschoben werden.
+
+    Args:
+        standort_name (str): Name des Standorts
+        extension (str): Dateiendung mit Punkt, z.B. '.xlsx'
+
+    Returns:
+        str: Dateiname ohne Verzeichnis
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"Raumbuch_Auswertung_{standort_name}_{timestamp}_{uuid.uuid4().hex}{extension}"
+
+def export_to_excel(data, standort_name, summary=None, streaming=False):
     """
     Exportiert Raumbuch-Daten nach Excel.
 
+    Ohne streaming wird die Zeilenquelle zwar nur einmal und blockweise gelesen, aber
+    vollständig in einen DataFrame übernommen. Erst mit streaming=True werden die Zeilen
+    ohne DataFrame direkt aus der Zeilenquelle geschrieben (xlsxwriter constant_memory);
+    die Zusammenfassung wird dabei im selben Durchlauf summiert. Der Speicherbedarf hängt
+    dann nicht von der Anzahl der Räume ab.
+
     Args:
-        data (list): Liste von Raumbuch-Objekten
+        data (iterable | pd.DataFrame): Liste von Raumbuch-Objekten, Zeilen-Generator, z.B. aus
+            iter_raumbuch_rows, oder DataFrame aus get_raumbuch_frame; Zeilen werden nur
+            einmal durchlaufen
         standort_name (str): Name des Standorts
+        summary (dict, optional): Bereits berechnete Zusammenfassung, z.B. aus RaumbuchAnalysis
+        streaming (bool): Zeilen ohne DataFrame mit konstantem Speicherbedarf schreiben
 
     Returns:
         str: Pfad zur erstellten Excel-Datei
     """
-    if not data:
+    if data is None or (isinstance(data, list) and not data):
         return None
 
+    if streaming and not is_dataframe(data):
+        return _stream_to_excel(data, standort_name)
+
     try:
-        # Erstelle DataFrame
-        df = pd.DataFrame(data)
+        # Vollständigen DataFrame aus der Zeilenquelle erstellen, gelesen wird blockweise
+        df = frame_from_rows(data)
+        if df is None:
+            return None
 
         # Sicherstellen, dass numerische Spalten tatsächlich numerisch sind
         numeric_columns = ['qm', 'qmMonat', 'WertMonat', 'WertJahr', 'StundenTag', 'StundenMonat', 'qmStunde']
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: safe_number(x))
+        df = ensure_numeric(df, numeric_columns, copy=df is data)
 
-        # Erstelle Timestamp für Dateinamen
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"Raumbuch_Auswertung_{standort_name}_{timestamp}.xlsx"
+        # Eindeutiger Dateiname mit Zeitstempel
+        filename = export_filename(standort_name, '.xlsx')
 
         # Erstelle Export-Ordner, falls er nicht existiert
         export_folder = EXPORT_CONFIG['excel']['folder']
@@ -183,8 +392,9 @@ def export_to_excel(data, standort_name):
             # Haupttabelle
             df.to_excel(writer, sheet_name='Raumbuchdaten', index=False)
 
-            # Erstelle Zusammenfassung
-            summary = calculate_summary(data)
+            # Erstelle Zusammenfassung aus dem bereits erstellten DataFrame
+            if not summary:
+                summary = calculate_summary(df)
 
             # Erstellen des Summary-DataFrames
             summary_data = {
@@ -206,13 +416,13 @@ def export_to_excel(data, standort_name):
                 rg_df = pd.DataFrame(summary['rg_stats'])
                 rg_df.to_excel(writer, sheet_name='Nach Reinigungsgruppe', index=False)
 
-            # Formatierung
+            # Formatierung der Haupttabelle
             workbook = writer.book
             format_header = workbook.add_format({'bold': True, 'bg_color': '#DDDDDD', 'border': 1})
             format_number = workbook.add_format({'num_format': '#,##0.00'})
 
-            for sheet_name in writer.sheets:
-                worksheet = writer.sheets[sheet_name]
+            worksheet = writer.sheets.get('Raumbuchdaten')
+            if worksheet is not None:
                 for col_num, value in enumerate(df.columns.values):
                     worksheet.write(0, col_num, value, format_header)
                     if df[value].dtype in [float, int]:
@@ -223,25 +433,69 @@ def export_to_excel(data, standort_name):
         logger.error(f"Fehler beim Excel-Export: {e}")
         return None
 
-def export_to_pdf(data, standort_name, charts_data=None):
+def _stream_to_excel(rows, standort_name):
+    """
+    Schreibt eine Zeilenquelle im Streaming-Modus nach Excel.
+
+    Args:
+        rows (iterable): Raumbuch-Zeilen als Dictionaries
+        standort_name (str): Name des Standorts
+
+    Returns:
+        str: Pfad zur erstellten Excel-Datei, None wenn keine Zeilen vorhanden sind
+    """
+    try:
+        filename = export_filename(standort_name, '.xlsx')
+
+        export_folder = EXPORT_CONFIG['excel']['folder']
+        os.makedirs(export_folder, exist_ok=True)
+        excel_path = os.path.join(export_folder, filename)
+
+        summary = write_rows_to_excel(rows, excel_path)
+        if not summary:
+            return None
+
+        logger.info(f"Excel-Export im Streaming-Modus erstellt: {summary['total_rooms']} Räume")
+        return excel_path
+    except Exception as e:
+        logger.error(f"Fehler beim Excel-Export: {e}")
+        return None
+
+# Verfügbare PDF-Engines, auswählbar je Export
+PDF_ENGINES = ('html', 'native')
+
+def export_to_pdf(data, standort_name, charts_data=None, summary=None, engine=None):
     """
     Exportiert Raumbuch-Daten nach PDF.
 
+    Die Engine 'html' rendert report_pdf.html mit wkhtmltopdf und enthält höchstens
+    100 Räume. Die Engine 'native' zeichnet Tabelle, Zusammenfassung und Diagramme
+    direkt mit matplotlib, enthält alle Räume und liest die Zeilen seitenweise.
+
     Args:
-        data (list): Liste von Raumbuch-Objekten
+        data (iterable): Liste von Raumbuch-Objekten; bei engine='native' auch ein
+            Zeilen-Generator, z.B. aus iter_raumbuch_rows
         standort_name (str): Name des Standorts
         charts_data (dict, optional): Daten für Charts
+        summary (dict, optional): Bereits berechnete Zusammenfassung, z.B. aus RaumbuchAnalysis
+        engine (str, optional): 'html' oder 'native', standardmäßig aus EXPORT_CONFIG
 
     Returns:
         str: Pfad zur erstellten PDF-Datei
     """
-    if not data:
+    if data is None or (isinstance(data, list) and not data):
         return None
 
+    engine = engine or EXPORT_CONFIG['pdf'].get('engine', 'html')
+    if engine not in PDF_ENGINES:
+        logger.error(f"Unbekannte PDF-Engine: {engine}")
+        return None
+    if engine == 'native':
+        return _export_pdf_native(data, standort_name, charts_data, summary)
+
     try:
-        # Erstelle Timestamp für Dateinamen
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"Raumbuch_Auswertung_{standort_name}_{timestamp}.pdf"
+        # Eindeutiger Dateiname mit Zeitstempel
+        filename = export_filename(standort_name, '.pdf')
 
         # Erstelle Export-Ordner, falls er nicht existiert
         export_folder = EXPORT_CONFIG['pdf']['folder']
@@ -249,39 +503,15 @@ def export_to_pdf(data, standort_name, charts_data=None):
 
         pdf_path = os.path.join(export_folder, filename)
 
-        # Berechne Zusammenfassung
-        summary = calculate_summary(data)
-
-        # Erstelle Charts, falls nötig
-        charts_folder = os.path.join(export_folder, 'charts')
-        if not os.path.exists(charts_folder):
-            os.makedirs(charts_folder)
-
-        chart_paths = {}
-
-        if charts_data:
-            # Beispiel: Erstelle Balkendiagramm für Bereiche
-            if charts_data.get('bereich_data'):
-                bereiche = list(charts_data['bereich_data'].keys())
-                qm_values = [safe_number(charts_data['bereich_data'][bereich]) for bereich in bereiche]
-
-                plt.figure(figsize=(10, 6))
-                plt.bar(bereiche, qm_values)
-                plt.title('Quadratmeter nach Bereich')
-                plt.xlabel('Bereich')
-                plt.ylabel('Quadratmeter')
-                plt.xticks(rotation=45)
-                plt.tight_layout()
-
-                bereich_chart_path = os.path.join(charts_folder, f'bereich_chart_{timestamp}.png')
-                plt.savefig(bereich_chart_path)
-                plt.close()
+        # Berechne Zusammenfassung, falls sie nicht übergeben wurde
+        if not summary:
+            summary = calculate_summary(data)
 
-                chart_paths['bereich_chart'] = bereich_chart_path
+        # Diagramme im Speicher zeichnen und als data:-URIs in das Template einbetten
+        charts = chart_renderer.render_data_uris(charts_data)
 
-        # Verwende Jinja2-Template für das PDF
-        env = Environment(loader=FileSystemLoader(TEMPLATE_FOLDER))
-        template = env.get_template('report_pdf.html')
+        # Gemeinsame Jinja2-Umgebung: das Template wird nur einmal kompiliert
+        template = template_env.get_template('report_pdf.html')
 
         # Render Template
         html_content = template.render(
@@ -289,19 +519,45 @@ def export_to_pdf(data, standort_name, charts_data=None):
             timestamp=datetime.now().strftime("%d.%m.%Y %H:%M:%S"),
             data=data[:100],  # Begrenze auf 100 Einträge für das PDF
             summary=summary,
-            charts=chart_paths,
+            charts=charts,
             total_items=len(data)
         )
 
-        # Erstelle PDF mit pdfkit
-        pdfkit.from_string(html_content, pdf_path)
+        # PDF mit einem warm gehaltenen Renderer aus dem Pool erstellen
+        pdf_renderer.render_to_file(html_content, pdf_path)
+
+        return pdf_path
+    except Exception as e:
+        logger.error(f"Fehler beim PDF-Export: {e}")
+        return None
+
+def _export_pdf_native(rows, standort_name, charts_data=None, summary=None):
+    """
+    Schreibt eine Zeilenquelle seitenweise mit matplotlib nach PDF.
+
+    Args:
+        rows (iterable): Raumbuch-Zeilen als Dictionaries
+        standort_name (str): Name des Standorts
+        charts_data (dict, optional): Daten für Charts
+        summary (dict, optional): Zusammenfassung, wird sonst während des Schreibens summiert
+
+    Returns:
+        str: Pfad zur erstellten PDF-Datei, None wenn keine Zeilen vorhanden sind
+    """
+    try:
+        filename = export_filename(standort_name, '.pdf')
 
-        # Lösche temporäre Charts
-        for chart_path in chart_paths.values():
-            if os.path.exists(chart_path):
-                os.remove(chart_path)
+        export_folder = EXPORT_CONFIG['pdf']['folder']
+        os.makedirs(export_folder, exist_ok=True)
+        pdf_path = os.path.join(export_folder, filename)
+
+        summary = write_rows_to_pdf(rows, pdf_path, f"Raumbuch Auswertung - {standort_name}",
+                                    summary=summary, charts_data=charts_data)
+        if not summary:
+            return None
 
+        logger.info(f"PDF-Export mit matplotlib erstellt: {summary['total_rooms']} Räume")
         return pdf_path
     except Exception as e:
         logger.error(f"Fehler beim PDF-Export: {e}")
-        return None
\ No newline at end of file
+        return None
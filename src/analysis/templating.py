@@ -0,0 +1,66 @@
+"""
+Gemeinsame Jinja2-Umgebung und Bytecode-Cache für Webseiten und PDF-Export.
+
+Kompilierte Templates werden als Bytecode im Verzeichnis aus TEMPLATE_CONFIG abgelegt.
+Nach einem Neustart werden sie von dort geladen statt neu geparst; Änderungen an einem
+Template werden über die Prüfsumme des Quelltexts erkannt.
+"""
+
+import logging
+import os
+from typing import Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from config.settings import TEMPLATE_CONFIG, TEMPLATE_FOLDER
+
+# Logging konfigurieren
+logger = logging.getLogger(__name__)
+
+
+def create_bytecode_cache(directory: Optional[str]) -> Optional[FileSystemBytecodeCache]:
+    """
+    Erstellt einen Bytecode-Cache im angegebenen Verzeichnis.
+
+    Args:
+        directory (str, optional): Verzeichnis für die kompilierten Templates
+
+    Returns:
+        Optional[FileSystemBytecodeCache]: Cache oder None, wenn kein Verzeichnis angegeben
+        ist oder es nicht angelegt werden kann
+    """
+    if not directory:
+        return None
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"Template-Cache-Verzeichnis nicht verfügbar, Templates werden nicht zwischengespeichert: {e}")
+        return None
+    return FileSystemBytecodeCache(directory, '%s.cache')
+
+
+def create_template_environment(bytecode_cache: Optional[FileSystemBytecodeCache] = None,
+                                auto_reload: bool = False) -> Environment:
+    """
+    Erstellt eine Jinja2-Umgebung für die Templates der Anwendung.
+
+    Args:
+        bytecode_cache (FileSystemBytecodeCache, optional): Cache für kompilierte Templates
+        auto_reload (bool): Templates bei Änderungen neu laden
+
+    Returns:
+        Environment: Umgebung mit FileSystemLoader auf TEMPLATE_FOLDER
+    """
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_FOLDER),
+        autoescape=select_autoescape(['html']),
+        bytecode_cache=bytecode_cache,
+        auto_reload=auto_reload
+    )
+
+
+# Gemeinsamer Bytecode-Cache für Flask und den PDF-Export
+bytecode_cache = create_bytecode_cache(TEMPLATE_CONFIG['bytecode_cache_dir'])
+
+# Gemeinsame Umgebung für Exporte; Templates werden einmal kompiliert und im Speicher gehalten
+template_env = create_template_environment(bytecode_cache, TEMPLATE_CONFIG['auto_reload'])
@@ -3,17 +3,40 @@ Datenbankmodul für die RitterDigitalAuswertung-Anwendung.
 Stellt Funktionen für die Datenbankverbindung und -abfragen bereit.
 """
 
-from src.database.connection import get_db_connection, close_connection
+from src.database.connection import (
+    get_db_connection,
+    close_connection,
+    get_pool_stats,
+    close_pool
+)
 from src.database.queries import (
     get_raumbuch_data,
+    iter_raumbuch_rows,
+    get_raumbuch_frame,
+    get_raumbuch_summary,
+    get_raumbuch_filter_options,
+    get_raumbuch_page,
+    get_raumbuch_version,
+    invalidate_raumbuch_cache,
     get_standorte,
-    get_standort_by_id
+    get_standort_by_id,
+    invalidate_standorte
 )
 
 __all__ = [
     'get_db_connection',
     'close_connection',
+    'get_pool_stats',
+    'close_pool',
     'get_raumbuch_data',
+    'iter_raumbuch_rows',
+    'get_raumbuch_frame',
+    'get_raumbuch_summary',
+    'get_raumbuch_filter_options',
+    'get_raumbuch_page',
+    'get_raumbuch_version',
+    'invalidate_raumbuch_cache',
     'get_standorte',
-    'get_standort_by_id'
+    'get_standort_by_id',
+    'invalidate_standorte'
 ]
\ No newline at end of file
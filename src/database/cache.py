@@ -0,0 +1,354 @@
+"""
+In-Process-Caches für Datenbankergebnisse der RitterDigitalAuswertung-Anwendung.
+"""
+
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Logging konfigurieren
+logger = logging.getLogger(__name__)
+
+
+def estimate_rows_size(rows: List[Dict[str, Any]]) -> int:
+    """
+    Schätzt den Speicherbedarf einer Ergebnisliste in Bytes.
+    Spaltennamen werden zwischen den Zeilen geteilt und daher nicht mitgezählt.
+
+    Args:
+        rows (List[Dict[str, Any]]): Ergebniszeilen
+
+    Returns:
+        int: Geschätzte Größe in Bytes
+    """
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for value in row.values():
+            size += sys.getsizeof(value)
+    return size
+
+
+class CacheEntry:
+    """
+    Eintrag im Raumbuch-Cache.
+
+    Neben den Zeilen kann der daraus erstellte DataFrame abgelegt werden, damit
+    get_raumbuch_frame ihn nur einmal je Datenversion aufbaut.
+    """
+
+    __slots__ = ('rows', 'version', 'size', 'checked_at', 'frame')
+
+    def __init__(self, rows, version, size):
+        self.rows = rows
+        self.version = version
+        self.size = size
+        self.checked_at = time.monotonic()
+        self.frame = None
+
+
+class RaumbuchCache:
+    """
+    Speicherbegrenzter LRU-Cache für Raumbuch-Abfrageergebnisse je Standort.
+
+    Schlüssel sind Tupel, deren erstes Element die Standort-ID ist, z.B.
+    (standort_id, filter), damit alle Einträge eines Standorts gemeinsam
+    verworfen werden können.
+
+    Einträge gelten für die Dauer der TTL als aktuell. Danach muss der Aufrufer
+    die Datenversion prüfen und den Eintrag per revalidate() bestätigen oder
+    durch put() ersetzen.
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 50, max_bytes: int = 100 * 1024 * 1024):
+        """
+        Args:
+            ttl (float): Sekunden, die ein Eintrag ohne Versionsprüfung gültig ist
+            max_entries (int): Maximale Anzahl von Einträgen
+            max_bytes (int): Obergrenze für den geschätzten Speicherbedarf aller Einträge
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'revalidations': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key: Tuple) -> Optional[CacheEntry]:
+        """
+        Liefert den Eintrag zu einem Schlüssel, unabhängig davon, ob er noch aktuell ist.
+
+        Args:
+            key (tuple): Cache-Schlüssel, z.B. (standort_id, filter)
+
+        Returns:
+            Optional[CacheEntry]: Eintrag oder None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """
+        Prüft, ob ein Eintrag innerhalb der TTL liegt.
+
+        Args:
+            entry (CacheEntry): Zu prüfender Eintrag
+
+        Returns:
+            bool: True, wenn der Eintrag ohne Versionsprüfung verwendet werden darf
+        """
+        return time.monotonic() - entry.checked_at < self.ttl
+
+    def record_hit(self):
+        """Zählt einen Treffer ohne Datenbankzugriff."""
+        with self._lock:
+            self._stats['hits'] += 1
+
+    def revalidate(self, key: Tuple):
+        """
+        Bestätigt einen Eintrag nach erfolgreicher Versionsprüfung für eine weitere TTL.
+
+        Args:
+            key (tuple): Cache-Schlüssel
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.checked_at = time.monotonic()
+                self._stats['revalidations'] += 1
+
+    def fresh_version(self, standort_id: int) -> Any:
+        """
+        Liefert die Datenversion eines Standorts, solange sie innerhalb der TTL bestätigt wurde.
+
+        Berücksichtigt werden aktuelle Cache-Einträge des Standorts und zuletzt per
+        remember_version() gemeldete Versionen.
+
+        Args:
+            standort_id (int): ID des Standorts
+
+        Returns:
+            Datenversion oder None, wenn keine aktuelle Version vorliegt
+        """
+        now = time.monotonic()
+        with self._lock:
+            remembered = self._versions.get(standort_id)
+            if remembered is not None and now - remembered[1] < self.ttl:
+                return remembered[0]
+            for key, entry in self._entries.items():
+                if key[0] == standort_id and entry.version is not None and now - entry.checked_at < self.ttl:
+                    return entry.version
+        return None
+
+    def remember_version(self, standort_id: int, version: Any):
+        """
+        Merkt sich eine frisch abgefragte Datenversion für die Dauer der TTL.
+        Einträge des Standorts mit derselben Version gelten damit ebenfalls als bestätigt.
+
+        Args:
+            standort_id (int): ID des Standorts
+            version: Ergebnis der Versionsabfrage
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._versions[standort_id] = (version, now)
+            for key, entry in self._entries.items():
+                if key[0] == standort_id and entry.version == version:
+                    entry.checked_at = now
+
+    def put(self, key: Tuple, rows: List[Dict[str, Any]], version: Any):
+        """
+        Legt ein Abfrageergebnis im Cache ab und verdrängt bei Bedarf alte Einträge.
+
+        Args:
+            key (tuple): Cache-Schlüssel
+            rows (List[Dict[str, Any]]): Ergebniszeilen
+            version: Datenversion zum Zeitpunkt der Abfrage
+        """
+        size = estimate_rows_size(rows)
+        if size > self.max_bytes:
+            logger.info(f"Ergebnis für {key} ist zu groß für den Cache ({size} Bytes)")
+            with self._lock:
+                self._remove_locked(key)
+            return
+
+        with self._lock:
+            self._stats['misses'] += 1
+            self._remove_locked(key)
+            self._entries[key] = CacheEntry(rows, version, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self._stats['evictions'] += 1
+
+    def invalidate(self, standort_id: Optional[int] = None):
+        """
+        Entfernt alle Einträge eines Standorts oder, ohne Angabe, den gesamten Cache.
+
+        Args:
+            standort_id (int, optional): Standort, dessen Einträge entfernt werden
+        """
+        with self._lock:
+            if standort_id is None:
+                self._entries.clear()
+                self._versions.clear()
+                self._bytes = 0
+                return
+            self._versions.pop(standort_id, None)
+            for key in [key for key in self._entries if key[0] == standort_id]:
+                self._remove_locked(key)
+
+    def _remove_locked(self, key: Tuple):
+        """Entfernt einen einzelnen Eintrag. Muss unter der Sperre aufgerufen werden."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Liefert die Kennzahlen des Caches.
+
+        Returns:
+            Dict[str, int]: Treffer, Fehlzugriffe, Verdrängungen und Belegung
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({'entries': len(self._entries), 'bytes': self._bytes})
+        return stats
+
+
+class StandortIndex:
+    """
+    Im Speicher gehaltene Standortliste mit Zugriff per ID.
+
+    Die Liste wird beim ersten Zugriff geladen. Ist sie älter als das
+    Aktualisierungsintervall, wird sie weiterhin ausgeliefert und parallel
+    in einem Hintergrund-Thread neu geladen.
+    """
+
+    def __init__(self, loader: Callable[[], List[Dict[str, Any]]], refresh_interval: float = 600):
+        """
+        Args:
+            loader (Callable): Funktion, die die sortierte Standortliste aus der Datenbank lädt
+            refresh_interval (float): Sekunden, nach denen die Liste neu geladen wird
+        """
+        self._loader = loader
+        self.refresh_interval = refresh_interval
+
+        self._standorte = None
+        self._by_id = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        # Serialisiert die Datenbankabfragen, damit parallele Erstzugriffe nur einmal laden
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+
+    @property
+    def loaded(self) -> bool:
+        """bool: True, wenn die Standortliste bereits geladen wurde."""
+        return self._standorte is not None
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """
+        Liefert alle Standorte in der Sortierung der Datenbankabfrage.
+
+        Returns:
+            List[Dict[str, Any]]: Liste der Standorte
+
+        Raises:
+            Exception: Wenn die Liste noch nicht geladen war und das Laden fehlschlägt
+        """
+        with self._lock:
+            standorte = self._standorte
+        if standorte is None:
+            standorte = self._load_once()
+        else:
+            self._refresh_if_stale()
+        return list(standorte)
+
+    def get(self, standort_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Liefert einen Standort aus dem Speicher, ohne die Datenbank abzufragen.
+
+        Args:
+            standort_id (int): ID des Standorts
+
+        Returns:
+            Optional[Dict[str, Any]]: Standort oder None, wenn er (noch) nicht bekannt ist
+        """
+        if self.loaded:
+            self._refresh_if_stale()
+        return self._by_id.get(standort_id)
+
+    def refresh(self) -> List[Dict[str, Any]]:
+        """
+        Lädt die Standortliste synchron neu.
+
+        Returns:
+            List[Dict[str, Any]]: Die neu geladene Liste
+
+        Raises:
+            Exception: Wenn das Laden fehlschlägt; die bisherige Liste bleibt dann erhalten
+        """
+        with self._load_lock:
+            return self._load()
+
+    def _load_once(self) -> List[Dict[str, Any]]:
+        """Lädt eine fehlende Liste; wartende Threads übernehmen das Ergebnis des ersten."""
+        with self._load_lock:
+            with self._lock:
+                standorte = self._standorte
+            if standorte is not None:
+                return standorte
+            return self._load()
+
+    def _load(self) -> List[Dict[str, Any]]:
+        """Fragt die Liste ab und übernimmt sie; der Aufrufer hält _load_lock."""
+        standorte = self._loader()
+        by_id = {standort['ID']: standort for standort in standorte}
+        with self._lock:
+            self._standorte = standorte
+            self._by_id = by_id
+            self._loaded_at = time.monotonic()
+        logger.info(f"Standortliste aktualisiert: {len(standorte)} Einträge")
+        return standorte
+
+    def invalidate(self):
+        """
+        Verwirft die Standortliste, sodass sie beim nächsten Zugriff neu geladen wird.
+        """
+        with self._lock:
+            self._standorte = None
+            self._by_id = {}
+            self._loaded_at = 0.0
+
+    def _refresh_if_stale(self):
+        """Startet bei veralteter Liste genau einen Hintergrund-Thread zum Neuladen."""
+        with self._lock:
+            stale = time.monotonic() - self._loaded_at >= self.refresh_interval
+            if not stale or self._refreshing:
+                return
+            self._refreshing = True
+
+        thread = threading.Thread(target=self._background_refresh, name='standort-index-refresh', daemon=True)
+        thread.start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Fehler beim Aktualisieren der Standortliste: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
@@ -2,11 +2,14 @@
 Modul zur Verwaltung der Datenbankverbindungen.
 """
 
+import atexit
 import pyodbc
 import logging
+import threading
 from contextlib import contextmanager
 
-from config.database import DATABASE_CONFIG
+from config.database import DATABASE_CONFIG, POOL_CONFIG
+from src.database.pool import ConnectionPool
 
 # Logging konfigurieren
 logging.basicConfig(
@@ -15,6 +18,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Prozessweiter Verbindungspool, wird beim ersten Zugriff erstellt
+_pool = None
+_pool_lock = threading.Lock()
+
 def get_connection_string():
     """
     Erstellt einen Verbindungsstring für pyodbc basierend auf der Datenbankkonfiguration.
@@ -69,22 +76,63 @@ def close_connection(conn):
         except pyodbc.Error as e:
             logger.error(f"Fehler beim Schließen der Verbindung: {e}")
 
+def get_pool():
+    """
+    Liefert den prozessweiten Verbindungspool und erstellt ihn bei Bedarf.
+
+    Returns:
+        ConnectionPool: Verbindungspool für die Raumbuch-Datenbank
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(get_db_connection, **POOL_CONFIG)
+    return _pool
+
+def get_pool_stats():
+    """
+    Liefert die Kennzahlen des Verbindungspools.
+
+    Returns:
+        dict: Zähler für Ausgaben, Wartevorgänge, neu erstellte Verbindungen usw.
+    """
+    return get_pool().stats()
+
+def close_pool():
+    """
+    Schließt den Verbindungspool, z.B. beim Herunterfahren der Anwendung.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+        logger.info("Verbindungspool geschlossen")
+
+atexit.register(close_pool)
+
 @contextmanager
 def db_connection():
     """
     Context Manager für die Datenbankverbindung.
-    Verwendet with-Statement für automatisches Schließen der Verbindung.
+    Leiht eine Verbindung aus dem Pool aus und gibt sie nach dem with-Block zurück.
+    Nach Datenbankfehlern wird die Verbindung verworfen statt wiederverwendet.
 
     Yields:
         pyodbc.Connection: Datenbankverbindung
     """
-    conn = None
+    pool = get_pool()
+    conn = pool.acquire()
+
+    discard = False
     try:
-        conn = get_db_connection()
         yield conn
+    except pyodbc.Error:
+        discard = True
+        raise
     finally:
-        if conn:
-            close_connection(conn)
+        pool.release(conn, discard=discard)
 
 def test_connection():
     """
@@ -0,0 +1,148 @@
+"""
+Spaltenweiser Aufbau von DataFrames direkt aus Cursor-Ergebnissen.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.models.coercion import coerce_integer, coerce_numeric
+from src.models.raumbuch import (
+    RAUMBUCH_CATEGORICAL_COLUMNS,
+    RAUMBUCH_INTEGER_COLUMNS,
+    RAUMBUCH_NUMERIC_COLUMNS
+)
+
+
+class RaumbuchFrameBuilder:
+    """
+    Sammelt Cursor-Blöcke spaltenweise in typisierten Arrays und erstellt daraus einen DataFrame.
+
+    Kennzahlen werden als float64 abgelegt, Spalten wie Bereich, Etage oder RG als
+    Kategorie-Codes mit einem gemeinsamen Wörterbuch je Spalte. Zeilen-Dictionaries
+    werden dabei nicht erzeugt.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        """
+        Args:
+            columns (Sequence[str]): Spaltennamen in der Reihenfolge der Ergebniszeilen
+        """
+        self.columns = list(columns)
+        self.row_count = 0
+
+        self._chunks = {column: [] for column in self.columns}
+        self._categories = {
+            column: {} for column in self.columns if column in RAUMBUCH_CATEGORICAL_COLUMNS
+        }
+
+    def append(self, rows: Sequence[Sequence[Any]]):
+        """
+        Übernimmt einen Block von Ergebniszeilen, z.B. aus cursor.fetchmany().
+
+        Args:
+            rows (Sequence[Sequence[Any]]): Zeilen als Tupel in der Spaltenreihenfolge
+        """
+        if not rows:
+            return
+
+        for column, values in zip(self.columns, zip(*rows)):
+            if column in RAUMBUCH_NUMERIC_COLUMNS:
+                chunk = coerce_numeric(values)
+            elif column in self._categories:
+                chunk = self._encode(column, values)
+            elif column in RAUMBUCH_INTEGER_COLUMNS:
+                chunk = coerce_integer(values)
+            else:
+                chunk = np.array(values, dtype=object)
+            self._chunks[column].append(chunk)
+
+        self.row_count += len(rows)
+
+    def append_dicts(self, rows: Iterable[Dict[str, Any]]):
+        """
+        Übernimmt bereits als Dictionaries vorliegende Zeilen, z.B. aus dem Raumbuch-Cache.
+
+        Args:
+            rows (Iterable[Dict[str, Any]]): Zeilen mit Spaltennamen als Schlüssel
+        """
+        self.append([tuple(row.get(column) for column in self.columns) for row in rows])
+
+    def build(self) -> pd.DataFrame:
+        """
+        Erstellt den DataFrame aus den gesammelten Blöcken.
+
+        Returns:
+            pd.DataFrame: Typisierter DataFrame, bei leerem Ergebnis ohne Zeilen
+        """
+        data = {}
+        for column in self.columns:
+            chunks = self._chunks[column]
+            if column in self._categories:
+                data[column] = self._decode(column, chunks)
+            elif chunks:
+                data[column] = np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+            elif column in RAUMBUCH_NUMERIC_COLUMNS:
+                data[column] = np.empty(0, dtype=np.float64)
+            else:
+                data[column] = np.empty(0, dtype=object)
+        return pd.DataFrame(data, columns=self.columns)
+
+    def _encode(self, column: str, values: Sequence[Any]) -> np.ndarray:
+        """Kodiert Werte über das Wörterbuch der Spalte, NULL wird zu -1."""
+        mapping = self._categories[column]
+        codes = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            if value is None:
+                codes[i] = -1
+            else:
+                code = mapping.get(value)
+                if code is None:
+                    code = mapping[value] = len(mapping)
+                codes[i] = code
+        return codes
+
+    def _decode(self, column: str, chunks: List[np.ndarray]) -> pd.Categorical:
+        """
+        Erstellt die Kategorie-Spalte. Die Kategorien werden sortiert, damit
+        groupby dieselbe Reihenfolge liefert wie bei Textspalten.
+        """
+        mapping = self._categories[column]
+        codes = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int32)
+
+        categories = sorted(mapping, key=str)
+        remap = np.empty(len(mapping) + 1, dtype=np.int32)
+        remap[-1] = -1
+        for new_code, value in enumerate(categories):
+            remap[mapping[value]] = new_code
+
+        return pd.Categorical.from_codes(remap[codes], categories=categories)
+
+
+def encode_columnar(frame: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, list]]:
+    """
+    Wandelt einen Raumbuch-DataFrame in ein spaltenweises, JSON-fähiges Format um.
+
+    Kategorie-Spalten werden wörterbuchkodiert übertragen: jede Bezeichnung einmal in
+    'dictionary', je Zeile nur ihr Index in 'codes' (-1 für NULL). Alle übrigen
+    Spalten werden als Werteliste in 'values' geliefert, NaN als None.
+
+    Args:
+        frame (pd.DataFrame): DataFrame wie von RaumbuchFrameBuilder.build
+        columns (Sequence[str], optional): Zu übertragende Spalten, ohne Angabe alle
+
+    Returns:
+        Dict[str, Dict[str, list]]: Spaltenname -> {'dictionary', 'codes'} bzw. {'values'}
+    """
+    encoded = {}
+    for column in columns or frame.columns:
+        series = frame[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            encoded[column] = {
+                'dictionary': series.cat.categories.tolist(),
+                'codes': series.cat.codes.tolist()
+            }
+        else:
+            encoded[column] = {'values': series.astype(object).where(series.notna(), None).tolist()}
+    return encoded
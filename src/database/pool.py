@@ -0,0 +1,279 @@
+"""
+Thread-sicherer Verbindungspool für die SQL Server Datenbank.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+# Logging konfigurieren
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Wird ausgelöst, wenn innerhalb der Wartezeit keine Verbindung frei wird."""
+
+
+class _PooledConnection:
+    """
+    Verwaltungsdaten einer einzelnen Verbindung im Pool.
+    """
+
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """
+    Begrenzter Pool wiederverwendbarer Datenbankverbindungen.
+
+    Freie Verbindungen werden in LIFO-Reihenfolge ausgegeben, damit die zuletzt
+    benutzten (und damit wahrscheinlich noch lebendigen) Verbindungen zuerst
+    wiederverwendet werden und überzählige Verbindungen im Leerlauf altern.
+    """
+
+    def __init__(self, factory: Callable[[], Any], min_size: int = 1, max_size: int = 10,
+                 checkout_timeout: float = 30, idle_timeout: float = 300,
+                 max_lifetime: float = 1800, ping_after: float = 30):
+        """
+        Args:
+            factory (Callable): Funktion, die eine neue Verbindung erstellt
+            min_size (int): Anzahl Verbindungen, die im Leerlauf erhalten bleiben
+            max_size (int): Maximale Anzahl gleichzeitig geöffneter Verbindungen
+            checkout_timeout (float): Maximale Wartezeit auf eine freie Verbindung in Sekunden
+            idle_timeout (float): Leerlaufzeit, nach der überzählige Verbindungen geschlossen werden
+            max_lifetime (float): Maximales Alter einer Verbindung in Sekunden
+            ping_after (float): Leerlaufzeit, ab der eine Verbindung vor der Ausgabe geprüft wird
+        """
+        if max_size < 1:
+            raise ValueError("max_size muss mindestens 1 sein")
+
+        self._factory = factory
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+
+        self._idle = deque()
+        self._in_use = {}
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'creations': 0,
+            'discards': 0,
+            'evictions': 0,
+            'failed_pings': 0,
+        }
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Gibt eine Verbindung aus dem Pool aus und erstellt bei Bedarf eine neue.
+
+        Args:
+            timeout (float, optional): Wartezeit in Sekunden, Standard ist checkout_timeout
+
+        Returns:
+            Verbindung aus dem Pool
+
+        Raises:
+            PoolTimeoutError: Wenn innerhalb der Wartezeit keine Verbindung frei wird
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            stale = []
+            entry = None
+            create = False
+
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Verbindungspool ist geschlossen")
+
+                stale.extend(self._evict_expired_locked())
+
+                waited = False
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"Keine freie Datenbankverbindung innerhalb von {timeout} Sekunden"
+                        )
+                    if not waited:
+                        self._stats['waits'] += 1
+                        waited = True
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    entry = self._idle.pop()
+                else:
+                    # Platz reservieren, die Verbindung wird außerhalb der Sperre aufgebaut
+                    self._size += 1
+                    create = True
+
+            self._close_all(stale)
+
+            if create:
+                try:
+                    entry = _PooledConnection(self._factory())
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._stats['creations'] += 1
+            elif not self._is_usable(entry):
+                self._discard(entry)
+                continue
+
+            with self._cond:
+                self._in_use[id(entry.conn)] = entry
+                self._stats['checkouts'] += 1
+            return entry.conn
+
+    def release(self, conn, discard: bool = False):
+        """
+        Gibt eine Verbindung an den Pool zurück.
+
+        Args:
+            conn: Zuvor mit acquire() ausgegebene Verbindung
+            discard (bool): Verbindung schließen statt wiederverwenden, z.B. nach einem Fehler
+        """
+        with self._cond:
+            entry = self._in_use.pop(id(conn), None)
+
+        if entry is None:
+            logger.warning("Unbekannte Verbindung an den Pool zurückgegeben")
+            return
+
+        if not discard:
+            try:
+                # Offene (implizite) Transaktionen beenden, bevor die Verbindung wiederverwendet wird
+                conn.rollback()
+            except Exception as e:
+                logger.warning(f"Rollback beim Zurückgeben fehlgeschlagen: {e}")
+                discard = True
+
+        now = time.monotonic()
+        if discard or self._closed or now - entry.created_at >= self.max_lifetime:
+            self._discard(entry)
+            return
+
+        entry.last_used = now
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def close(self):
+        """
+        Schließt alle freien Verbindungen und nimmt keine neuen Anfragen mehr an.
+        Ausgegebene Verbindungen werden bei der Rückgabe geschlossen.
+        """
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        self._close_all(idle)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Liefert die Zähler des Pools.
+
+        Returns:
+            Dict[str, int]: Zähler und aktuelle Belegung des Pools
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'max_size': self.max_size,
+            })
+        return stats
+
+    def _is_usable(self, entry: _PooledConnection) -> bool:
+        """
+        Prüft eine freie Verbindung vor der Ausgabe.
+        Die Prüfung per Roundtrip erfolgt nur nach längerem Leerlauf.
+        """
+        now = time.monotonic()
+        if now - entry.created_at >= self.max_lifetime:
+            return False
+        if now - entry.last_used < self.ping_after:
+            return True
+
+        try:
+            cursor = entry.conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception as e:
+            logger.warning(f"Verbindung im Pool nicht mehr nutzbar: {e}")
+            with self._cond:
+                self._stats['failed_pings'] += 1
+            return False
+
+    def _evict_expired_locked(self):
+        """
+        Entfernt abgelaufene freie Verbindungen. Muss unter der Sperre aufgerufen werden.
+
+        Returns:
+            list: Entfernte Einträge, die außerhalb der Sperre geschlossen werden müssen
+        """
+        now = time.monotonic()
+        keep = deque()
+        evicted = []
+
+        # Von der ältesten zur zuletzt benutzten Verbindung prüfen
+        while self._idle:
+            entry = self._idle.popleft()
+            expired = now - entry.created_at >= self.max_lifetime
+            surplus_idle = (now - entry.last_used >= self.idle_timeout
+                            and self._size - len(evicted) > self.min_size)
+            if expired or surplus_idle:
+                evicted.append(entry)
+            else:
+                keep.append(entry)
+
+        self._idle = keep
+        if evicted:
+            self._size -= len(evicted)
+            self._stats['evictions'] += len(evicted)
+            self._cond.notify(len(evicted))
+        return evicted
+
+    def _discard(self, entry: _PooledConnection):
+        """Schließt eine Verbindung und gibt ihren Platz im Pool frei."""
+        with self._cond:
+            self._size -= 1
+            self._stats['discards'] += 1
+            self._cond.notify()
+        self._close_all([entry])
+
+    @staticmethod
+    def _close_all(entries):
+        for entry in entries:
+            try:
+                entry.conn.close()
+            except Exception as e:
+                logger.warning(f"Fehler beim Schließen einer Pool-Verbindung: {e}")
@@ -3,10 +3,30 @@ Modul mit Datenbankabfragen für die RitterDigitalAuswertung-Anwendung.
 """
 
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Iterator, Mapping, Optional, Tuple
 
-from config.database import RAUMBUCH_QUERY, STANDORTE_QUERY, DEFAULT_STANDORT_ID
+import pandas as pd
+
+from config.database import (
+    RAUMBUCH_BASE_QUERY,
+    RAUMBUCH_WHERE,
+    RAUMBUCH_ORDER_BY,
+    RAUMBUCH_FILTERS,
+    RAUMBUCH_SUMMARY_QUERY,
+    RAUMBUCH_FILTER_OPTIONS_QUERY,
+    RAUMBUCH_PAGE_QUERY,
+    RAUMBUCH_PAGE_ORDER_BY,
+    RAUMBUCH_VERSION_QUERY,
+    RAUMBUCH_CACHE_CONFIG,
+    STANDORT_INDEX_CONFIG,
+    STANDORTE_QUERY,
+    DEFAULT_STANDORT_ID,
+    FETCH_BATCH_SIZE
+)
+from src.database.cache import RaumbuchCache, StandortIndex
 from src.database.connection import db_connection
+from src.database.frames import RaumbuchFrameBuilder
+from src.models.raumbuch import RAUMBUCH_COLUMNS
 
 # Logging konfigurieren
 logging.basicConfig(
@@ -15,6 +35,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Ergebnis-Cache für get_raumbuch_data
+raumbuch_cache = RaumbuchCache(
+    ttl=RAUMBUCH_CACHE_CONFIG['ttl'],
+    max_entries=RAUMBUCH_CACHE_CONFIG['max_entries'],
+    max_bytes=RAUMBUCH_CACHE_CONFIG['max_bytes']
+)
+
 
 def row_to_dict(cursor, row):
     """
@@ -30,52 +57,700 @@ def row_to_dict(cursor, row):
     return {column[0]: value for column, value in zip(cursor.description, row)}
 
 
-def get_raumbuch_data(standort_id: int = DEFAULT_STANDORT_ID) -> List[Dict[str, Any]]:
+def rows_to_dicts(cursor, rows) -> List[Dict[str, Any]]:
     """
-    Ruft die Raumbuch-Daten für einen Standort ab.
+    Konvertiert mehrere Zeilen aus dem Cursor in Dictionaries.
+    Die Spaltennamen werden dabei nur einmal aus cursor.description gelesen.
 
     Args:
-        standort_id (int): ID des Standorts, für den die Daten abgerufen werden sollen
+        cursor: Der Cursor mit Spaltennamen
+        rows: Die zu konvertierenden Zeilen
 
     Returns:
-        List[Dict[str, Any]]: Liste der Raumbuch-Daten als Dictionaries
+        List[Dict[str, Any]]: Zeilen als Dictionaries
+    """
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def normalize_filters(filters: Optional[Mapping[str, Any]]) -> Tuple[Tuple[str, str], ...]:
+    """
+    Reduziert Filterparameter auf die bekannten, nicht leeren Filter.
+
+    Args:
+        filters (Mapping, optional): Filter, z.B. request.args oder ein Dictionary
+
+    Returns:
+        Tuple[Tuple[str, str], ...]: Sortierte (Filtername, Wert)-Paare, als Cache-Schlüssel geeignet
+    """
+    if not filters:
+        return ()
+    return tuple(sorted(
+        (name, filters.get(name)) for name in RAUMBUCH_FILTERS if filters.get(name)
+    ))
+
+
+def build_raumbuch_where(filters: Tuple[Tuple[str, str], ...] = ()) -> Tuple[str, List[str]]:
+    """
+    Erstellt die WHERE-Klausel der Raumbuch-Abfrage mit parametrisierten Filterbedingungen.
+
+    Args:
+        filters (Tuple[Tuple[str, str], ...]): Normalisierte Filter aus normalize_filters
+
+    Returns:
+        Tuple[str, List[str]]: WHERE-Klausel und die Filterwerte, die nach der Standort-ID als
+        Parameter übergeben werden
+    """
+    conditions = ''.join(f"  AND {RAUMBUCH_FILTERS[name]['sql']} = ?\n" for name, _ in filters)
+    return RAUMBUCH_WHERE + conditions, [value for _, value in filters]
+
+
+def build_raumbuch_query(filters: Tuple[Tuple[str, str], ...] = ()) -> Tuple[str, List[str]]:
+    """
+    Erstellt die Raumbuch-Abfrage mit parametrisierten Filterbedingungen.
+
+    Args:
+        filters (Tuple[Tuple[str, str], ...]): Normalisierte Filter aus normalize_filters
+
+    Returns:
+        Tuple[str, List[str]]: SQL-Abfrage und die Filterwerte, die nach der Standort-ID als
+        Parameter übergeben werden
     """
+    where, params = build_raumbuch_where(filters)
+    return RAUMBUCH_BASE_QUERY + where + RAUMBUCH_ORDER_BY, params
+
+
+def iter_filtered_rows(rows: Iterable[Dict[str, Any]],
+                       filters: Tuple[Tuple[str, str], ...]) -> Iterator[Dict[str, Any]]:
+    """
+    Filtert Raumbuch-Daten zeilenweise mit denselben Bedingungen wie build_raumbuch_query.
+
+    Verglichen wird wie mit der Standard-Sortierfolge von SQL Server: ohne Beachtung
+    von Groß- und Kleinschreibung und nachgestellter Leerzeichen. So liefert ein Filter
+    dieselben Räume, unabhängig davon, ob er in der Datenbank oder auf dem gecachten
+    Standort angewendet wird.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): Raumbuch-Daten, auch als Generator
+        filters (Tuple[Tuple[str, str], ...]): Normalisierte Filter aus normalize_filters
+
+    Yields:
+        Dict[str, Any]: Zeilen, die alle Filter erfüllen
+    """
+    conditions = [(RAUMBUCH_FILTERS[name]['column'], _comparable(value)) for name, value in filters]
+    for row in rows:
+        if all(_comparable(row.get(column)) == value for column, value in conditions):
+            yield row
+
+
+def _comparable(value: Any) -> Optional[str]:
+    """Bereitet einen Wert für den Vergleich wie mit einer CI-Sortierfolge von SQL Server vor."""
+    if value is None:
+        return None
+    return str(value).rstrip(' ').casefold()
+
+
+def filter_raumbuch_rows(rows: Iterable[Dict[str, Any]],
+                         filters: Tuple[Tuple[str, str], ...]) -> List[Dict[str, Any]]:
+    """
+    Filtert bereits geladene Raumbuch-Daten mit denselben Bedingungen wie build_raumbuch_query.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): Raumbuch-Daten
+        filters (Tuple[Tuple[str, str], ...]): Normalisierte Filter aus normalize_filters
+
+    Returns:
+        List[Dict[str, Any]]: Gefilterte Raumbuch-Daten
+    """
+    return list(iter_filtered_rows(rows, filters))
+
+
+def iter_raumbuch_rows(standort_id: int = DEFAULT_STANDORT_ID,
+                       filters: Optional[Mapping[str, Any]] = None,
+                       batch_size: int = FETCH_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Liefert die Raumbuch-Daten eines Standorts zeilenweise, ohne das Ergebnis zu materialisieren.
+
+    Liegt das Ergebnis aktuell im Cache, wird daraus gelesen. Andernfalls werden die
+    Zeilen mit fetchmany() in Blöcken von batch_size gelesen, sodass der Speicherbedarf
+    unabhängig von der Anzahl der Räume bleibt. Die Verbindung bleibt bis zum Ende
+    der Iteration (oder bis der Generator geschlossen wird) belegt.
+
+    Args:
+        standort_id (int): ID des Standorts
+        filters (Mapping, optional): Filter nach 'bereich', 'gebaeudeteil', 'etage' und 'rg'
+        batch_size (int): Anzahl Zeilen pro fetchmany()-Aufruf
+
+    Yields:
+        Dict[str, Any]: Raumbuch-Zeile mit Spaltennamen als Schlüssel
+
+    Raises:
+        Exception: Wenn die Abfrage fehlschlägt
+    """
+    filter_items = normalize_filters(filters)
+
+    if RAUMBUCH_CACHE_CONFIG['enabled']:
+        for key, row_filters in (((standort_id, filter_items), ()), ((standort_id, ()), filter_items)):
+            cached = raumbuch_cache.get(key)
+            if cached is not None and raumbuch_cache.is_fresh(cached):
+                raumbuch_cache.record_hit()
+                yield from iter_filtered_rows(cached.rows, row_filters)
+                return
+
+    query, filter_params = build_raumbuch_query(filter_items)
+    count = 0
+
     try:
         with db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(RAUMBUCH_QUERY, (standort_id,))
+            cursor.execute(query, (standort_id, *filter_params))
+            columns = [column[0] for column in cursor.description]
 
-            # Ergebnisse in Liste von Dictionaries konvertieren
-            results = []
-            for row in cursor.fetchall():
-                results.append(row_to_dict(cursor, row))
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                for row in batch:
+                    yield dict(zip(columns, row))
+                count += len(batch)
+    except Exception as e:
+        logger.error(f"Fehler beim Streamen der Raumbuch-Daten: {e}")
+        raise
+
+    logger.info(f"Raumbuch-Daten für Standort {standort_id} gestreamt: {count} Einträge")
+
+
+def get_raumbuch_frame(standort_id: int = DEFAULT_STANDORT_ID,
+                       filters: Optional[Mapping[str, Any]] = None,
+                       batch_size: int = FETCH_BATCH_SIZE) -> pd.DataFrame:
+    """
+    Ruft die Raumbuch-Daten eines Standorts als typisierten DataFrame ab.
+
+    Kennzahlen wie qm oder WertMonat liegen als float64 vor (NULL wird zu 0.0),
+    Bereich, Etage, RG usw. als Kategorien. Der Raumbuch-Cache wird wie bei
+    get_raumbuch_data verwendet, abgelaufene Einträge per Versionsabfrage bestätigt
+    und fehlende Ergebnisse dort abgelegt. Der DataFrame wird am Cache-Eintrag
+    gespeichert und nur einmal je Datenversion aufgebaut. Ohne Cache werden die
+    Cursor-Blöcke aus fetchmany() direkt in Spalten-Arrays übernommen.
+
+    Args:
+        standort_id (int): ID des Standorts
+        filters (Mapping, optional): Filter nach 'bereich', 'gebaeudeteil', 'etage' und 'rg'
+        batch_size (int): Anzahl Zeilen pro fetchmany()-Aufruf
+
+    Returns:
+        pd.DataFrame: Raumbuch-Daten, bei Fehlern ein leerer DataFrame
+    """
+    filter_items = normalize_filters(filters)
+
+    if not RAUMBUCH_CACHE_CONFIG['enabled']:
+        return _fetch_raumbuch_frame(standort_id, filter_items, batch_size)
+
+    if filter_items:
+        # Liegt der ungefilterte Standort bereits vor, wird im Speicher gefiltert
+        unfiltered = raumbuch_cache.get((standort_id, ()))
+        if unfiltered is not None and raumbuch_cache.is_fresh(unfiltered):
+            raumbuch_cache.record_hit()
+            return _frame_from_rows(iter_filtered_rows(unfiltered.rows, filter_items))
+
+    cache_key = (standort_id, filter_items)
+    cached = raumbuch_cache.get(cache_key)
+
+    if cached is not None and raumbuch_cache.is_fresh(cached):
+        raumbuch_cache.record_hit()
+    else:
+        query, filter_params = build_raumbuch_query(filter_items)
+        try:
+            rows = _cached_query(standort_id, cache_key, query, (standort_id, *filter_params), cached)
+        except Exception as e:
+            logger.error(f"Fehler beim Abrufen der Raumbuch-Daten: {e}")
+            return _frame_from_rows([])
+
+        cached = raumbuch_cache.get(cache_key)
+        if cached is None:
+            # Ergebnis zu groß für den Cache
+            return _frame_from_rows(rows)
+
+    if cached.frame is None:
+        cached.frame = _frame_from_rows(cached.rows)
+    # Kopie, damit Auswertungen den gemeinsamen DataFrame nicht verändern
+    return cached.frame.copy()
+
+
+def _fetch_raumbuch_frame(standort_id: int, filter_items: Tuple[Tuple[str, str], ...],
+                          batch_size: int) -> pd.DataFrame:
+    """
+    Liest die Raumbuch-Daten blockweise vom Cursor direkt in einen DataFrame.
+
+    Args:
+        standort_id (int): ID des Standorts
+        filter_items (Tuple[Tuple[str, str], ...]): Normalisierte Filter aus normalize_filters
+        batch_size (int): Anzahl Zeilen pro fetchmany()-Aufruf
+
+    Returns:
+        pd.DataFrame: Raumbuch-Daten, bei Fehlern ein leerer DataFrame
+    """
+    query, filter_params = build_raumbuch_query(filter_items)
+
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, (standort_id, *filter_params))
+            builder = RaumbuchFrameBuilder([column[0] for column in cursor.description])
 
-            logger.info(f"Raumbuch-Daten für Standort {standort_id} erfolgreich abgerufen: {len(results)} Einträge")
-            return results
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                builder.append(batch)
+
+        logger.info(f"Raumbuch-Daten für Standort {standort_id} spaltenweise geladen: {builder.row_count} Einträge")
+        return builder.build()
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen der Raumbuch-Daten: {e}")
+        return _frame_from_rows([])
+
+
+def _frame_from_rows(rows: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """Erstellt den typisierten DataFrame aus Zeilen-Dictionaries, z.B. aus dem Cache."""
+    builder = RaumbuchFrameBuilder(RAUMBUCH_COLUMNS)
+    builder.append_dicts(rows)
+    return builder.build()
+
+
+def get_raumbuch_data(standort_id: int = DEFAULT_STANDORT_ID,
+                      filters: Optional[Mapping[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Ruft die Raumbuch-Daten für einen Standort ab.
+
+    Filter werden als WHERE-Bedingungen an die Datenbank übergeben, sodass nur
+    passende Räume übertragen werden. Ergebnisse werden je Standort und Filter
+    gecacht. Innerhalb der TTL wird der Cache ohne Datenbankzugriff verwendet,
+    danach entscheidet eine günstige Versionsabfrage, ob die vollständige Abfrage
+    erneut ausgeführt werden muss.
+
+    Args:
+        standort_id (int): ID des Standorts, für den die Daten abgerufen werden sollen
+        filters (Mapping, optional): Filter nach 'bereich', 'gebaeudeteil', 'etage' und 'rg'
+
+    Returns:
+        List[Dict[str, Any]]: Liste der Raumbuch-Daten als Dictionaries
+    """
+    filter_items = normalize_filters(filters)
+    use_cache = RAUMBUCH_CACHE_CONFIG['enabled']
+
+    if use_cache and filter_items:
+        # Liegt der ungefilterte Standort bereits vor, wird im Speicher gefiltert
+        unfiltered = raumbuch_cache.get((standort_id, ()))
+        if unfiltered is not None and raumbuch_cache.is_fresh(unfiltered):
+            raumbuch_cache.record_hit()
+            return filter_raumbuch_rows(unfiltered.rows, filter_items)
+
+    cache_key = (standort_id, filter_items)
+    cached = raumbuch_cache.get(cache_key) if use_cache else None
+
+    if cached is not None and raumbuch_cache.is_fresh(cached):
+        raumbuch_cache.record_hit()
+        return list(cached.rows)
+
+    query, filter_params = build_raumbuch_query(filter_items)
+
+    try:
+        results = _cached_query(standort_id, cache_key, query, (standort_id, *filter_params), cached)
+        logger.info(f"Raumbuch-Daten für Standort {standort_id} erfolgreich abgerufen: {len(results)} Einträge")
+        return results
     except Exception as e:
         logger.error(f"Fehler beim Abrufen der Raumbuch-Daten: {e}")
         return []
 
 
-def get_standorte() -> List[Dict[str, Any]]:
+def get_raumbuch_summary(standort_id: int = DEFAULT_STANDORT_ID,
+                         filters: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
     """
-    Ruft alle verfügbaren Standorte ab.
+    Berechnet die Zusammenfassung der Raumbuch-Daten direkt in der Datenbank.
+
+    Gesamtwerte sowie die Summen je Bereich und je Reinigungsgruppe werden per
+    GROUPING SETS in einer Abfrage ermittelt, ohne die einzelnen Räume zu übertragen.
+    Das Ergebnis hat dieselbe Struktur wie calculate_summary.
+
+    Args:
+        standort_id (int): ID des Standorts
+        filters (Mapping, optional): Filter nach 'bereich', 'gebaeudeteil', 'etage' und 'rg'
 
     Returns:
-        List[Dict[str, Any]]: Liste der Standorte als Dictionaries
+        Dict[str, Any]: Zusammenfassende Statistiken, leer wenn keine Räume vorhanden sind
+    """
+    filter_items = normalize_filters(filters)
+    cache_key = (standort_id, filter_items, 'summary')
+    use_cache = RAUMBUCH_CACHE_CONFIG['enabled']
+    cached = raumbuch_cache.get(cache_key) if use_cache else None
+
+    if cached is not None and raumbuch_cache.is_fresh(cached):
+        raumbuch_cache.record_hit()
+        rows = cached.rows
+    else:
+        where, filter_params = build_raumbuch_where(filter_items)
+        query = RAUMBUCH_SUMMARY_QUERY.format(where=where)
+        try:
+            rows = _cached_query(standort_id, cache_key, query, (standort_id, *filter_params), cached)
+        except Exception as e:
+            logger.error(f"Fehler beim Berechnen der Raumbuch-Zusammenfassung: {e}")
+            return {}
+
+    return _shape_summary(rows)
+
+
+def _shape_summary(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Bringt das Ergebnis von RAUMBUCH_SUMMARY_QUERY in die Struktur von calculate_summary.
+
+    Args:
+        rows (List[Dict[str, Any]]): Zeilen der GROUPING-SETS-Abfrage
+
+    Returns:
+        Dict[str, Any]: Zusammenfassende Statistiken
+    """
+    def number(value):
+        return float(value) if value is not None else 0.0
+
+    def group_stats(row, key):
+        return {
+            key: row[key],
+            'qm': number(row['qm']),
+            'WertMonat': number(row['WertMonat']),
+            'WertJahr': number(row['WertJahr']),
+            'StundenMonat': number(row['StundenMonat'])
+        }
+
+    total = None
+    bereich_stats = []
+    rg_stats = []
+
+    for row in rows:
+        if row['GruppeBereich'] and row['GruppeRG']:
+            total = row
+        elif not row['GruppeBereich'] and row['Bereich'] is not None:
+            bereich_stats.append(group_stats(row, 'Bereich'))
+        elif not row['GruppeRG'] and row['RG'] is not None:
+            rg_stats.append(group_stats(row, 'RG'))
+
+    if total is None or not total['Anzahl']:
+        return {}
+
+    return {
+        'total_rooms': int(total['Anzahl']),
+        'total_qm': number(total['qm']),
+        'total_qm_monat': number(total['qmMonat']),
+        'total_wert_monat': number(total['WertMonat']),
+        'total_wert_jahr': number(total['WertJahr']),
+        'total_stunden_monat': number(total['StundenMonat']),
+        'bereich_stats': bereich_stats,
+        'rg_stats': rg_stats
+    }
+
+
+def get_raumbuch_filter_options(standort_id: int = DEFAULT_STANDORT_ID,
+                                filters: Optional[Mapping[str, Any]] = None) -> Dict[str, List[str]]:
+    """
+    Ermittelt die vorkommenden Werte der Filterspalten direkt in der Datenbank.
+
+    Args:
+        standort_id (int): ID des Standorts
+        filters (Mapping, optional): Filter nach 'bereich', 'gebaeudeteil', 'etage' und 'rg'
+
+    Returns:
+        Dict[str, List[str]]: Sortierte, nicht leere Werte je Spalte ('Bereich',
+        'Gebaeudeteil', 'Etage', 'RG'), bei Fehlern leer
+    """
+    filter_items = normalize_filters(filters)
+    cache_key = (standort_id, filter_items, 'filter_options')
+    use_cache = RAUMBUCH_CACHE_CONFIG['enabled']
+    cached = raumbuch_cache.get(cache_key) if use_cache else None
+
+    if cached is not None and raumbuch_cache.is_fresh(cached):
+        raumbuch_cache.record_hit()
+        rows = cached.rows
+    else:
+        where, filter_params = build_raumbuch_where(filter_items)
+        query = RAUMBUCH_FILTER_OPTIONS_QUERY.format(where=where)
+        try:
+            rows = _cached_query(standort_id, cache_key, query, (standort_id, *filter_params), cached)
+        except Exception as e:
+            logger.error(f"Fehler beim Abrufen der Filteroptionen: {e}")
+            return {}
+
+    options = {}
+    for filter_config in RAUMBUCH_FILTERS.values():
+        column = filter_config['column']
+        options[column] = sorted(
+            row[column] for row in rows if not row[f'Gruppe{column}'] and row[column]
+        )
+    return options
+
+
+def get_raumbuch_page(standort_id: int = DEFAULT_STANDORT_ID,
+                      filters: Optional[Mapping[str, Any]] = None,
+                      sort: Optional[str] = None,
+                      descending: bool = False,
+                      offset: int = 0,
+                      limit: int = 100,
+                      columns: Optional[Iterable[str]] = None) -> Dict[str, Any]:
     """
+    Liefert eine sortierte Seite der Raumbuch-Daten mit ausgewählten Spalten.
+
+    Liegt der Standort aktuell im Cache, wird die Seite im Speicher sortiert und
+    ausgeschnitten. Andernfalls sortiert die Datenbank und überträgt per
+    OFFSET/FETCH nur die Zeilen der Seite.
+
+    Args:
+        standort_id (int): ID des Standorts
+        filters (Mapping, optional): Filter nach 'bereich', 'gebaeudeteil', 'etage' und 'rg'
+        sort (str, optional): Spalte aus RAUMBUCH_COLUMNS, ohne Angabe die Reihenfolge
+            von RAUMBUCH_ORDER_BY
+        descending (bool): Absteigend sortieren
+        offset (int): Anzahl der zu überspringenden Zeilen
+        limit (int): Maximale Anzahl Zeilen der Seite
+        columns (Iterable[str], optional): Spalten aus RAUMBUCH_COLUMNS, ohne Angabe alle
+
+    Returns:
+        Dict[str, Any]: 'rows' mit den Zeilen der Seite und 'total' mit der Anzahl
+        aller gefilterten Räume
+
+    Raises:
+        ValueError: Bei unbekannter Sortier- oder Ergebnisspalte
+        Exception: Wenn die Abfrage fehlschlägt
+    """
+    columns = tuple(columns) if columns else RAUMBUCH_COLUMNS
+    unknown = [column for column in (*columns, sort) if column and column not in RAUMBUCH_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unbekannte Spalte: {', '.join(unknown)}")
+
+    filter_items = normalize_filters(filters)
+
+    if RAUMBUCH_CACHE_CONFIG['enabled']:
+        for key, row_filters in (((standort_id, filter_items), ()), ((standort_id, ()), filter_items)):
+            cached = raumbuch_cache.get(key)
+            if cached is not None and raumbuch_cache.is_fresh(cached):
+                raumbuch_cache.record_hit()
+                rows = list(iter_filtered_rows(cached.rows, row_filters))
+                if sort:
+                    rows = sort_raumbuch_rows(rows, sort, descending)
+                return {
+                    'rows': [{column: row.get(column) for column in columns}
+                             for row in rows[offset:offset + limit]],
+                    'total': len(rows)
+                }
+
+    where, filter_params = build_raumbuch_where(filter_items)
+    if sort:
+        order_by = [f"Raumbuch.{sort}{' DESC' if descending else ''}", 'Raumbuch.ID']
+    else:
+        order_by = [f"Raumbuch.{column}" for column in RAUMBUCH_PAGE_ORDER_BY]
+    query = RAUMBUCH_PAGE_QUERY.format(
+        columns='\n ,'.join(f"Raumbuch.{column}" for column in columns),
+        where=where,
+        order_by='\n ,'.join(order_by)
+    )
+
     try:
         with db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(STANDORTE_QUERY)
+            cursor.execute(query, (standort_id, *filter_params, offset, limit))
+            rows = rows_to_dicts(cursor, cursor.fetchall())
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen einer Raumbuch-Seite: {e}")
+        raise
+
+    if rows:
+        total = int(rows[0]['Gesamt'])
+    elif offset:
+        # Seite hinter dem Ende: die Anzahl kommt aus der (gecachten) Zusammenfassung
+        total = get_raumbuch_summary(standort_id, filters).get('total_rooms', 0)
+    else:
+        total = 0
+
+    for row in rows:
+        row.pop('Gesamt', None)
+    return {'rows': rows, 'total': total}
+
+
+def sort_raumbuch_rows(rows: List[Dict[str, Any]], sort: str,
+                       descending: bool = False) -> List[Dict[str, Any]]:
+    """
+    Sortiert Raumbuch-Zeilen wie ORDER BY in RAUMBUCH_PAGE_QUERY.
+
+    NULL-Werte stehen aufsteigend am Anfang und absteigend am Ende, Texte werden
+    ohne Beachtung der Groß-/Kleinschreibung verglichen, gleiche Werte nach ID.
+
+    Args:
+        rows (List[Dict[str, Any]]): Raumbuch-Zeilen
+        sort (str): Spalte aus RAUMBUCH_COLUMNS
+        descending (bool): Absteigend sortieren
+
+    Returns:
+        List[Dict[str, Any]]: Neue, sortierte Liste derselben Zeilen
+    """
+    def sort_key(row):
+        value = row.get(sort)
+        if isinstance(value, str):
+            value = value.casefold()
+        return value is not None, value
+
+    rows = sorted(rows, key=lambda row: row.get('ID') or 0)
+    rows.sort(key=sort_key, reverse=descending)
+    return rows
+
+
+def _cached_query(standort_id: int, cache_key: Tuple, query: str, params: Tuple,
+                  cached=None) -> List[Dict[str, Any]]:
+    """
+    Führt eine Standort-Abfrage aus und legt das Ergebnis im Raumbuch-Cache ab.
+
+    Liegt ein abgelaufener Cache-Eintrag vor, wird zunächst nur die Datenversion
+    geprüft und der Eintrag bei unveränderten Daten weiterverwendet.
+
+    Args:
+        standort_id (int): ID des Standorts für die Versionsabfrage
+        cache_key (tuple): Schlüssel im Raumbuch-Cache
+        query (str): Auszuführende Abfrage
+        params (tuple): Parameter der Abfrage
+        cached (CacheEntry, optional): Abgelaufener Cache-Eintrag zum Schlüssel
+
+    Returns:
+        List[Dict[str, Any]]: Ergebniszeilen als Dictionaries
+
+    Raises:
+        Exception: Wenn die Abfrage fehlschlägt
+    """
+    use_cache = RAUMBUCH_CACHE_CONFIG['enabled']
 
-            # Ergebnisse in Liste von Dictionaries konvertieren
-            results = []
-            for row in cursor.fetchall():
-                results.append(row_to_dict(cursor, row))
+    with db_connection() as conn:
+        cursor = conn.cursor()
 
-            logger.info(f"Standorte erfolgreich abgerufen: {len(results)} Einträge")
-            return results
+        if cached is not None:
+            cursor.execute(RAUMBUCH_VERSION_QUERY, (standort_id,))
+            if _read_version(cursor) == cached.version:
+                raumbuch_cache.revalidate(cache_key)
+                logger.info(f"Raumbuch-Daten für Standort {standort_id} unverändert, Cache wird verwendet")
+                return list(cached.rows)
+
+        version = None
+        if use_cache:
+            # Versionsabfrage und Datenabfrage in einem Roundtrip ausführen
+            cursor.execute(RAUMBUCH_VERSION_QUERY + query, (standort_id, *params))
+            version = _read_version(cursor)
+            cursor.nextset()
+        else:
+            cursor.execute(query, params)
+
+        # Ergebnisse in Liste von Dictionaries konvertieren
+        results = rows_to_dicts(cursor, cursor.fetchall())
+
+        if use_cache:
+            raumbuch_cache.put(cache_key, results, version)
+
+        return list(results)
+
+
+def invalidate_raumbuch_cache(standort_id: Optional[int] = None):
+    """
+    Verwirft gecachte Raumbuch-Daten, z.B. nach bekannten Änderungen im Raumbuch.
+
+    Args:
+        standort_id (int, optional): ID des Standorts, ohne Angabe wird der gesamte Cache geleert
+    """
+    raumbuch_cache.invalidate(standort_id)
+
+
+def get_raumbuch_version(standort_id: int = DEFAULT_STANDORT_ID) -> Optional[Tuple]:
+    """
+    Ermittelt die aktuelle Datenversion eines Standorts mit der günstigen Versionsabfrage.
+    Geeignet, um abgeleitete Ergebnisse wie Exportdateien oder ETags zu versionieren.
+
+    Innerhalb der TTL des Raumbuch-Caches wird die Version aus dem Cache übernommen,
+    erst danach wird die Datenbank erneut gefragt.
+
+    Args:
+        standort_id (int): ID des Standorts
+
+    Returns:
+        Optional[Tuple]: Anzahl, höchste ID und Prüfsummen wie von _read_version, None bei Fehlern
+    """
+    use_cache = RAUMBUCH_CACHE_CONFIG['enabled']
+    if use_cache:
+        version = raumbuch_cache.fresh_version(standort_id)
+        if version is not None:
+            return version
+
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(RAUMBUCH_VERSION_QUERY, (standort_id,))
+            version = _read_version(cursor)
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen der Datenversion: {e}")
+        return None
+
+    if use_cache and version is not None:
+        raumbuch_cache.remember_version(standort_id, version)
+    return version
+
+
+def _read_version(cursor) -> Optional[Tuple]:
+    """
+    Liest das Ergebnis der Versionsabfrage vom Cursor.
+
+    Args:
+        cursor: Cursor, auf dem RAUMBUCH_VERSION_QUERY ausgeführt wurde
+
+    Returns:
+        Optional[Tuple]: Anzahl, höchste ID und Prüfsumme der Räume des Standorts sowie
+        die Prüfsummen von Preisen und verknüpften Tabellen
+    """
+    row = cursor.fetchone()
+    return tuple(row) if row is not None else None
+
+
+def _load_standorte() -> List[Dict[str, Any]]:
+    """
+    Lädt alle Standorte direkt aus der Datenbank.
+
+    Returns:
+        List[Dict[str, Any]]: Liste der Standorte als Dictionaries
+
+    Raises:
+        Exception: Wenn die Abfrage fehlschlägt
+    """
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(STANDORTE_QUERY)
+
+        # Ergebnisse in Liste von Dictionaries konvertieren
+        results = []
+        for row in cursor.fetchall():
+            results.append(row_to_dict(cursor, row))
+
+        logger.info(f"Standorte erfolgreich abgerufen: {len(results)} Einträge")
+        return results
+
+
+# Im Speicher gehaltene Standortliste für get_standorte und get_standort_by_id
+standort_index = StandortIndex(
+    _load_standorte,
+    refresh_interval=STANDORT_INDEX_CONFIG['refresh_interval']
+)
+
+
+def get_standorte() -> List[Dict[str, Any]]:
+    """
+    Ruft alle verfügbaren Standorte ab.
+    Die Liste wird im Speicher gehalten und periodisch im Hintergrund aktualisiert.
+
+    Returns:
+        List[Dict[str, Any]]: Liste der Standorte als Dictionaries
+    """
+    try:
+        return standort_index.get_all()
     except Exception as e:
         logger.error(f"Fehler beim Abrufen der Standorte: {e}")
         return []
@@ -84,6 +759,8 @@ def get_standorte() -> List[Dict[str, Any]]:
 def get_standort_by_id(standort_id: int) -> Optional[Dict[str, Any]]:
     """
     Ruft einen Standort anhand seiner ID ab.
+    Bekannte Standorte werden aus der Standortliste im Speicher geliefert, nur
+    unbekannte IDs (z.B. neu angelegte Standorte) führen zu einer Datenbankabfrage.
 
     Args:
         standort_id (int): ID des Standorts
@@ -91,6 +768,10 @@ def get_standort_by_id(standort_id: int) -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict[str, Any]]: Standortinformationen oder None, falls nicht gefunden
     """
+    standort = standort_index.get(standort_id)
+    if standort is not None:
+        return standort
+
     try:
         with db_connection() as conn:
             cursor = conn.cursor()
@@ -98,10 +779,20 @@ def get_standort_by_id(standort_id: int) -> Optional[Dict[str, Any]]:
 
             row = cursor.fetchone()
             if row:
+                if standort_index.loaded:
+                    # Standort ist neu hinzugekommen, Liste beim nächsten Zugriff neu laden
+                    standort_index.invalidate()
                 return row_to_dict(cursor, row)
 
             logger.warning(f"Standort mit ID {standort_id} nicht gefunden")
             return None
     except Exception as e:
         logger.error(f"Fehler beim Abrufen des Standorts: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def invalidate_standorte():
+    """
+    Verwirft die Standortliste im Speicher, sodass sie beim nächsten Zugriff neu geladen wird.
+    """
+    standort_index.invalidate()
@@ -4,5 +4,6 @@ Enthält Datenmodelle und Validierungsfunktionen.
 """
 
 from src.models.raumbuch import RaumbuchEntry
+from src.models.table import RaumbuchTable
 
-__all__ = ['RaumbuchEntry']
\ No newline at end of file
+__all__ = ['RaumbuchEntry', 'RaumbuchTable']
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+Spaltenweise Umwandlung der numerischen Raumbuch-Spalten.
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.models.raumbuch import RAUMBUCH_NUMERIC_COLUMNS
+
+
+def _to_float(value, default):
+    """Wandelt einen einzelnen Wert wie safe_number um."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def coerce_numeric(values: Any, default: float = 0.0) -> np.ndarray:
+    """
+    Wandelt eine ganze Spalte in ein float64-Array um.
+
+    Es gelten dieselben Regeln wie bei safe_number: Zahlen, Decimal und numerische
+    Zeichenketten werden übernommen, None und nicht umwandelbare Werte durch den
+    Standardwert ersetzt. NaN gilt als NULL und wird ebenfalls ersetzt.
+
+    Args:
+        values: Spaltenwerte als Sequenz, Series oder Array
+        default (float): Standardwert für NULL und ungültige Werte
+
+    Returns:
+        np.ndarray: Neues float64-Array
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values, dtype=object)
+
+    if pd.api.types.is_float_dtype(series.dtype):
+        result = series.to_numpy(dtype=np.float64, copy=True)
+    elif pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+        result = series.to_numpy(dtype=np.float64)
+    else:
+        result = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64, copy=True)
+
+        # Zeichenketten, die pandas ablehnt, float() aber akzeptiert (z.B. '1_000'),
+        # einzeln nachbehandeln; betrifft nur ungültige Werte
+        retry = np.flatnonzero(np.isnan(result))
+        if len(retry):
+            objects = series.to_numpy(dtype=object)
+            for i in retry:
+                value = objects[i]
+                if isinstance(value, (str, Decimal)):
+                    result[i] = _to_float(value, np.nan)
+
+    result[np.isnan(result)] = default
+    return result
+
+
+def coerce_integer(values: Sequence[Any]) -> np.ndarray:
+    """
+    Wandelt eine Schlüsselspalte in ein int64-Array um.
+    Enthält die Spalte NULL-Werte, bleiben die Werte als Objekte erhalten.
+
+    Args:
+        values (Sequence[Any]): Spaltenwerte
+
+    Returns:
+        np.ndarray: Werte als int64 oder object
+    """
+    try:
+        return np.array(values, dtype=np.int64)
+    except (TypeError, ValueError):
+        return np.array(values, dtype=object)
+
+
+def coerce_numeric_columns(df: pd.DataFrame, columns: Sequence[str] = RAUMBUCH_NUMERIC_COLUMNS,
+                           default: float = 0.0, copy: bool = False) -> pd.DataFrame:
+    """
+    Wandelt die numerischen Spalten eines DataFrames spaltenweise in float64 um.
+    Spalten, die bereits float64 ohne NULL-Werte sind, bleiben unangetastet.
+
+    Args:
+        df (pd.DataFrame): DataFrame mit Raumbuch-Daten
+        columns (Sequence[str]): Umzuwandelnde Spalten, fehlende werden übersprungen
+        default (float): Standardwert für NULL und ungültige Werte
+        copy (bool): DataFrame vor einer Änderung kopieren, damit der Aufrufer unverändert bleibt
+
+    Returns:
+        pd.DataFrame: DataFrame mit float64-Spalten
+    """
+    pending = [
+        col for col in columns
+        if col in df.columns
+        and not (df[col].dtype == np.float64 and not df[col].hasnans)
+    ]
+    if pending and copy:
+        df = df.copy()
+    for col in pending:
+        df[col] = coerce_numeric(df[col], default)
+    return df
+
+
+def coerce_numeric_rows(rows: List[Dict[str, Any]], fields: Iterable[str] = RAUMBUCH_NUMERIC_COLUMNS,
+                        default: float = 0.0) -> List[Dict[str, Any]]:
+    """
+    Wandelt die numerischen Felder eines Blocks von Zeilen-Dictionaries spaltenweise um.
+    Die Dictionaries werden direkt geändert; Felder, die in der ersten Zeile fehlen,
+    werden übersprungen.
+
+    Args:
+        rows (List[Dict[str, Any]]): Zeilen-Dictionaries
+        fields (Iterable[str]): Umzuwandelnde Felder
+        default (float): Standardwert für NULL und ungültige Werte
+
+    Returns:
+        List[Dict[str, Any]]: Dieselben Zeilen mit float-Werten
+    """
+    if not rows:
+        return rows
+
+    for field in [field for field in fields if field in rows[0]]:
+        values = coerce_numeric([row.get(field) for row in rows], default).tolist()
+        for row, value in zip(rows, values):
+            row[field] = value
+    return rows
@@ -2,14 +2,64 @@
 Enthält Datenmodelle für die Raumbuch-Anwendung.
 """
 
+import sys
 from dataclasses import dataclass
 from typing import Optional, Dict, Any, List
 
-
-@dataclass
+# Spalten der Raumbuch-Abfrage in der Reihenfolge von RAUMBUCH_QUERY
+RAUMBUCH_COLUMNS = (
+    'ID', 'Raumnummer', 'Bereich', 'Gebaeudeteil', 'Etage', 'Bezeichnung', 'RG',
+    'qm', 'Anzahl', 'Intervall', 'RgJahr', 'RgMonat', 'qmMonat', 'WertMonat',
+    'StundenTag', 'StundenMonat', 'WertJahr', 'qmStunde', 'Reinigungstage',
+    'Bemerkung', 'Reduzierung'
+)
+
+# Ganzzahlige Schlüsselspalten (int64)
+RAUMBUCH_INTEGER_COLUMNS = ('ID',)
+
+# Kennzahlen, die als float64 geladen werden; NULL-Werte werden zu 0.0
+RAUMBUCH_NUMERIC_COLUMNS = (
+    'qm', 'Anzahl', 'RgJahr', 'RgMonat', 'qmMonat',
+    'WertMonat', 'StundenTag', 'StundenMonat', 'WertJahr', 'qmStunde'
+)
+
+# Spalten mit wenigen verschiedenen Werten, die als Kategorien geladen werden
+RAUMBUCH_CATEGORICAL_COLUMNS = ('Bereich', 'Gebaeudeteil', 'Etage', 'RG', 'Intervall', 'Reinigungstage')
+
+# Spaltennamen aus der Datenbank zu Attributen von RaumbuchEntry
+RAUMBUCH_FIELD_MAPPING = {
+    'ID': 'id',
+    'Raumnummer': 'raumnummer',
+    'Bereich': 'bereich',
+    'Gebaeudeteil': 'gebaeudeteil',
+    'Etage': 'etage',
+    'Bezeichnung': 'bezeichnung',
+    'RG': 'rg',
+    'qm': 'qm',
+    'Anzahl': 'anzahl',
+    'Intervall': 'intervall',
+    'RgJahr': 'rg_jahr',
+    'RgMonat': 'rg_monat',
+    'qmMonat': 'qm_monat',
+    'WertMonat': 'wert_monat',
+    'StundenTag': 'stunden_tag',
+    'StundenMonat': 'stunden_monat',
+    'WertJahr': 'wert_jahr',
+    'qmStunde': 'qm_stunde',
+    'Reinigungstage': 'reinigungstage',
+    'Bemerkung': 'bemerkung',
+    'Reduzierung': 'reduzierung',
+}
+
+# Einträge ohne __dict__ anlegen; slots=True wird von dataclass erst ab Python 3.10 unterstützt
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class RaumbuchEntry:
     """
     Datenklasse für einen Raumbuch-Eintrag.
+    Für viele Räume ist RaumbuchTable (spaltenweise Ablage) speichersparender.
     """
     id: int
     raumnummer: Optional[str] = None
@@ -45,36 +95,12 @@ class RaumbuchEntry:
             RaumbuchEntry: Erstelltes RaumbuchEntry-Objekt
         """
         # Spaltennamen aus der Datenbank zu Klassenattributen zuordnen
-        field_mapping = {
-            'ID': 'id',
-            'Raumnummer': 'raumnummer',
-            'Bereich': 'bereich',
-            'Gebaeudeteil': 'gebaeudeteil',
-            'Etage': 'etage',
-            'Bezeichnung': 'bezeichnung',
-            'RG': 'rg',
-            'qm': 'qm',
-            'Anzahl': 'anzahl',
-            'Intervall': 'intervall',
-            'RgJahr': 'rg_jahr',
-            'RgMonat': 'rg_monat',
-            'qmMonat': 'qm_monat',
-            'WertMonat': 'wert_monat',
-            'StundenTag': 'stunden_tag',
-            'StundenMonat': 'stunden_monat',
-            'WertJahr': 'wert_jahr',
-            'qmStunde': 'qm_stunde',
-            'Reinigungstage': 'reinigungstage',
-            'Bemerkung': 'bemerkung',
-            'Reduzierung': 'reduzierung',
+        kwargs = {
+            class_field: data[db_field]
+            for db_field, class_field in RAUMBUCH_FIELD_MAPPING.items()
+            if db_field in data
         }
 
-        # Dictionary mit Attributnamen als Schlüssel erstellen
-        kwargs = {}
-        for db_field, class_field in field_mapping.items():
-            if db_field in data:
-                kwargs[class_field] = data[db_field]
-
         return cls(**kwargs)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -119,11 +145,8 @@ def convert_db_results_to_entries(results: List[Dict[str, Any]]) -> List[Raumbuc
     Returns:
         List[RaumbuchEntry]: Liste von RaumbuchEntry-Objekten
     """
-    entries = []
-    for result in results:
-        entry = RaumbuchEntry.from_dict(result)
-        entries.append(entry)
-    return entries
+    from_dict = RaumbuchEntry.from_dict
+    return [from_dict(result) for result in results]
 
 
 def validate_raumbuch_entries(entries: List[RaumbuchEntry]) -> List[str]:
@@ -0,0 +1,232 @@
+"""
+Spaltenweise Ablage vieler Raumbuch-Einträge.
+"""
+
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+import numpy as np
+
+from src.models.coercion import coerce_integer, coerce_numeric
+from src.models.raumbuch import (
+    RAUMBUCH_CATEGORICAL_COLUMNS,
+    RAUMBUCH_COLUMNS,
+    RAUMBUCH_FIELD_MAPPING,
+    RAUMBUCH_INTEGER_COLUMNS,
+    RAUMBUCH_NUMERIC_COLUMNS,
+    RaumbuchEntry
+)
+
+# Attribute von RaumbuchEntry und die Art ihrer Ablage
+_FIELD_KINDS = {}
+for _column, _field in RAUMBUCH_FIELD_MAPPING.items():
+    if _column in RAUMBUCH_INTEGER_COLUMNS:
+        _FIELD_KINDS[_field] = 'integer'
+    elif _column in RAUMBUCH_NUMERIC_COLUMNS:
+        _FIELD_KINDS[_field] = 'numeric'
+    elif _column in RAUMBUCH_CATEGORICAL_COLUMNS:
+        _FIELD_KINDS[_field] = 'category'
+    else:
+        _FIELD_KINDS[_field] = 'text'
+
+# Ganzzahlige Kennzahlen, die in Zeilenansichten wieder als int geliefert werden
+_INTEGER_VALUE_FIELDS = ('anzahl',)
+
+# Anzahl Zeilen, die beim Iterieren gemeinsam umgewandelt werden
+_ITER_CHUNK_SIZE = 1000
+
+
+def _column_array(kind: str, values: Sequence[Any], shared: Dict[Any, Any]) -> np.ndarray:
+    """Legt eine Spalte passend zu ihrer Art als Array ab."""
+    if kind == 'integer':
+        return coerce_integer(values)
+    if kind == 'numeric':
+        # NULL bleibt als NaN erhalten und wird in Zeilenansichten wieder zu None
+        return coerce_numeric(values, default=np.nan)
+    if kind == 'category':
+        # Gleiche Texte teilen sich ein Objekt statt einer Kopie je Raum
+        return np.array([shared.setdefault(value, value) for value in values], dtype=object)
+    return np.array(values, dtype=object)
+
+
+def _empty_array(kind: str, length: int) -> np.ndarray:
+    """Erstellt eine Spalte für ein Feld, das in den Quelldaten fehlt."""
+    if kind == 'numeric':
+        return np.full(length, np.nan)
+    return np.full(length, None, dtype=object)
+
+
+def _python_values(field: str, column: np.ndarray) -> List[Any]:
+    """Wandelt eine Spalte in Python-Werte um, wie sie RaumbuchEntry.from_dict erhält."""
+    values = column.tolist()
+    if _FIELD_KINDS[field] != 'numeric':
+        return values
+    if field in _INTEGER_VALUE_FIELDS:
+        return [None if math.isnan(value) else int(value) for value in values]
+    return [None if math.isnan(value) else value for value in values]
+
+
+class RaumbuchTable:
+    """
+    Raumbuch-Einträge als Spalten-Arrays (struct-of-arrays) statt als einzelne Objekte.
+
+    Schlüssel werden als int64, Kennzahlen als float64 (NULL als NaN) und Texte als
+    Objekt-Arrays abgelegt, wobei wiederkehrende Texte wie Bereich oder Etage nur
+    einmal im Speicher liegen. RaumbuchEntry-Objekte werden erst beim Zugriff erzeugt.
+    """
+
+    __slots__ = ('_columns', '_length')
+
+    def __init__(self, columns: Dict[str, np.ndarray], length: int):
+        """
+        Args:
+            columns (Dict[str, np.ndarray]): Spalten je Attribut von RaumbuchEntry
+            length (int): Anzahl der Einträge; fehlende Spalten werden mit NULL aufgefüllt
+        """
+        self._length = length
+        self._columns = {}
+        for field, kind in _FIELD_KINDS.items():
+            column = columns.get(field)
+            if column is None:
+                column = _empty_array(kind, length)
+            elif len(column) != length:
+                raise ValueError(f"Spalte '{field}' hat {len(column)} statt {length} Einträge")
+            column.flags.writeable = False
+            self._columns[field] = column
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]],
+                  columns: Sequence[str] = RAUMBUCH_COLUMNS) -> 'RaumbuchTable':
+        """
+        Erstellt die Tabelle in einem Schritt aus Ergebniszeilen, z.B. aus cursor.fetchall().
+
+        Args:
+            rows (Sequence[Sequence[Any]]): Zeilen als Tupel in der Spaltenreihenfolge
+            columns (Sequence[str]): Spaltennamen der Datenbankabfrage
+
+        Returns:
+            RaumbuchTable: Tabelle mit allen Zeilen
+        """
+        return cls._build(columns, [rows])
+
+    @classmethod
+    def from_cursor(cls, cursor, batch_size: int = 1000) -> 'RaumbuchTable':
+        """
+        Liest ein Abfrageergebnis blockweise per fetchmany() in die Tabelle ein.
+
+        Args:
+            cursor: Cursor, auf dem die Raumbuch-Abfrage ausgeführt wurde
+            batch_size (int): Anzahl Zeilen pro fetchmany()-Aufruf
+
+        Returns:
+            RaumbuchTable: Tabelle mit allen Zeilen
+        """
+        columns = [column[0] for column in cursor.description]
+
+        def batches():
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    return
+                yield batch
+
+        return cls._build(columns, batches())
+
+    @classmethod
+    def from_dicts(cls, rows: Sequence[Dict[str, Any]]) -> 'RaumbuchTable':
+        """
+        Erstellt die Tabelle aus Zeilen-Dictionaries, z.B. aus get_raumbuch_data.
+
+        Args:
+            rows (Sequence[Dict[str, Any]]): Zeilen mit Spaltennamen der Datenbank als Schlüssel
+
+        Returns:
+            RaumbuchTable: Tabelle mit allen Zeilen
+        """
+        columns = [column for column in RAUMBUCH_FIELD_MAPPING if rows and column in rows[0]]
+        return cls.from_rows([tuple(row.get(column) for column in columns) for row in rows], columns)
+
+    @classmethod
+    def _build(cls, columns: Sequence[str], batches: Iterable[Sequence[Sequence[Any]]]) -> 'RaumbuchTable':
+        """Überträgt Zeilenblöcke spaltenweise in typisierte Arrays."""
+        positions = [
+            (position, RAUMBUCH_FIELD_MAPPING[column])
+            for position, column in enumerate(columns) if column in RAUMBUCH_FIELD_MAPPING
+        ]
+        chunks = {field: [] for _, field in positions}
+        shared = {field: {} for _, field in positions}
+        length = 0
+
+        for rows in batches:
+            if not rows:
+                continue
+            values = list(zip(*rows))
+            for position, field in positions:
+                chunks[field].append(_column_array(_FIELD_KINDS[field], values[position], shared[field]))
+            length += len(rows)
+
+        arrays = {
+            field: np.concatenate(parts) if len(parts) > 1 else parts[0]
+            for field, parts in chunks.items() if parts
+        }
+        return cls(arrays, length)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> RaumbuchEntry:
+        """
+        Liefert einen einzelnen Eintrag als RaumbuchEntry.
+
+        Args:
+            index (int): Position, negative Werte zählen vom Ende
+
+        Returns:
+            RaumbuchEntry: Neu erzeugter Eintrag
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("RaumbuchTable-Index außerhalb des gültigen Bereichs")
+
+        kwargs = {}
+        for field, column in self._columns.items():
+            kwargs[field] = _python_values(field, column[index:index + 1])[0]
+        return RaumbuchEntry(**kwargs)
+
+    def __iter__(self) -> Iterator[RaumbuchEntry]:
+        """Erzeugt die Einträge blockweise, sodass nie mehr als ein Block als Objekte vorliegt."""
+        for start in range(0, self._length, _ITER_CHUNK_SIZE):
+            yield from self._entries(start, start + _ITER_CHUNK_SIZE)
+
+    def column(self, field: str) -> np.ndarray:
+        """
+        Liefert eine Spalte als schreibgeschütztes Array.
+
+        Args:
+            field (str): Attributname von RaumbuchEntry, z.B. 'qm'
+
+        Returns:
+            np.ndarray: Spaltenwerte
+        """
+        return self._columns[field]
+
+    def to_entries(self) -> List[RaumbuchEntry]:
+        """
+        Erzeugt alle Einträge als RaumbuchEntry-Objekte.
+
+        Returns:
+            List[RaumbuchEntry]: Einträge in der Reihenfolge der Tabelle
+        """
+        return self._entries(0, self._length)
+
+    def _entries(self, start: int, stop: int) -> List[RaumbuchEntry]:
+        """Wandelt die Zeilen von start bis ausschließlich stop in RaumbuchEntry-Objekte um."""
+        fields = list(self._columns)
+        columns = [_python_values(field, self._columns[field][start:stop]) for field in fields]
+        return [RaumbuchEntry(**dict(zip(fields, values))) for values in zip(*columns)]
+
+    @property
+    def nbytes(self) -> int:
+        """int: Speicherbedarf der Arrays in Bytes, ohne die geteilten Textobjekte."""
+        return sum(column.nbytes for column in self._columns.values())
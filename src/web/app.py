@@ -8,6 +8,8 @@ from datetime import datetime
 from flask import Flask
 
 from config.settings import APP_CONFIG, STATIC_FOLDER, TEMPLATE_FOLDER
+from src.analysis.templating import bytecode_cache
+from src.web.compression import register_compression
 from src.web.routes import register_routes
 
 # Logging konfigurieren
@@ -31,6 +33,9 @@ def create_app():
         template_folder=TEMPLATE_FOLDER
     )
 
+    # Kompilierte Templates aus dem gemeinsamen Bytecode-Cache laden
+    app.jinja_options = dict(app.jinja_options, bytecode_cache=bytecode_cache)
+
     # Konfiguration
     app.config.update(
         SECRET_KEY=APP_CONFIG['secret_key'],
@@ -97,6 +102,9 @@ def create_app():
     # Routen registrieren
     register_routes(app)
 
+    # Antworten mit gzip bzw. Brotli komprimieren, auch gestreamte
+    register_compression(app)
+
     logger.info(f"Flask-Anwendung erstellt. Debug-Modus: {app.config['DEBUG']}")
     return app
 
@@ -0,0 +1,207 @@
+"""
+Komprimierung der HTTP-Antworten mit gzip und, falls installiert, Brotli.
+
+Vollständig vorliegende Antworten werden ab einer Mindestgröße in einem Schritt
+komprimiert. Gestreamte Antworten (z.B. die Report-Seite mit ?stream=1) werden
+blockweise komprimiert; nach jedem Block wird der Kompressor geleert, damit der
+Browser die bisherigen Inhalte sofort darstellen kann.
+"""
+
+import logging
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import Flask, Response, request
+
+from config.settings import COMPRESSION_CONFIG
+
+try:
+    import brotli
+except ImportError:  # Brotli ist optional, ohne das Paket wird nur gzip angeboten
+    brotli = None
+
+# Logging konfigurieren
+logger = logging.getLogger(__name__)
+
+
+class GzipCompressor:
+    """Inkrementeller gzip-Kompressor."""
+
+    def __init__(self, level: int):
+        """
+        Args:
+            level (int): Kompressionsstufe 1-9
+        """
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        """
+        Komprimiert einen Block.
+
+        Args:
+            data (bytes): Unkomprimierte Daten
+            flush (bool): Bisherige Daten vollständig ausgeben (für Streaming)
+
+        Returns:
+            bytes: Komprimierte Daten
+        """
+        result = self._compressor.compress(data)
+        if flush:
+            result += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return result
+
+    def finish(self) -> bytes:
+        """Schließt den Datenstrom ab und liefert die restlichen Daten."""
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    """Inkrementeller Brotli-Kompressor."""
+
+    def __init__(self, quality: int):
+        """
+        Args:
+            quality (int): Qualität 0-11
+        """
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        """
+        Komprimiert einen Block.
+
+        Args:
+            data (bytes): Unkomprimierte Daten
+            flush (bool): Bisherige Daten vollständig ausgeben (für Streaming)
+
+        Returns:
+            bytes: Komprimierte Daten
+        """
+        result = self._compressor.process(data)
+        if flush:
+            result += self._compressor.flush()
+        return result
+
+    def finish(self) -> bytes:
+        """Schließt den Datenstrom ab und liefert die restlichen Daten."""
+        return self._compressor.finish()
+
+
+def select_encoding(accept_encodings) -> Optional[str]:
+    """
+    Wählt das Verfahren anhand des Accept-Encoding-Headers; Brotli hat Vorrang.
+
+    Args:
+        accept_encodings (Accept): request.accept_encodings
+
+    Returns:
+        Optional[str]: 'br', 'gzip' oder None
+    """
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def create_compressor(encoding: str, config=COMPRESSION_CONFIG):
+    """
+    Erstellt den Kompressor für ein Verfahren.
+
+    Args:
+        encoding (str): 'br' oder 'gzip'
+        config (dict): Einstellungen wie COMPRESSION_CONFIG
+
+    Returns:
+        GzipCompressor | BrotliCompressor: Kompressor
+    """
+    if encoding == 'br':
+        return BrotliCompressor(config['brotli_quality'])
+    return GzipCompressor(config['level'])
+
+
+def iter_compressed(chunks: Iterable[bytes], compressor) -> Iterator[bytes]:
+    """
+    Komprimiert einen Datenstrom blockweise und leert den Kompressor nach jedem Block.
+
+    Args:
+        chunks (Iterable[bytes]): Blöcke der Antwort
+        compressor: Kompressor aus create_compressor
+
+    Yields:
+        bytes: Komprimierte Blöcke
+    """
+    for chunk in chunks:
+        if chunk:
+            yield compressor.compress(chunk, flush=True)
+    yield compressor.finish()
+
+
+def compress_response(response: Response, config=COMPRESSION_CONFIG) -> Response:
+    """
+    Komprimiert eine Antwort, wenn Client, Inhaltstyp und Größe es zulassen.
+
+    Args:
+        response (Response): Antwort der Route
+        config (dict): Einstellungen wie COMPRESSION_CONFIG
+
+    Returns:
+        Response: Dieselbe, gegebenenfalls komprimierte Antwort
+    """
+    if not config['enabled'] or response.mimetype not in config['mimetypes']:
+        return response
+
+    # Caches müssen die Antwort je Accept-Encoding unterscheiden
+    response.vary.add('Accept-Encoding')
+
+    encoding = select_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    # Schwacher ETag unabhängig von der Größe, damit 200 und 304 denselben Wert tragen
+    _mark_etag_weak(response)
+
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or 'Content-Encoding' in response.headers or request.method == 'HEAD'):
+        return response
+
+    streamed = response.is_streamed or response.direct_passthrough
+    if streamed:
+        length = response.content_length
+        if length is not None and length < config['min_size']:
+            return response
+
+        original = response.response
+        response.response = iter_compressed(response.iter_encoded(), create_compressor(encoding, config))
+        response.direct_passthrough = False
+        if hasattr(original, 'close'):
+            response.call_on_close(original.close)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['min_size']:
+            return response
+        compressor = create_compressor(encoding, config)
+        response.set_data(compressor.compress(data) + compressor.finish())
+
+    response.headers['Content-Encoding'] = encoding
+    # Bereichsanfragen beziehen sich auf die unkomprimierten Daten
+    response.headers.pop('Accept-Ranges', None)
+    return response
+
+
+def _mark_etag_weak(response: Response):
+    """Kennzeichnet den ETag als schwach, da die komprimierte Darstellung nur semantisch gleich ist."""
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def register_compression(app: Flask):
+    """
+    Aktiviert die Komprimierung für alle Antworten der Anwendung.
+
+    Args:
+        app (Flask): Flask-Anwendung
+    """
+    app.after_request(compress_response)
+    logger.info(f"Komprimierung aktiv: {'br, gzip' if brotli is not None else 'gzip'}")
@@ -0,0 +1,94 @@
+"""
+Bedingte Anfragen (ETag und If-None-Match) für Seiten, API und Exporte.
+
+Der ETag einer Antwort wird nicht aus dem gerenderten Inhalt berechnet, sondern aus
+der Datenversion des Standorts, den Filtern und weiteren Parametern. Eine unveränderte
+Antwort kann so mit 304 beantwortet werden, bevor Daten geladen oder Templates
+gerendert werden.
+"""
+
+import hashlib
+import os
+from typing import Any, Optional
+
+from flask import Response, get_flashed_messages, request
+
+from config.settings import APP_CONFIG, ETAG_CONFIG, TEMPLATE_FOLDER
+
+
+def templates_fingerprint(folder: str) -> str:
+    """
+    Ermittelt den Stand der Templates über die jüngste Änderungszeit.
+
+    Args:
+        folder (str): Template-Verzeichnis
+
+    Returns:
+        str: Änderungszeit in Sekunden, '0' wenn das Verzeichnis fehlt
+    """
+    latest = 0.0
+    for root, _, files in os.walk(folder):
+        for name in files:
+            latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+    return str(int(latest))
+
+
+# Anwendungsversion und Template-Stand: nach einem Update gelten alte ETags nicht mehr
+RELEASE = f"{APP_CONFIG['version']}-{templates_fingerprint(TEMPLATE_FOLDER)}"
+
+
+def compute_etag(*parts: Any) -> str:
+    """
+    Bildet einen ETag aus beliebigen, per repr() darstellbaren Bestandteilen.
+
+    Args:
+        *parts: z.B. Routenname, Standort-ID, Datenversion und normalisierte Filter
+
+    Returns:
+        str: Hexadezimaler Hashwert
+    """
+    return hashlib.sha256(repr((RELEASE, parts)).encode('utf-8')).hexdigest()[:32]
+
+
+def not_modified(etag: Optional[str], page: bool = False) -> Optional[Response]:
+    """
+    Prüft If-None-Match gegen den ETag der Anfrage.
+
+    Stehen für eine HTML-Seite noch Flash-Meldungen aus, wird nie 304 geliefert,
+    da sie sonst erst auf einer späteren Seite erscheinen würden. API- und
+    Download-Antworten lassen die Meldungen und die Session unberührt.
+
+    Args:
+        etag (str, optional): Erwarteter ETag, None wenn er nicht ermittelt werden konnte
+        page (bool): True für HTML-Seiten, die Flash-Meldungen anzeigen
+
+    Returns:
+        Optional[Response]: Leere 304-Antwort oder None, wenn vollständig geantwortet werden muss
+    """
+    if not ETAG_CONFIG['enabled'] or etag is None:
+        return None
+    if not request.if_none_match.contains_weak(etag) or (page and get_flashed_messages()):
+        return None
+    return add_etag(Response(status=304), etag)
+
+
+def add_etag(response: Response, etag: Optional[str], page: bool = False) -> Response:
+    """
+    Setzt ETag und Cache-Control einer Antwort.
+
+    HTML-Seiten mit Flash-Meldungen erhalten keinen ETag, da sie vom Datenstand
+    unabhängige Inhalte enthalten.
+
+    Args:
+        response (Response): Antwort
+        etag (str, optional): ETag, None um keinen zu setzen
+        page (bool): True für HTML-Seiten, die Flash-Meldungen anzeigen
+
+    Returns:
+        Response: Dieselbe Antwort
+    """
+    if ETAG_CONFIG['enabled'] and etag is not None and not (page and get_flashed_messages()):
+        response.set_etag(etag)
+        # Zwischenspeichern erlaubt, vor jeder Verwendung aber neu validieren
+        response.cache_control.no_cache = True
+    return response
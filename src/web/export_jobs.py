@@ -0,0 +1,201 @@
+"""
+Hintergrund-Warteschlange für Excel- und PDF-Exporte.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+from config.settings import EXPORT_JOB_CONFIG
+
+# Logging konfigurieren
+logger = logging.getLogger(__name__)
+
+
+class ExportQueueFullError(Exception):
+    """Wird ausgelöst, wenn bereits zu viele Exporte auf ihre Ausführung warten."""
+
+
+class ExportJob:
+    """
+    Zustand eines einzelnen Exportauftrags.
+    """
+
+    __slots__ = ('id', 'key', 'status', 'path', 'download_name', 'error', 'created_at', 'finished_at')
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, key: Optional[Hashable] = None, download_name: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = self.QUEUED
+        self.path = None
+        self.download_name = download_name
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    @property
+    def finished(self) -> bool:
+        """bool: True, wenn der Auftrag abgeschlossen oder fehlgeschlagen ist."""
+        return self.status in (self.DONE, self.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Liefert den Zustand für die Status-API.
+
+        Returns:
+            Dict[str, Any]: ID, Status und gegebenenfalls Fehlermeldung
+        """
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'error': self.error,
+            'download_name': self.download_name if self.status == self.DONE else None
+        }
+
+
+class ExportJobQueue:
+    """
+    Führt Exporte in einem begrenzten Pool von Worker-Threads aus.
+
+    Aufträge mit demselben Schlüssel (Standort, Filter, Format), die noch laufen,
+    werden zusammengelegt. Abgeschlossene Aufträge bleiben für result_ttl Sekunden
+    abrufbar.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 20, result_ttl: float = 3600):
+        """
+        Args:
+            max_workers (int): Anzahl gleichzeitig ausgeführter Exporte
+            max_pending (int): Maximale Anzahl wartender und laufender Aufträge
+            result_ttl (float): Sekunden, die ein abgeschlossener Auftrag abrufbar bleibt
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+
+        self._executor = None
+        self._jobs = {}
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable[[], Optional[str]], key: Optional[Hashable] = None,
+               download_name: Optional[str] = None) -> ExportJob:
+        """
+        Stellt einen Export in die Warteschlange.
+
+        Args:
+            func (Callable): Funktion ohne Argumente, die die Exportdatei erzeugt und ihren Pfad liefert
+            key (Hashable, optional): Schlüssel zum Zusammenlegen gleicher Aufträge
+            download_name (str, optional): Dateiname für den Download
+
+        Returns:
+            ExportJob: Neuer oder bereits laufender Auftrag mit demselben Schlüssel
+
+        Raises:
+            ExportQueueFullError: Wenn bereits max_pending Aufträge offen sind
+        """
+        with self._lock:
+            self._expire_locked()
+
+            if key is not None and key in self._active:
+                return self._active[key]
+
+            pending = sum(1 for job in self._jobs.values() if not job.finished)
+            if pending >= self.max_pending:
+                raise ExportQueueFullError("Zu viele Exporte in Bearbeitung, bitte später erneut versuchen")
+
+            job = ExportJob(key, download_name)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._active[key] = job
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='export-job')
+            self._executor.submit(self._run, job, func)
+
+        return job
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        """
+        Liefert einen Auftrag anhand seiner ID.
+
+        Args:
+            job_id (str): ID des Auftrags
+
+        Returns:
+            Optional[ExportJob]: Auftrag oder None, wenn er unbekannt oder abgelaufen ist
+        """
+        with self._lock:
+            self._expire_locked()
+            return self._jobs.get(job_id)
+
+    def result_paths(self) -> Set[str]:
+        """
+        Liefert die Ergebnisdateien der noch abrufbaren Aufträge.
+        Sie dürfen beim Aufräumen der Export-Ordner nicht gelöscht werden.
+
+        Returns:
+            Set[str]: Pfade abgeschlossener, noch nicht abgelaufener Aufträge
+        """
+        with self._lock:
+            self._expire_locked()
+            return {job.path for job in self._jobs.values() if job.status == ExportJob.DONE and job.path}
+
+    def shutdown(self, wait: bool = True):
+        """
+        Beendet die Worker-Threads.
+
+        Args:
+            wait (bool): Auf laufende Aufträge warten
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _run(self, job: ExportJob, func: Callable[[], Optional[str]]):
+        job.status = ExportJob.RUNNING
+        status = ExportJob.FAILED
+        try:
+            path = func()
+            if path:
+                job.path = path
+                status = ExportJob.DONE
+            else:
+                job.error = 'Die Exportdatei konnte nicht erstellt werden.'
+        except Exception as e:
+            logger.error(f"Fehler im Exportauftrag {job.id}: {e}")
+            job.error = str(e)
+        finally:
+            # Zuerst den Zeitpunkt, dann den Status setzen: ein abgeschlossener Auftrag
+            # hat für _expire_locked immer ein finished_at
+            job.finished_at = time.time()
+            job.status = status
+            with self._lock:
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+
+    def _expire_locked(self):
+        """Entfernt abgelaufene, abgeschlossene Aufträge. Muss unter der Sperre aufgerufen werden."""
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and now - job.finished_at >= self.result_ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# Gemeinsame Warteschlange für die Export-Routen
+export_jobs = ExportJobQueue(
+    max_workers=EXPORT_JOB_CONFIG['max_workers'],
+    max_pending=EXPORT_JOB_CONFIG['max_pending'],
+    result_ttl=EXPORT_JOB_CONFIG['result_ttl']
+)
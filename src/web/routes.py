@@ -4,18 +4,38 @@ Routen für die RitterDigitalAuswertung-Webanwendung.
 
 import logging
 import os
-from flask import render_template, request, jsonify, flash, redirect, url_for, send_file
+from datetime import datetime
+from itertools import islice
+from flask import render_template, stream_template, request, jsonify, flash, redirect, url_for, send_file, Response, make_response
+from markupsafe import Markup
 from werkzeug.exceptions import NotFound
 import traceback
 
-from src.database import get_raumbuch_data, get_standorte, get_standort_by_id
-from src.models.raumbuch import convert_db_results_to_entries
+from src.database import (
+    iter_raumbuch_rows,
+    get_raumbuch_frame,
+    get_raumbuch_summary,
+    get_raumbuch_filter_options,
+    get_raumbuch_page,
+    get_raumbuch_version,
+    get_standorte,
+    get_standort_by_id
+)
+from src.database.frames import encode_columnar
+from src.database.queries import normalize_filters, iter_filtered_rows
+from src.models.raumbuch import convert_db_results_to_entries, RAUMBUCH_COLUMNS, RAUMBUCH_NUMERIC_COLUMNS
+from src.models.coercion import coerce_numeric_rows
+from config.database import FETCH_BATCH_SIZE
+from config.settings import API_CONFIG, EXPORT_CACHE_CONFIG, EXPORT_CONFIG, REPORT_CONFIG
+from src.analysis.export_cache import export_cache, EXPORT_EXTENSIONS
+from src.web.conditional import add_etag, compute_etag, not_modified
+from src.web.export_jobs import export_jobs, ExportJob, ExportQueueFullError
 from src.analysis.raumbuch_analysis import (
-    calculate_summary,
-    prepare_data_for_visualization,
+    FILTER_OPTION_COLUMNS,
+    RaumbuchAnalysis,
+    prepare_visualization_from_summary,
     export_to_excel,
-    export_to_pdf,
-    safe_number  # importiere die safe_number Funktion
+    export_to_pdf
 )
 
 # Logging konfigurieren
@@ -25,6 +45,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Numerische Felder, die vorverarbeitet werden müssen
+NUMERIC_FIELDS = list(RAUMBUCH_NUMERIC_COLUMNS)
+
+# Markierung im Template, an der beim Streaming der bisherige Inhalt sofort gesendet wird
+STREAM_FLUSH = Markup('<!-- flush -->')
+
+def iter_preprocessed_data(rows, copy=True, batch_size=FETCH_BATCH_SIZE):
+    """
+    Vorverarbeitung als Generator, um NULL-Werte zu behandeln.
+    Die Zeilen werden blockweise gelesen und die numerischen Felder je Block
+    spaltenweise umgewandelt.
+
+    Args:
+        rows (iterable): Raumbuch-Daten, z.B. aus iter_raumbuch_rows
+        copy (bool): Zeilen vor der Änderung kopieren; kann für frisch erzeugte
+            Zeilen, die nicht im Cache liegen, abgeschaltet werden
+        batch_size (int): Anzahl Zeilen pro Block
+
+    Yields:
+        dict: Vorverarbeitete Zeile
+    """
+    iterator = iter(rows)
+
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            break
+        if copy:
+            batch = [dict(item) for item in batch]
+
+        # Numerische Felder als Zahlen konvertieren oder 0 setzen
+        yield from coerce_numeric_rows(batch, NUMERIC_FIELDS)
+
 def preprocess_data(data):
     """
     Vorverarbeitung der Daten, um NULL-Werte zu behandeln.
@@ -38,25 +91,7 @@ def preprocess_data(data):
     if not data:
         return []
 
-    processed_data = []
-
-    # Numerische Felder, die vorverarbeitet werden müssen
-    numeric_fields = [
-        'qm', 'Anzahl', 'RgJahr', 'RgMonat', 'qmMonat',
-        'WertMonat', 'StundenTag', 'StundenMonat', 'WertJahr', 'qmStunde'
-    ]
-
-    for item in data:
-        processed_item = dict(item)  # Kopie erstellen
-
-        # Numerische Felder als Zahlen konvertieren oder 0 setzen
-        for field in numeric_fields:
-            if field in processed_item:
-                processed_item[field] = safe_number(processed_item[field], 0.0)
-
-        processed_data.append(processed_item)
-
-    return processed_data
+    return list(iter_preprocessed_data(data))
 
 def register_routes(app):
     """
@@ -74,11 +109,15 @@ def register_routes(app):
         Returns:
             str: Gerenderte Index-Template
         """
+        etag = page_etag('index', request.args)
+        unchanged = not_modified(etag, page=True)
+        if unchanged:
+            return unchanged
+
         standorte = get_standorte()
 
         # Prüfen, ob ein Standort ausgewählt wurde
         standort_id = request.args.get('standort_id')
-        data = None
         summary = None
         viz_data = None
         selected_standort = None
@@ -89,17 +128,11 @@ def register_routes(app):
                 selected_standort = get_standort_by_id(standort_id)
 
                 if selected_standort:
-                    # Daten abrufen
-                    data = get_raumbuch_data(standort_id)
+                    # Zusammenfassung in der Datenbank berechnen, ohne die Räume zu übertragen
+                    summary = get_raumbuch_summary(standort_id)
 
-                    # Daten vorverarbeiten
-                    data = preprocess_data(data)
-
-                    # Zusammenfassung berechnen
-                    summary = calculate_summary(data)
-
-                    # Visualisierungsdaten vorbereiten
-                    viz_data = prepare_data_for_visualization(data)
+                    # Visualisierungsdaten aus der Zusammenfassung ableiten
+                    viz_data = prepare_visualization_from_summary(summary)
                 else:
                     flash('Der ausgewählte Standort wurde nicht gefunden.', 'warning')
             except ValueError:
@@ -109,23 +142,35 @@ def register_routes(app):
                 logger.error(traceback.format_exc())
                 flash(f'Fehler beim Laden der Daten: {str(e)}', 'danger')
 
-        return render_template(
+        return add_etag(make_response(render_template(
             'index.html',
             standorte=standorte,
-            data=data,
             summary=summary,
             viz_data=viz_data,
             selected_standort=selected_standort
-        )
+        )), etag, page=True)
 
     @app.route('/report')
     def report():
         """
         Detaillierte Auswertungsseite mit Tabelle und Filtern.
 
+        Im Streaming-Modus werden Kopf, Zusammenfassung und Filter gesendet, bevor die
+        Räume gelesen werden; die Tabellenzeilen folgen blockweise direkt vom Cursor.
+
         Returns:
-            str: Gerenderte Report-Template
+            str | Response: Gerenderte Report-Template, im Streaming-Modus als gestreamte Response
         """
+        stream = report_option_enabled(request.args, 'stream')
+        client = report_option_enabled(request.args, 'client_filter')
+        virtual = client or report_option_enabled(request.args, 'virtual')
+
+        # Unveränderte Seite beantworten, bevor Daten geladen und gerendert werden
+        etag = page_etag('report', request.args, stream, virtual, client)
+        unchanged = not_modified(etag, page=True)
+        if unchanged:
+            return unchanged
+
         standorte = get_standorte()
 
         # Prüfen, ob ein Standort ausgewählt wurde
@@ -141,24 +186,25 @@ def register_routes(app):
                 standort_id = int(standort_id)
                 selected_standort = get_standort_by_id(standort_id)
 
-                if selected_standort:
-                    # Daten abrufen
-                    data = get_raumbuch_data(standort_id)
-
-                    # Daten vorverarbeiten
-                    data = preprocess_data(data)
-
-                    # Filter anwenden
-                    data = apply_filters(data, request.args)
-
-                    # Zusammenfassung berechnen
-                    summary = calculate_summary(data)
-
-                    # Visualisierungsdaten vorbereiten
-                    viz_data = prepare_data_for_visualization(data)
-
-                    # Filteroptionen erstellen
-                    filter_options = create_filter_options(data)
+                if selected_standort and (stream or virtual):
+                    # Zusammenfassung und Filteroptionen per SQL; die Räume erst beim Rendern der
+                    # Tabelle bzw. in der virtuellen Tabelle seitenweise über /api/raumbuch
+                    summary = get_raumbuch_summary(standort_id, request.args)
+                    viz_data = prepare_visualization_from_summary(summary)
+                    # Bei Filterung im Browser werden alle Werte des Standorts zur Auswahl benötigt
+                    options = get_raumbuch_filter_options(standort_id, None if client else request.args)
+                    filter_options = {key: options.get(column, []) for key, column in FILTER_OPTION_COLUMNS.items()}
+                    if summary and not virtual:
+                        data = iter_report_rows(standort_id, request.args)
+                elif selected_standort:
+                    # Gefilterte Daten als DataFrame abrufen, die Filter werden in der Datenbank angewendet
+                    analysis = RaumbuchAnalysis(get_raumbuch_frame(standort_id, request.args))
+
+                    # Tabelle, Zusammenfassung, Diagramme und Filteroptionen aus einem DataFrame ableiten
+                    data = analysis.records
+                    summary = analysis.summary
+                    viz_data = analysis.viz_data
+                    filter_options = analysis.filter_options
                 else:
                     flash('Der ausgewählte Standort wurde nicht gefunden.', 'warning')
             except ValueError:
@@ -168,16 +214,63 @@ def register_routes(app):
                 logger.error(traceback.format_exc())  # Detaillierte Fehlerausgabe
                 flash(f'Fehler beim Laden der Daten: {str(e)}', 'danger')
 
-        return render_template(
-            'report.html',
+        context = dict(
             standorte=standorte,
             data=data,
             summary=summary or {},  # Leeres Dict falls None
             viz_data=viz_data or {},  # Leeres Dict falls None
             selected_standort=selected_standort,
-            filter_options=filter_options
+            filter_options=filter_options,
+            virtual_table=virtual and bool(summary),
+            client_filter=client,
+            page_size=API_CONFIG['max_page_size']
         )
 
+        if stream:
+            pieces = stream_template('report.html', stream_flush=STREAM_FLUSH, **context)
+            return add_etag(Response(iter_html_chunks(pieces, REPORT_CONFIG['chunk_size']), mimetype='text/html'), etag, page=True)
+        return add_etag(make_response(render_template('report.html', **context)), etag, page=True)
+
+    @app.route('/report/<int:standort_id>/fragments')
+    def report_fragments(standort_id):
+        """
+        Teilbereiche der Report-Seite für einen Filtersatz.
+
+        Liefert nur Tabellenzeilen, Zusammenfassung, Summenzeile und Diagrammdaten,
+        die das Filterformular an Ort und Stelle austauscht, statt die ganze Seite
+        mit Layout und Standortauswahl neu zu laden.
+
+        Args:
+            standort_id (int): ID des Standorts
+
+        Returns:
+            Response: JSON-Response mit den HTML-Fragmenten 'rows', 'summary' und
+            'footer' sowie 'viz_data'
+        """
+        if not get_standort_by_id(standort_id):
+            return jsonify({'error': 'Der ausgewählte Standort wurde nicht gefunden.'}), 404
+
+        etag = data_etag('fragments', standort_id, request.args)
+        unchanged = not_modified(etag)
+        if unchanged:
+            return unchanged
+
+        try:
+            analysis = RaumbuchAnalysis(get_raumbuch_frame(standort_id, request.args))
+            summary = analysis.summary or {}
+            return add_etag(jsonify({
+                'standort_id': standort_id,
+                'total': summary.get('total_rooms', 0),
+                'rows': render_template('partials/report_rows.html', data=analysis.records),
+                'summary': render_template('partials/report_summary.html', summary=summary),
+                'footer': render_template('partials/report_footer.html', summary=summary),
+                'viz_data': analysis.viz_data or {}
+            }), etag)
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der Report-Fragmente: {e}")
+            logger.error(traceback.format_exc())
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/api/standorte')
     def api_standorte():
         """
@@ -188,11 +281,107 @@ def register_routes(app):
         """
         try:
             standorte = get_standorte()
-            return jsonify(standorte)
+            etag = compute_etag('standorte', standorte)
+            return not_modified(etag) or add_etag(jsonify(standorte), etag)
         except Exception as e:
             logger.error(f"Fehler beim Abrufen der Standorte: {e}")
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/raumbuch/<int:standort_id>')
+    def api_raumbuch(standort_id):
+        """
+        API-Endpunkt für eine sortierte Seite der Raumbuch-Zeilen.
+
+        Neben den Filtern der Report-Seite werden 'sort' (Spalte, mit '-' davor
+        absteigend), 'offset', 'limit' und 'columns' (kommagetrennt) ausgewertet.
+        Mit 'compact=1' werden die Spaltennamen einmal und die Zeilen als Listen
+        geliefert, wie sie die virtuelle Tabelle der Report-Seite lädt.
+
+        Args:
+            standort_id (int): ID des Standorts
+
+        Returns:
+            Response: JSON-Response mit den Zeilen der Seite und der Gesamtanzahl
+        """
+        try:
+            page_args = parse_page_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if not get_standort_by_id(standort_id):
+            return jsonify({'error': 'Der ausgewählte Standort wurde nicht gefunden.'}), 404
+
+        compact = request.args.get('compact', '').lower() in ('1', 'true', 'ja', 'yes')
+        etag = data_etag('api_raumbuch', standort_id, request.args, sorted(page_args.items()), compact)
+        unchanged = not_modified(etag)
+        if unchanged:
+            return unchanged
+
+        try:
+            page = get_raumbuch_page(standort_id, request.args, **page_args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            logger.error(f"Fehler beim Abrufen der Raumbuch-Seite: {e}")
+            return jsonify({'error': str(e)}), 500
+
+        rows = coerce_numeric_rows(page['rows'], NUMERIC_FIELDS)
+        offset, limit = page_args['offset'], page_args['limit']
+        next_offset = offset + limit if offset + limit < page['total'] else None
+        payload = {
+            'standort_id': standort_id,
+            'total': page['total'],
+            'offset': offset,
+            'limit': limit,
+            'next_offset': next_offset,
+            'sort': request.args.get('sort') or None,
+            'rows': rows
+        }
+        if compact:
+            columns = list(page_args['columns'] or RAUMBUCH_COLUMNS)
+            payload['columns'] = columns
+            payload['rows'] = [[row.get(column) for column in columns] for row in rows]
+        return add_etag(jsonify(payload), etag)
+
+    @app.route('/api/raumbuch/<int:standort_id>/columns')
+    def api_raumbuch_columns(standort_id):
+        """
+        API-Endpunkt für alle Raumbuch-Zeilen eines Standorts in spaltenweiser Form.
+
+        Kategorie-Spalten wie Bereich oder RG sind wörterbuchkodiert (siehe
+        encode_columnar). Die Report-Seite lädt die Daten einmal und berechnet
+        Filter, Summen und Diagramme danach im Browser.
+
+        Args:
+            standort_id (int): ID des Standorts
+
+        Returns:
+            Response: JSON-Response mit Anzahl der Zeilen und den kodierten Spalten
+        """
+        columns = [column.strip() for column in (request.args.get('columns') or '').split(',') if column.strip()]
+        unknown = [column for column in columns if column not in RAUMBUCH_COLUMNS]
+        if unknown:
+            return jsonify({'error': f"Unbekannte Spalte: {', '.join(unknown)}"}), 400
+
+        if not get_standort_by_id(standort_id):
+            return jsonify({'error': 'Der ausgewählte Standort wurde nicht gefunden.'}), 404
+
+        etag = data_etag('api_raumbuch_columns', standort_id, request.args, columns)
+        unchanged = not_modified(etag)
+        if unchanged:
+            return unchanged
+
+        try:
+            frame = get_raumbuch_frame(standort_id, request.args)
+            return add_etag(jsonify({
+                'standort_id': standort_id,
+                'total': len(frame),
+                'columns': encode_columnar(frame, columns or None)
+            }), etag)
+        except Exception as e:
+            logger.error(f"Fehler beim Abrufen der Raumbuch-Spalten: {e}")
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/export/excel/<int:standort_id>')
     def export_excel(standort_id):
         """
@@ -211,26 +400,25 @@ def register_routes(app):
                 flash('Der ausgewählte Standort wurde nicht gefunden.', 'warning')
                 return redirect(url_for('index'))
 
-            # Daten abrufen
-            data = get_raumbuch_data(standort_id)
+            # Hat der Browser die Datei zum selben Datenstand, wird sie nicht erneut erzeugt
+            version = get_raumbuch_version(standort_id)
+            etag = version_etag('excel', standort_id, version, request.args, normalize_export_options(request.args))
+            unchanged = not_modified(etag)
+            if unchanged:
+                return unchanged
 
-            # Daten vorverarbeiten
-            data = preprocess_data(data)
-
-            # Filter anwenden
-            data = apply_filters(data, request.args)
-
-            # Nach Excel exportieren
-            excel_path = export_to_excel(data, standort['Bezeichnung'])
+            # Vorhandene Datei für denselben Datenstand wiederverwenden oder neu erzeugen
+            excel_path = create_excel_export(standort_id, standort['Bezeichnung'], request.args, version)
 
             if excel_path and os.path.exists(excel_path):
                 # Datei zum Download anbieten
-                return send_file(
+                return add_etag(send_file(
                     excel_path,
                     as_attachment=True,
-                    download_name=os.path.basename(excel_path),
-                    mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-                )
+                    download_name=export_download_name(standort['Bezeichnung'], 'excel'),
+                    mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                    etag=etag or True
+                ), etag)
             else:
                 flash('Fehler beim Erstellen der Excel-Datei.', 'danger')
                 return redirect(url_for('report', standort_id=standort_id))
@@ -258,29 +446,25 @@ def register_routes(app):
                 flash('Der ausgewählte Standort wurde nicht gefunden.', 'warning')
                 return redirect(url_for('index'))
 
-            # Daten abrufen
-            data = get_raumbuch_data(standort_id)
-
-            # Daten vorverarbeiten
-            data = preprocess_data(data)
+            # Hat der Browser die Datei zum selben Datenstand, wird sie nicht erneut erzeugt
+            version = get_raumbuch_version(standort_id)
+            etag = version_etag('pdf', standort_id, version, request.args, normalize_export_options(request.args))
+            unchanged = not_modified(etag)
+            if unchanged:
+                return unchanged
 
-            # Filter anwenden
-            data = apply_filters(data, request.args)
-
-            # Visualisierungsdaten für Charts vorbereiten
-            viz_data = prepare_data_for_visualization(data)
-
-            # Nach PDF exportieren
-            pdf_path = export_to_pdf(data, standort['Bezeichnung'], viz_data)
+            # Vorhandene Datei für denselben Datenstand wiederverwenden oder neu erzeugen
+            pdf_path = create_pdf_export(standort_id, standort['Bezeichnung'], request.args, version)
 
             if pdf_path and os.path.exists(pdf_path):
                 # Datei zum Download anbieten
-                return send_file(
+                return add_etag(send_file(
                     pdf_path,
                     as_attachment=True,
-                    download_name=os.path.basename(pdf_path),
-                    mimetype='application/pdf'
-                )
+                    download_name=export_download_name(standort['Bezeichnung'], 'pdf'),
+                    mimetype='application/pdf',
+                    etag=etag or True
+                ), etag)
             else:
                 flash('Fehler beim Erstellen der PDF-Datei.', 'danger')
                 return redirect(url_for('report', standort_id=standort_id))
@@ -290,9 +474,405 @@ def register_routes(app):
             flash(f'Fehler beim PDF-Export: {str(e)}', 'danger')
             return redirect(url_for('report', standort_id=standort_id))
 
+    @app.route('/export/<export_format>/<int:standort_id>/jobs', methods=['POST'])
+    def submit_export_job(export_format, standort_id):
+        """
+        Stellt einen Export in die Hintergrund-Warteschlange.
+
+        Args:
+            export_format (str): 'excel' oder 'pdf'
+            standort_id (int): ID des Standorts
+
+        Returns:
+            Response: JSON mit Auftrags-ID sowie Status- und Download-URL (202)
+        """
+        builder = EXPORT_BUILDERS.get(export_format)
+        if builder is None:
+            return jsonify({'error': f'Unbekanntes Exportformat: {export_format}'}), 404
+
+        standort = get_standort_by_id(standort_id)
+        if not standort:
+            return jsonify({'error': 'Der ausgewählte Standort wurde nicht gefunden.'}), 404
+
+        # Filter und Exportoptionen (z.B. engine) unabhängig von request.args festhalten
+        params = normalize_filters(request.args) + normalize_export_options(request.args)
+        standort_name = standort['Bezeichnung']
+
+        try:
+            job = export_jobs.submit(
+                lambda: builder(standort_id, standort_name, dict(params)),
+                key=(export_format, standort_id, params),
+                download_name=export_download_name(standort_name, export_format)
+            )
+        except ExportQueueFullError as e:
+            return jsonify({'error': str(e)}), 503
+
+        return jsonify(export_job_payload(job)), 202
+
+    @app.route('/export/jobs/<job_id>')
+    def export_job_status(job_id):
+        """
+        Liefert den Status eines Exportauftrags.
+
+        Args:
+            job_id (str): ID des Auftrags
+
+        Returns:
+            Response: JSON mit Status
+        """
+        job = export_jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Exportauftrag nicht gefunden.'}), 404
+        return jsonify(export_job_payload(job))
+
+    @app.route('/export/jobs/<job_id>/download')
+    def export_job_download(job_id):
+        """
+        Liefert die Datei eines abgeschlossenen Exportauftrags.
+
+        Args:
+            job_id (str): ID des Auftrags
+
+        Returns:
+            Response: Exportdatei zum Download
+        """
+        job = export_jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Exportauftrag nicht gefunden.'}), 404
+        if job.status != ExportJob.DONE:
+            return jsonify(export_job_payload(job)), 409
+        if not os.path.exists(job.path):
+            return jsonify({'error': 'Die Exportdatei ist nicht mehr vorhanden.'}), 410
+
+        return send_file(
+            job.path,
+            as_attachment=True,
+            download_name=job.download_name,
+            mimetype=EXPORT_MIMETYPES[os.path.splitext(job.path)[1]]
+        )
+
+def parse_page_args(args):
+    """
+    Liest Sortierung, Seitengrenzen und Spaltenauswahl der Raumbuch-API.
+
+    Args:
+        args (Mapping): Request-Parameter
+
+    Returns:
+        dict: Schlüsselwortargumente für get_raumbuch_page (sort, descending,
+        offset, limit, columns)
+
+    Raises:
+        ValueError: Bei ungültigen Werten für offset oder limit
+    """
+    try:
+        offset = int(args.get('offset') or 0)
+        limit = int(args.get('limit') or API_CONFIG['page_size'])
+    except ValueError:
+        raise ValueError('offset und limit müssen ganze Zahlen sein.')
+    if offset < 0 or limit < 1:
+        raise ValueError('offset darf nicht negativ und limit muss positiv sein.')
+
+    sort = (args.get('sort') or '').strip()
+    descending = sort.startswith('-')
+    columns = [column.strip() for column in (args.get('columns') or '').split(',') if column.strip()]
+
+    return dict(
+        sort=sort.lstrip('-') or None,
+        descending=descending,
+        offset=offset,
+        limit=min(limit, API_CONFIG['max_page_size']),
+        columns=columns or None
+    )
+
+def data_etag(name, standort_id, args, *extra):
+    """
+    Bildet den ETag einer Antwort, die von den Raumbuch-Daten eines Standorts abhängt.
+
+    Args:
+        name (str): Name der Route
+        standort_id (int): ID des Standorts
+        args (Mapping): Request-Parameter, die Filter gehen normalisiert ein
+        *extra: Weitere Parameter, die den Inhalt bestimmen
+
+    Returns:
+        str: ETag oder None, wenn die Datenversion nicht ermittelt werden kann
+    """
+    return version_etag(name, standort_id, get_raumbuch_version(standort_id), args, *extra)
+
+def version_etag(name, standort_id, version, args, *extra):
+    """
+    Bildet den ETag zu einer bereits ermittelten Datenversion, z.B. wenn die Version
+    anschließend auch für den Export-Cache gebraucht wird.
+
+    Args:
+        name (str): Name der Route
+        standort_id (int): ID des Standorts
+        version: Datenversion aus get_raumbuch_version
+        args (Mapping): Request-Parameter, die Filter gehen normalisiert ein
+        *extra: Weitere Parameter, die den Inhalt bestimmen
+
+    Returns:
+        str: ETag oder None, wenn keine Datenversion vorliegt
+    """
+    if version is None:
+        return None
+    return compute_etag(name, standort_id, version, normalize_filters(args), *extra)
+
+def page_etag(name, args, *extra):
+    """
+    Bildet den ETag einer HTML-Seite mit Standortauswahl.
+
+    Args:
+        name (str): Name der Route
+        args (Mapping): Request-Parameter mit optionaler 'standort_id'
+        *extra: Weitere Parameter, die den Inhalt bestimmen
+
+    Returns:
+        str: ETag oder None bei ungültiger Standort-ID oder unbekannter Datenversion
+    """
+    standorte = get_standorte()
+    standort_id = args.get('standort_id')
+    if not standort_id:
+        return compute_etag(name, standorte, *extra)
+    try:
+        standort_id = int(standort_id)
+    except ValueError:
+        return None
+    return data_etag(name, standort_id, args, standorte, *extra)
+
+def report_option_enabled(args, option):
+    """
+    Bestimmt, ob ein Darstellungsmodus der Report-Seite aktiv ist.
+
+    Args:
+        args (Mapping): Request-Parameter, z.B. ?stream=1 bzw. ?stream=0 überschreibt REPORT_CONFIG
+        option (str): 'stream', 'virtual' oder 'client_filter'
+
+    Returns:
+        bool: True, wenn der Modus aktiv ist
+    """
+    value = args.get(option)
+    if value is None or value == '':
+        return REPORT_CONFIG[option]
+    return value.lower() not in ('0', 'false', 'nein', 'no')
+
+def iter_report_rows(standort_id, args):
+    """
+    Liefert die Tabellenzeilen der Report-Seite blockweise umgewandelt vom Cursor.
+    Da Kopf und Zusammenfassung bereits gesendet sind, wird ein Fehler nur protokolliert
+    und die Tabelle an dieser Stelle beendet.
+
+    Args:
+        standort_id (int): ID des Standorts
+        args (Mapping): Filter-Parameter
+
+    Yields:
+        dict: Raumbuch-Zeile mit float-Kennzahlen
+    """
+    try:
+        yield from iter_preprocessed_data(iter_raumbuch_rows(standort_id, args))
+    except Exception as e:
+        logger.error(f"Fehler beim Streamen der Report-Tabelle: {e}")
+        logger.error(traceback.format_exc())
+
+def iter_html_chunks(pieces, chunk_size):
+    """
+    Fasst die kleinen Teilstücke eines gestreamten Templates zu Blöcken zusammen.
+    An STREAM_FLUSH wird der bisherige Inhalt unabhängig von der Größe gesendet.
+
+    Args:
+        pieces (iterable): Ausgabe von stream_template
+        chunk_size (int): Mindestgröße eines Blocks in Zeichen
+
+    Yields:
+        str: HTML-Block
+    """
+    buffer = []
+    size = 0
+    for piece in pieces:
+        if piece == STREAM_FLUSH:
+            if buffer:
+                yield ''.join(buffer)
+                buffer = []
+                size = 0
+            continue
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+def export_job_payload(job):
+    """
+    Erstellt die JSON-Antwort für einen Exportauftrag.
+
+    Args:
+        job (ExportJob): Exportauftrag
+
+    Returns:
+        dict: Status des Auftrags mit Status- und Download-URL
+    """
+    payload = job.to_dict()
+    payload['status_url'] = url_for('export_job_status', job_id=job.id)
+    payload['download_url'] = url_for('export_job_download', job_id=job.id)
+    return payload
+
+def create_excel_export(standort_id, standort_name, filters, version=None):
+    """
+    Liefert den Excel-Export eines Standorts aus dem Export-Cache oder erzeugt ihn.
+    Wird von der Download-Route und als Body von Exportaufträgen verwendet.
+
+    Args:
+        standort_id (int): ID des Standorts
+        standort_name (str): Name des Standorts
+        filters (Mapping): Filter-Parameter
+        version (optional): Bereits ermittelte Datenversion, sonst wird sie abgefragt
+
+    Returns:
+        str: Pfad zur Excel-Datei oder None
+    """
+    def create():
+        # Gefilterte Daten zeilenweise vom Cursor lesen, die Filter werden in der Datenbank angewendet
+        rows = iter_raumbuch_rows(standort_id, filters)
+
+        # Nach Excel exportieren, ohne das Ergebnis im Speicher zu halten
+        return export_to_excel(rows, standort_name, streaming=True)
+
+    return cached_export(standort_id, filters, 'excel', create, version)
+
+def create_pdf_export(standort_id, standort_name, filters, version=None):
+    """
+    Liefert den PDF-Export eines Standorts aus dem Export-Cache oder erzeugt ihn.
+    Wird von der Download-Route und als Body von Exportaufträgen verwendet.
+
+    Args:
+        standort_id (int): ID des Standorts
+        standort_name (str): Name des Standorts
+        filters (Mapping): Filter-Parameter und Exportoptionen, z.B. engine='native'
+        version (optional): Bereits ermittelte Datenversion, sonst wird sie abgefragt
+
+    Returns:
+        str: Pfad zur PDF-Datei oder None
+    """
+    engine = filters.get('engine') or EXPORT_CONFIG['pdf'].get('engine', 'html')
+
+    def create():
+        if engine == 'native':
+            # Zusammenfassung per SQL, die Räume werden seitenweise vom Cursor gelesen
+            summary = get_raumbuch_summary(standort_id, filters)
+            rows = iter_raumbuch_rows(standort_id, filters)
+            return export_to_pdf(rows, standort_name, prepare_visualization_from_summary(summary),
+                                 summary=summary, engine=engine)
+
+        # Gefilterte Daten als DataFrame abrufen, die Filter werden in der Datenbank angewendet
+        analysis = RaumbuchAnalysis(get_raumbuch_frame(standort_id, filters))
+
+        # Nach PDF exportieren, Zusammenfassung und Diagrammdaten werden nur einmal berechnet
+        return export_to_pdf(analysis.records, standort_name, analysis.viz_data,
+                             summary=analysis.summary, engine=engine)
+
+    return cached_export(standort_id, filters, 'pdf', create, version)
+
+# Exportfunktionen je Format für die Hintergrund-Warteschlange
+EXPORT_BUILDERS = {
+    'excel': create_excel_export,
+    'pdf': create_pdf_export
+}
+
+# Exportoptionen, die neben den Filtern übergeben werden können, z.B. ?engine=native für PDF
+EXPORT_OPTIONS = ('engine',)
+
+# MIME-Typen der Exportdateien je Dateiendung
+EXPORT_MIMETYPES = {
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.pdf': 'application/pdf'
+}
+
+def cached_export(standort_id, args, export_format, create, version=None):
+    """
+    Liefert eine Exportdatei aus dem Export-Cache oder erzeugt sie und legt sie dort ab.
+    Der Schlüssel besteht aus Standort, Filtern, Datenversion und Format.
+
+    Args:
+        standort_id (int): ID des Standorts
+        args (ImmutableMultiDict): Filter-Parameter und Exportoptionen
+        export_format (str): 'excel' oder 'pdf'
+        create (Callable): Funktion ohne Argumente, die die Datei erzeugt und ihren Pfad liefert
+        version (optional): Bereits ermittelte Datenversion, z.B. aus dem ETag der Route
+
+    Returns:
+        str: Pfad zur Exportdatei oder None, wenn sie nicht erzeugt werden konnte
+    """
+    cache_key = None
+    if EXPORT_CACHE_CONFIG['enabled']:
+        if version is None:
+            version = get_raumbuch_version(standort_id)
+        if version is not None:
+            params = normalize_filters(args) + normalize_export_options(args)
+            cache_key = export_cache.make_key(standort_id, params, version, export_format)
+            path = export_cache.get(cache_key, export_format)
+            if path:
+                logger.info(f"Export für Standort {standort_id} aus dem Export-Cache geliefert")
+                return path
+
+    path = create()
+    if path and cache_key and os.path.exists(path):
+        # Ergebnisse noch abrufbarer Exportaufträge beim Aufräumen erhalten
+        path = export_cache.put(cache_key, export_format, path, keep=export_jobs.result_paths())
+    return path
+
+def normalize_export_options(args):
+    """
+    Reduziert Request-Parameter auf die bekannten Exportoptionen neben den Filtern.
+
+    Args:
+        args (Mapping): Request-Parameter
+
+    Returns:
+        tuple: Sortierte (Option, Wert)-Paare, als Teil eines Cache-Schlüssels geeignet
+    """
+    if not args:
+        return ()
+    return tuple(sorted((name, args.get(name)) for name in EXPORT_OPTIONS if args.get(name)))
+
+def export_download_name(standort_name, export_format):
+    """
+    Erstellt den Dateinamen für den Download einer Exportdatei.
+
+    Args:
+        standort_name (str): Name des Standorts
+        export_format (str): 'excel' oder 'pdf'
+
+    Returns:
+        str: Dateiname mit Zeitstempel
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"Raumbuch_Auswertung_{standort_name}_{timestamp}.{EXPORT_EXTENSIONS[export_format]}"
+
+def iter_apply_filters(rows, args):
+    """
+    Wendet Filter zeilenweise auf Raumbuch-Daten an, z.B. auf einen Generator.
+
+    Args:
+        rows (iterable): Raumbuch-Daten
+        args (ImmutableMultiDict): Filter-Parameter
+
+    Returns:
+        iterable: Gefilterte Raumbuch-Daten, ohne Filter die ursprünglichen Daten
+    """
+    filters = normalize_filters(args)
+    if not filters:
+        return rows
+    return iter_filtered_rows(rows, filters)
+
 def apply_filters(data, args):
     """
-    Wendet Filter auf die Raumbuch-Daten an.
+    Wendet Filter auf bereits geladene Raumbuch-Daten an.
+    Die Routen übergeben die Filter stattdessen direkt an die Abfragefunktionen, z.B. get_raumbuch_frame.
 
     Args:
         data (list): Liste der Raumbuch-Daten
@@ -305,28 +885,7 @@ def apply_filters(data, args):
     if not args or len(args) <= 1:  # standort_id ist immer vorhanden
         return data
 
-    # Möglicherweise vorhandene Filter
-    bereich = args.get('bereich')
-    gebaeudeteil = args.get('gebaeudeteil')
-    etage = args.get('etage')
-    rg = args.get('rg')
-
-    # Filtern
-    filtered_data = data
-
-    if bereich:
-        filtered_data = [item for item in filtered_data if item.get('Bereich') == bereich]
-
-    if gebaeudeteil:
-        filtered_data = [item for item in filtered_data if item.get('Gebaeudeteil') == gebaeudeteil]
-
-    if etage:
-        filtered_data = [item for item in filtered_data if item.get('Etage') == etage]
-
-    if rg:
-        filtered_data = [item for item in filtered_data if item.get('RG') == rg]
-
-    return filtered_data
+    return list(iter_apply_filters(data, args))
 
 def create_filter_options(data):
     """
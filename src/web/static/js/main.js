@@ -3,6 +3,7 @@
 document.addEventListener('DOMContentLoaded', function() {
     // Initialisierungen nach dem Laden des DOMs
     initStandortDropdown();
+    initVirtualTable();
     initDataTable();
     initExportButtons();
     initFilterFunctions();
@@ -31,7 +32,7 @@ function initStandortDropdown() {
 // Initialisiert DataTable für bessere Tabellenfunktionalität (wenn vorhanden)
 function initDataTable() {
     const dataTable = document.getElementById('raumbuch-table');
-    if (!dataTable) return;
+    if (!dataTable || dataTable.dataset.virtual) return;
 
     // Falls jQuery und DataTables vorhanden sind, initialisiere DataTable
     if (typeof $ !== 'undefined' && $.fn.DataTable) {
@@ -59,54 +60,483 @@ function initDataTable() {
         // Einfache Suchfunktion
         const searchInput = document.getElementById('table-search');
         if (searchInput) {
-            searchInput.addEventListener('keyup', function() {
-                filterTable(this.value.toLowerCase());
-            });
+            searchInput.addEventListener('input', debounce(function() {
+                filterTable(searchInput.value.toLowerCase());
+            }, SEARCH_DEBOUNCE));
         }
     }
 }
 
+// Wartezeit in Millisekunden nach der letzten Eingabe, bevor gesucht wird
+const SEARCH_DEBOUNCE = 250;
+
+// Führt eine Funktion erst aus, wenn sie für wait Millisekunden nicht erneut aufgerufen wurde
+function debounce(fn, wait) {
+    let timer = null;
+    return function() {
+        const args = arguments;
+        const context = this;
+        clearTimeout(timer);
+        timer = setTimeout(function() { fn.apply(context, args); }, wait);
+    };
+}
+
+// Kleingeschriebener Text je Tabellenzeile, wird beim ersten Suchen einmal aufgebaut
+let tableSearchIndex = null;
+
 // Einfache Tabellenfilterung für Nicht-DataTables-Ansicht
 function filterTable(query) {
     const table = document.getElementById('raumbuch-table');
     if (!table) return;
 
-    const rows = table.getElementsByTagName('tbody')[0].getElementsByTagName('tr');
+    if (!tableSearchIndex) {
+        const rows = table.getElementsByTagName('tbody')[0].getElementsByTagName('tr');
+        tableSearchIndex = Array.from(rows, row => ({row: row, text: row.textContent.toLowerCase()}));
+    }
 
-    for (let i = 0; i < rows.length; i++) {
-        const rowText = rows[i].textContent.toLowerCase();
-        rows[i].style.display = rowText.includes(query) ? '' : 'none';
+    tableSearchIndex.forEach(function(entry) {
+        entry.row.style.display = entry.text.includes(query) ? '' : 'none';
+    });
+}
+
+// Spalten der virtuellen Tabelle, die mit zwei Nachkommastellen angezeigt werden
+const VIRTUAL_DECIMAL_COLUMNS = [
+    'qm', 'RgJahr', 'RgMonat', 'qmMonat', 'WertMonat', 'StundenTag', 'StundenMonat', 'WertJahr', 'qmStunde'
+];
+
+// Zusätzlich gerenderte Zeilen ober- und unterhalb des sichtbaren Bereichs
+const VIRTUAL_OVERSCAN = 10;
+
+// Virtuelle Tabelle: lädt die Räume seitenweise als kompakte Listen über /api/raumbuch
+// und hält nur die sichtbaren Zeilen im DOM
+function initVirtualTable() {
+    const table = document.getElementById('raumbuch-table');
+    const viewport = document.getElementById('raumbuch-viewport');
+    if (!table || !viewport || !table.dataset.virtual) return;
+
+    const tbody = table.tBodies[0];
+    const columnCount = table.tHead.rows[0].cells.length;
+    const total = parseInt(table.dataset.total, 10) || 0;
+    const pageSize = parseInt(table.dataset.pageSize, 10) || 1000;
+    const searchInput = document.getElementById('table-search');
+    const status = document.getElementById('virtual-table-status');
+
+    // Zeilen als fertig formatierte Zellentexte, dazu der kleingeschriebene Suchtext je Zeile
+    const rows = [];
+    const searchIndex = [];
+    // Indizes der Zeilen, die zu Filter und Suche passen
+    let view = [];
+    let query = '';
+    // Ergebnis der Filter im Browser (1 = Zeile passt), null ohne Filter
+    let mask = null;
+    let rowHeight = 0;
+    let frame = null;
+
+    const formatCell = function(column, value) {
+        if (value === null || value === undefined) return '';
+        if (VIRTUAL_DECIMAL_COLUMNS.includes(column)) return Number(value).toFixed(2);
+        return String(value);
+    };
+
+    const escapeHtml = function(text) {
+        return text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+    };
+
+    const spacer = function(height) {
+        return height > 0 ? `<tr class="virtual-spacer" style="height: ${height}px"><td colspan="${columnCount}"></td></tr>` : '';
+    };
+
+    const updateStatus = function() {
+        if (!status) return;
+        const loaded = rows.length < total ? ` (${rows.length} von ${total} geladen)` : '';
+        status.textContent = query || mask ? `${view.length} Treffer${loaded}` : `${rows.length} Räume${loaded}`;
+    };
+
+    const render = function() {
+        frame = null;
+        const height = rowHeight || 40;
+        // Gerade Startzeile, damit die Streifen beim Scrollen nicht springen
+        let first = Math.max(0, Math.floor(viewport.scrollTop / height) - VIRTUAL_OVERSCAN);
+        first -= first % 2;
+        const last = Math.min(view.length, first + Math.ceil(viewport.clientHeight / height) + 2 * VIRTUAL_OVERSCAN);
+
+        const html = [spacer(first * height)];
+        for (let i = first; i < last; i++) {
+            html.push('<tr><td>' + rows[view[i]].map(escapeHtml).join('</td><td>') + '</td></tr>');
+        }
+        html.push(spacer((view.length - last) * height));
+        tbody.innerHTML = html.join('');
+
+        // Zeilenhöhe einmal an der ersten echten Zeile messen
+        if (!rowHeight && last > first) {
+            const sample = tbody.querySelector('tr:not(.virtual-spacer)');
+            if (sample && sample.offsetHeight) {
+                rowHeight = sample.offsetHeight;
+                scheduleRender();
+            }
+        }
+        updateStatus();
+    };
+
+    const scheduleRender = function() {
+        if (frame === null) {
+            frame = window.requestAnimationFrame(render);
+        }
+    };
+
+    const matches = function(index) {
+        return (!mask || mask[index] === 1) && (!query || searchIndex[index].includes(query));
+    };
+
+    const rebuildView = function() {
+        view = [];
+        for (let i = 0; i < rows.length; i++) {
+            if (matches(i)) view.push(i);
+        }
+        viewport.scrollTop = 0;
+        scheduleRender();
+    };
+
+    const addRows = function(columns, pageRows) {
+        pageRows.forEach(function(values) {
+            const cells = values.map((value, i) => formatCell(columns[i], value));
+            const index = rows.push(cells) - 1;
+            searchIndex.push(cells.join('\u0001').toLowerCase());
+            if (matches(index)) view.push(index);
+        });
+        scheduleRender();
+    };
+
+    // Aktive Filter der Seite an die API übergeben
+    const params = new URLSearchParams(window.location.search);
+    ['standort_id', 'stream', 'virtual'].forEach(name => params.delete(name));
+    params.set('compact', '1');
+    params.set('limit', pageSize);
+
+    const loadPage = function(offset) {
+        params.set('offset', offset);
+        return fetch(`${table.dataset.apiUrl}?${params.toString()}`)
+            .then(response => {
+                if (!response.ok) {
+                    return response.json().then(data => { throw new Error(data.error || response.statusText); });
+                }
+                return response.json();
+            })
+            .then(page => {
+                addRows(page.columns, page.rows);
+                if (page.next_offset !== null) {
+                    return loadPage(page.next_offset);
+                }
+            });
+    };
+
+    viewport.addEventListener('scroll', scheduleRender);
+    window.addEventListener('resize', scheduleRender);
+
+    if (searchInput) {
+        searchInput.addEventListener('input', debounce(function() {
+            query = searchInput.value.trim().toLowerCase();
+            rebuildView();
+        }, SEARCH_DEBOUNCE));
     }
+
+    // Alle Zeilen einmal spaltenweise laden; Filter, Summen und Diagramme danach im Browser
+    const loadColumnar = function() {
+        return fetch(table.dataset.columnarUrl)
+            .then(response => {
+                if (!response.ok) {
+                    return response.json().then(data => { throw new Error(data.error || response.statusText); });
+                }
+                return response.json();
+            })
+            .then(data => {
+                const columns = Object.keys(data.columns);
+                const decoded = columns.map(column => decodeColumn(data.columns[column]));
+                const pageRows = [];
+                for (let i = 0; i < data.total; i++) {
+                    pageRows.push(decoded.map(values => values[i]));
+                }
+                addRows(columns, pageRows);
+
+                clientFilter = createClientFilter(data, function(newMask) {
+                    mask = newMask;
+                    rebuildView();
+                });
+                clientFilter.apply();
+            });
+    };
+
+    updateStatus();
+    (table.dataset.columnarUrl ? loadColumnar() : loadPage(0)).catch(error => {
+        console.error('Fehler beim Laden der Tabelle:', error);
+        if (status) status.textContent = `Fehler beim Laden der Tabelle: ${error.message}`;
+    });
 }
 
-// Initialisiert Export-Buttons
-function initExportButtons() {
-    const exportExcelBtn = document.getElementById('export-excel');
-    const exportPdfBtn = document.getElementById('export-pdf');
+// Filter im Browser, sobald die Spaltendaten geladen sind; sonst werden Filter per Formular gesendet
+let clientFilter = null;
+
+// Filterfelder des Formulars -> Spalte der Spaltendaten
+const CLIENT_FILTER_COLUMNS = {bereich: 'Bereich', gebaeudeteil: 'Gebaeudeteil', etage: 'Etage', rg: 'RG'};
+
+// Summen der Zusammenfassung: Schlüssel in data-summary -> Spalte
+const CLIENT_SUMMARY_COLUMNS = {
+    total_qm: 'qm',
+    total_qm_monat: 'qmMonat',
+    total_wert_monat: 'WertMonat',
+    total_wert_jahr: 'WertJahr',
+    total_stunden_monat: 'StundenMonat'
+};
+
+// Wandelt eine Spalte aus /api/raumbuch/<id>/columns in eine Werteliste um
+function decodeColumn(column) {
+    if (!column.dictionary) return column.values;
+    return column.codes.map(code => code < 0 ? null : column.dictionary[code]);
+}
 
-    if (exportExcelBtn) {
-        exportExcelBtn.addEventListener('click', function() {
-            const standortId = document.getElementById('standort-id')?.value ||
-                               document.getElementById('standort-select')?.value;
-            if (standortId) {
-                window.location.href = `/export/excel/${standortId}`;
+// Erstellt die Filterung im Browser über die wörterbuchkodierten Spalten
+function createClientFilter(data, onChange) {
+    const filterForm = document.getElementById('filter-form');
+    const total = data.total;
+
+    // Filterwerte des Formulars als Codes vergleichen statt als Texte
+    const computeMask = function(filters) {
+        const mask = new Uint8Array(total).fill(1);
+        Object.keys(filters).forEach(function(name) {
+            const column = data.columns[CLIENT_FILTER_COLUMNS[name]];
+            if (!column) return;
+            const code = column.dictionary.indexOf(filters[name]);
+            // Unbekannter Wert: kein Raum passt, auch nicht die Räume ohne Wert (Code -1)
+            if (code === -1) {
+                mask.fill(0);
+                return;
+            }
+            for (let i = 0; i < total; i++) {
+                if (column.codes[i] !== code) mask[i] = 0;
+            }
+        });
+        return mask;
+    };
+
+    // Summen gesamt und je Wörterbucheintrag einer Kategorie-Spalte
+    const summarize = function(mask) {
+        const sums = {total_rooms: 0};
+        Object.keys(CLIENT_SUMMARY_COLUMNS).forEach(key => { sums[key] = 0; });
+        for (let i = 0; i < total; i++) {
+            if (!mask[i]) continue;
+            sums.total_rooms++;
+            Object.keys(CLIENT_SUMMARY_COLUMNS).forEach(function(key) {
+                const column = data.columns[CLIENT_SUMMARY_COLUMNS[key]];
+                if (column) sums[key] += column.values[i] || 0;
+            });
+        }
+        return sums;
+    };
+
+    const groupSums = function(mask, groupColumn, valueColumn) {
+        const group = data.columns[groupColumn];
+        const value = data.columns[valueColumn];
+        if (!group || !value) return {};
+
+        const sums = new Float64Array(group.dictionary.length);
+        const counts = new Uint32Array(group.dictionary.length);
+        for (let i = 0; i < total; i++) {
+            const code = group.codes[i];
+            if (!mask[i] || code < 0) continue;
+            sums[code] += value.values[i] || 0;
+            counts[code]++;
+        }
+
+        const result = {};
+        group.dictionary.forEach(function(label, code) {
+            if (counts[code]) result[label] = sums[code];
+        });
+        return result;
+    };
+
+    return {
+        apply: function() {
+            const filters = readFilterForm(filterForm);
+            const mask = computeMask(filters);
+            const sums = summarize(mask);
+
+            document.querySelectorAll('[data-summary]').forEach(function(element) {
+                const value = sums[element.dataset.summary];
+                if (value === undefined) return;
+                element.textContent = element.dataset.summary === 'total_rooms' ? value : value.toFixed(2);
+            });
+            updateChart(reportCharts.bereich, groupSums(mask, 'Bereich', 'qm'));
+            updateChart(reportCharts.rg, groupSums(mask, 'RG', 'WertMonat'));
+            updateChart(reportCharts.etage, groupSums(mask, 'Etage', 'StundenMonat'));
+
+            updateFilterUrl(filters);
+            onChange(Object.keys(filters).length ? mask : null);
+        }
+    };
+}
+
+// Liest die gesetzten Filter des Filterformulars
+function readFilterForm(filterForm) {
+    const filters = {};
+    Object.keys(CLIENT_FILTER_COLUMNS).forEach(function(name) {
+        const field = filterForm && filterForm.elements[name];
+        if (field && field.value) filters[name] = field.value;
+    });
+    return filters;
+}
+
+// Hält die Filter in der Adresse fest, damit Exporte und Neuladen sie übernehmen
+function updateFilterUrl(filters) {
+    const params = new URLSearchParams(window.location.search);
+    Object.keys(CLIENT_FILTER_COLUMNS).forEach(function(name) {
+        if (filters[name]) {
+            params.set(name, filters[name]);
+        } else {
+            params.delete(name);
+        }
+    });
+    window.history.replaceState(null, '', `${window.location.pathname}?${params.toString()}`);
+}
+
+// Lädt Tabellenzeilen, Zusammenfassung, Summenzeile und Diagrammdaten für die
+// gesetzten Filter und tauscht sie an Ort und Stelle aus
+function loadReportFragments(filterForm, table) {
+    const filters = readFilterForm(filterForm);
+    const params = new URLSearchParams(filters);
+
+    return fetch(`${table.dataset.fragmentsUrl}?${params.toString()}`)
+        .then(response => {
+            if (!response.ok) {
+                return response.json().then(data => { throw new Error(data.error || response.statusText); });
+            }
+            return response.json();
+        })
+        .then(fragments => {
+            if (typeof $ !== 'undefined' && $.fn.DataTable && $.fn.DataTable.isDataTable(table)) {
+                const dataTable = $(table).DataTable();
+                dataTable.clear();
+                dataTable.rows.add($(fragments.rows).filter('tr'));
+                dataTable.draw();
             } else {
-                alert('Bitte wählen Sie zuerst einen Standort aus.');
+                table.tBodies[0].innerHTML = fragments.rows;
+                tableSearchIndex = null;
             }
+            document.getElementById('report-summary').innerHTML = fragments.summary;
+            table.tFoot.innerHTML = fragments.footer;
+
+            const vizData = fragments.viz_data || {};
+            updateChart(reportCharts.bereich, vizData.bereich_data || {});
+            updateChart(reportCharts.rg, vizData.rg_data || {});
+            updateChart(reportCharts.etage, vizData.etage_data || {});
+
+            updateFilterUrl(filters);
         });
+}
+
+// Ersetzt die Daten eines Chart.js-Diagramms
+function updateChart(chart, chartData) {
+    if (!chart) return;
+
+    const labels = Object.keys(chartData);
+    const dataset = chart.data.datasets[0];
+    chart.data.labels = labels;
+    dataset.data = Object.values(chartData);
+    if (Array.isArray(dataset.backgroundColor)) {
+        while (dataset.backgroundColor.length < labels.length) {
+            dataset.backgroundColor.push(getRandomColor());
+        }
     }
+    chart.update();
+}
 
-    if (exportPdfBtn) {
-        exportPdfBtn.addEventListener('click', function() {
+// Initialisiert Export-Buttons
+function initExportButtons() {
+    // Format und optionale PDF-Engine je Button
+    const exportButtons = [
+        {id: 'export-excel', format: 'excel'},
+        {id: 'export-pdf', format: 'pdf'},
+        {id: 'export-pdf-native', format: 'pdf', engine: 'native'}
+    ];
+
+    exportButtons.forEach(function(config) {
+        const button = document.getElementById(config.id);
+        if (!button) return;
+
+        button.addEventListener('click', function() {
             const standortId = document.getElementById('standort-id')?.value ||
                                document.getElementById('standort-select')?.value;
             if (standortId) {
-                window.location.href = `/export/pdf/${standortId}`;
+                submitExportJob(config.format, standortId, button, config.engine);
             } else {
                 alert('Bitte wählen Sie zuerst einen Standort aus.');
             }
         });
+    });
+}
+
+// Intervall in Millisekunden, in dem der Status eines Exportauftrags abgefragt wird
+const EXPORT_POLL_INTERVAL = 1000;
+
+// Stellt einen Export in die Warteschlange und lädt die Datei nach Abschluss herunter
+function submitExportJob(format, standortId, button, engine) {
+    // Aktive Filter der Seite (z.B. bereich, etage) an den Export übergeben
+    const params = new URLSearchParams(window.location.search);
+    params.delete('standort_id');
+    if (engine) {
+        params.set('engine', engine);
     }
+    const query = params.toString() ? `?${params.toString()}` : '';
+
+    const label = button.innerHTML;
+    button.disabled = true;
+    button.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Export wird erstellt...';
+
+    const restoreButton = function() {
+        button.disabled = false;
+        button.innerHTML = label;
+    };
+
+    fetch(`/export/${format}/${standortId}/jobs${query}`, {method: 'POST'})
+        .then(response => {
+            if (!response.ok) {
+                return response.json().then(data => { throw new Error(data.error || response.statusText); });
+            }
+            return response.json();
+        })
+        .then(job => pollExportJob(job))
+        .then(job => {
+            restoreButton();
+            window.location.href = job.download_url;
+        })
+        .catch(error => {
+            restoreButton();
+            console.error('Fehler beim Export:', error);
+            alert(`Fehler beim Export: ${error.message}`);
+        });
+}
+
+// Fragt den Status eines Exportauftrags ab, bis er abgeschlossen oder fehlgeschlagen ist
+function pollExportJob(job) {
+    return new Promise(function(resolve, reject) {
+        const check = function(current) {
+            if (current.status === 'done') {
+                resolve(current);
+            } else if (current.status === 'failed') {
+                reject(new Error(current.error || 'Die Exportdatei konnte nicht erstellt werden.'));
+            } else {
+                setTimeout(function() {
+                    fetch(current.status_url)
+                        .then(response => {
+                            if (!response.ok) throw new Error('Exportauftrag nicht gefunden.');
+                            return response.json();
+                        })
+                        .then(check)
+                        .catch(reject);
+                }, EXPORT_POLL_INTERVAL);
+            }
+        };
+        check(job);
+    });
 }
 
 // Initialisiert Filter-Funktionen
@@ -121,23 +551,50 @@ function initFilterFunctions() {
             e.preventDefault();
             const formElements = filterForm.elements;
             for (let i = 0; i < formElements.length; i++) {
-                if (formElements[i].type !== 'submit' && formElements[i].type !== 'button') {
+                if (formElements[i].type !== 'submit' && formElements[i].type !== 'button' &&
+                    formElements[i].type !== 'hidden') {
                     formElements[i].value = '';
                 }
             }
-            filterForm.submit();
+            applyFilters(filterForm);
         });
     }
 
-    // Automatisches Absenden nach Änderung eines Filters
+    // Filtern im Browser bzw. über Fragmente statt Absenden des Formulars
+    filterForm.addEventListener('submit', function(e) {
+        e.preventDefault();
+        applyFilters(filterForm);
+    });
+
+    // Automatisches Anwenden nach Änderung eines Filters
     const filterInputs = filterForm.querySelectorAll('select, input:not([type="submit"]):not([type="button"])');
     filterInputs.forEach(input => {
         input.addEventListener('change', function() {
-            filterForm.submit();
+            applyFilters(filterForm);
         });
     });
 }
 
+// Wendet die Filter im Browser an, tauscht die Fragmente der Seite aus oder sendet
+// als Rückfall das Formular
+function applyFilters(filterForm) {
+    const table = document.getElementById('raumbuch-table');
+
+    if (clientFilter) {
+        clientFilter.apply();
+    } else if (table && table.dataset.fragmentsUrl) {
+        loadReportFragments(filterForm, table).catch(error => {
+            console.error('Fehler beim Laden der Fragmente:', error);
+            filterForm.submit();
+        });
+    } else {
+        filterForm.submit();
+    }
+}
+
+// Erstellte Diagramme, damit sie bei Filterung im Browser aktualisiert werden können
+const reportCharts = {};
+
 // Chart-Erstellung mit Chart.js (wenn verfügbar)
 function createCharts() {
     if (typeof Chart === 'undefined') return;
@@ -168,7 +625,7 @@ function createBereichChart() {
     const backgroundColors = labels.map(() => getRandomColor());
 
     // Chart erstellen
-    new Chart(bereichChartElement, {
+    reportCharts.bereich = new Chart(bereichChartElement, {
         type: 'pie',
         data: {
             labels: labels,
@@ -211,7 +668,7 @@ function createRgChart() {
     const values = Object.values(chartData);
 
     // Chart erstellen
-    new Chart(rgChartElement, {
+    reportCharts.rg = new Chart(rgChartElement, {
         type: 'bar',
         data: {
             labels: labels,
@@ -264,7 +721,7 @@ function createEtageChart() {
     const values = Object.values(chartData);
 
     // Chart erstellen
-    new Chart(etageChartElement, {
+    reportCharts.etage = new Chart(etageChartElement, {
         type: 'bar',
         data: {
             labels: labels,
@@ -7,11 +7,16 @@ from unittest.mock import patch, MagicMock, ANY
 import os
 import tempfile
 
+from src.database.frames import RaumbuchFrameBuilder, encode_columnar
+from src.models.raumbuch import RAUMBUCH_COLUMNS
 from src.analysis.raumbuch_analysis import (
+    RaumbuchAnalysis,
     calculate_summary,
     prepare_data_for_visualization,
+    prepare_visualization_from_summary,
     export_to_excel,
     export_to_pdf,
+    export_filename,
     safe_number
 )
 
@@ -148,6 +153,86 @@ class TestAnalysis(unittest.TestCase):
         self.assertAlmostEqual(viz_data['rg_data']['C'], 17.15, places=2)
         self.assertAlmostEqual(viz_data['etage_data']['EG'], 0.82, places=2)
 
+    def test_prepare_visualization_from_summary(self):
+        """Die Diagrammdaten aus der Zusammenfassung entsprechen denen aus den Einzeldaten."""
+        viz_from_summary = prepare_visualization_from_summary(calculate_summary(self.test_data))
+        viz_data = prepare_data_for_visualization(self.test_data)
+
+        self.assertEqual(viz_from_summary['bereich_data'], viz_data['bereich_data'])
+        self.assertEqual(viz_from_summary['rg_data'], viz_data['rg_data'])
+        self.assertEqual(prepare_visualization_from_summary({}), {})
+
+    def test_typed_frame_matches_dict_rows(self):
+        """Ein spaltenweise geladener DataFrame liefert dieselben Ergebnisse wie die Zeilenliste."""
+        builder = RaumbuchFrameBuilder(RAUMBUCH_COLUMNS)
+        builder.append_dicts(self.test_data + self.test_data_with_nulls)
+        frame = builder.build()
+
+        expected = calculate_summary(self.test_data + self.test_data_with_nulls)
+        summary = calculate_summary(frame)
+        self.assertEqual(summary['total_rooms'], expected['total_rooms'])
+        self.assertAlmostEqual(summary['total_wert_jahr'], expected['total_wert_jahr'], places=2)
+        self.assertEqual(summary['bereich_stats'], expected['bereich_stats'])
+        self.assertEqual(summary['rg_stats'], expected['rg_stats'])
+
+        viz_data = prepare_data_for_visualization(frame)
+        self.assertEqual(viz_data, prepare_data_for_visualization(self.test_data + self.test_data_with_nulls))
+
+        # Der übergebene DataFrame bleibt unverändert
+        self.assertEqual(str(frame['Bereich'].dtype), 'category')
+
+    def test_encode_columnar_uses_dictionaries_for_categories(self):
+        """Kategorie-Spalten werden als Wörterbuch mit Codes, übrige Spalten als Werte kodiert."""
+        builder = RaumbuchFrameBuilder(RAUMBUCH_COLUMNS)
+        builder.append_dicts(self.test_data + self.test_data_with_nulls)
+        encoded = encode_columnar(builder.build(), ['ID', 'Bereich', 'qm', 'Bemerkung'])
+
+        self.assertEqual(list(encoded), ['ID', 'Bereich', 'qm', 'Bemerkung'])
+        bereich = encoded['Bereich']
+        self.assertEqual(bereich['dictionary'], sorted(bereich['dictionary']))
+        self.assertEqual([bereich['dictionary'][code] if code >= 0 else None for code in bereich['codes']],
+                         [row.get('Bereich') for row in self.test_data + self.test_data_with_nulls])
+        self.assertEqual(encoded['ID']['values'], [row['ID'] for row in self.test_data + self.test_data_with_nulls])
+        self.assertNotIn('codes', encoded['qm'])
+        self.assertIsNone(encoded['Bemerkung']['values'][-1])
+
+    def test_raumbuch_analysis_builds_frame_once(self):
+        """Zusammenfassung, Diagramme, Filteroptionen und Zeilen stammen aus einem DataFrame."""
+        data = self.test_data + self.test_data_with_nulls
+        analysis = RaumbuchAnalysis(data)
+
+        with patch('src.analysis.raumbuch_analysis.RaumbuchFrameBuilder',
+                   wraps=RaumbuchFrameBuilder) as mock_builder:
+            summary = analysis.summary
+            viz_data = analysis.viz_data
+            filter_options = analysis.filter_options
+            records = analysis.records
+            mock_builder.assert_called_once()
+
+        self.assertIs(analysis.summary, summary)
+        self.assertEqual(summary['total_rooms'], 3)
+        self.assertAlmostEqual(summary['total_wert_monat'], 22.15, places=2)
+        self.assertEqual(viz_data, prepare_data_for_visualization(data))
+        self.assertEqual(filter_options['bereiche'], ['Büro', 'Flur', 'Küche'])
+        self.assertEqual(filter_options['rg'], ['C'])
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[2]['qm'], 0.0)
+        self.assertEqual(records[0]['Bereich'], 'Küche')
+
+        empty = RaumbuchAnalysis([])
+        self.assertEqual(empty.summary, {})
+        self.assertEqual(empty.records, [])
+        self.assertEqual(empty.filter_options['etage'], [])
+
+    def test_export_filenames_are_unique(self):
+        """Gleichzeitige Exporte desselben Standorts erhalten verschiedene Dateinamen."""
+        first = export_filename('Teststandort', '.pdf')
+        second = export_filename('Teststandort', '.pdf')
+
+        self.assertNotEqual(first, second)
+        self.assertTrue(first.startswith('Raumbuch_Auswertung_Teststandort_'))
+        self.assertTrue(first.endswith('.pdf'))
+
     def test_safe_number(self):
         """Test der safe_number-Funktion."""
         # Test mit gültigen Zahlen
@@ -210,11 +295,11 @@ class TestAnalysis(unittest.TestCase):
         mock_writer_class.assert_called_once()
         mock_dataframe.assert_called()  # DataFrame wurde erstellt
 
-    @patch('pdfkit.from_string')
+    @patch('src.analysis.raumbuch_analysis.pdf_renderer')
     @patch('os.path.exists')
     @patch('os.makedirs')
     @patch('os.path.join')
-    def test_export_to_pdf(self, mock_join, mock_makedirs, mock_exists, mock_pdfkit):
+    def test_export_to_pdf(self, mock_join, mock_makedirs, mock_exists, mock_renderer):
         """Test der export_to_pdf-Funktion mit verbesserten Mocks."""
         # Mocks konfigurieren
         mock_exists.return_value = True
@@ -247,7 +332,7 @@ class TestAnalysis(unittest.TestCase):
 
         # Überprüfen, ob die grundlegenden Funktionen aufgerufen wurden
         mock_makedirs.assert_called()
-        mock_pdfkit.assert_called_once()
+        mock_renderer.render_to_file.assert_called_once_with('<html>Test</html>', '/fake/path/pdf_file.pdf')
         mock_template.render.assert_called_once()
 
 if __name__ == '__main__':
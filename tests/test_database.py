@@ -2,21 +2,39 @@
 Tests für die Datenbankfunktionen der RitterDigitalAuswertung-Anwendung.
 """
 
+import threading
+import time
 import unittest
+from decimal import Decimal
 from unittest.mock import patch, MagicMock
 
+import pyodbc
+
 from src.database.connection import (
     get_connection_string,
     get_db_connection,
     close_connection,
+    db_connection,
     test_connection
 )
+from src.database.pool import ConnectionPool, PoolTimeoutError
+from src.database.cache import RaumbuchCache, StandortIndex
 from src.database.queries import (
+    build_raumbuch_query,
+    normalize_filters,
     get_raumbuch_data,
+    get_raumbuch_summary,
+    get_raumbuch_filter_options,
+    get_raumbuch_page,
+    iter_raumbuch_rows,
+    get_raumbuch_frame,
+    get_raumbuch_version,
+    invalidate_raumbuch_cache,
     get_standorte,
-    get_standort_by_id
+    get_standort_by_id,
+    invalidate_standorte
 )
-from config.database import DATABASE_CONFIG
+from config.database import DATABASE_CONFIG, RAUMBUCH_VERSION_QUERY
 
 
 class TestDatabaseConnection(unittest.TestCase):
@@ -96,9 +114,102 @@ class TestDatabaseConnection(unittest.TestCase):
         self.assertFalse(result)
 
 
+class TestConnectionPool(unittest.TestCase):
+    """Testklasse für den Verbindungspool."""
+
+    def test_connection_is_reused(self):
+        """Eine zurückgegebene Verbindung wird ohne neuen Verbindungsaufbau wiederverwendet."""
+        factory = MagicMock(side_effect=lambda: MagicMock())
+        pool = ConnectionPool(factory, max_size=2)
+
+        conn1 = pool.acquire()
+        pool.release(conn1)
+        conn2 = pool.acquire()
+
+        self.assertIs(conn1, conn2)
+        self.assertEqual(factory.call_count, 1)
+        conn1.rollback.assert_called_once()
+
+        stats = pool.stats()
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['creations'], 1)
+        self.assertEqual(stats['in_use'], 1)
+
+    def test_checkout_waits_for_free_connection(self):
+        """Bei ausgeschöpftem Pool wird gewartet bzw. nach dem Timeout abgebrochen."""
+        pool = ConnectionPool(MagicMock, max_size=1, checkout_timeout=0.05)
+        conn = pool.acquire()
+
+        with self.assertRaises(PoolTimeoutError):
+            pool.acquire()
+
+        timer = threading.Timer(0.05, pool.release, args=(conn,))
+        timer.start()
+        try:
+            self.assertIs(pool.acquire(timeout=2), conn)
+        finally:
+            timer.join()
+
+        stats = pool.stats()
+        self.assertEqual(stats['waits'], 2)
+        self.assertEqual(stats['timeouts'], 1)
+        self.assertEqual(stats['creations'], 1)
+
+    def test_idle_and_expired_connections_are_evicted(self):
+        """Überzählige Leerlauf-Verbindungen und zu alte Verbindungen werden geschlossen."""
+        pool = ConnectionPool(MagicMock, min_size=1, max_size=3, idle_timeout=0, max_lifetime=3600)
+        conns = [pool.acquire() for _ in range(3)]
+        for conn in conns:
+            pool.release(conn)
+
+        pool.acquire()
+        self.assertEqual(pool.stats()['size'], 1)
+        self.assertEqual(pool.stats()['evictions'], 2)
+
+        pool = ConnectionPool(MagicMock, max_size=1, max_lifetime=0)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.close.assert_called_once()
+        self.assertIsNot(pool.acquire(), conn)
+
+    def test_dead_connection_is_replaced(self):
+        """Eine Verbindung, deren Lebendigkeitsprüfung fehlschlägt, wird ersetzt."""
+        dead = MagicMock()
+        dead.cursor.side_effect = Exception("Verbindung getrennt")
+        fresh = MagicMock()
+        pool = ConnectionPool(MagicMock(side_effect=[dead, fresh]), ping_after=0)
+
+        pool.release(pool.acquire())
+        self.assertIs(pool.acquire(), fresh)
+        dead.close.assert_called_once()
+        self.assertEqual(pool.stats()['failed_pings'], 1)
+
+    @patch('src.database.connection.get_pool')
+    def test_db_connection_discards_after_db_error(self, mock_get_pool):
+        """Nach einem Datenbankfehler wird die Verbindung nicht in den Pool zurückgelegt."""
+        mock_pool = mock_get_pool.return_value
+        mock_conn = mock_pool.acquire.return_value
+
+        with self.assertRaises(pyodbc.Error):
+            with db_connection():
+                raise pyodbc.Error("Abfrage fehlgeschlagen")
+        mock_pool.release.assert_called_once_with(mock_conn, discard=True)
+
+        mock_pool.reset_mock()
+        with db_connection() as conn:
+            self.assertIs(conn, mock_conn)
+        mock_pool.release.assert_called_once_with(mock_conn, discard=False)
+
+
 class TestDatabaseQueries(unittest.TestCase):
     """Testklasse für die Datenbankabfragen."""
 
+    def setUp(self):
+        """Caches vor jedem Test leeren."""
+        invalidate_raumbuch_cache()
+        invalidate_standorte()
+        self.addCleanup(invalidate_standorte)
+
     @patch('src.database.queries.db_connection')
     def test_get_raumbuch_data(self, mock_db_connection):
         """Test der get_raumbuch_data-Funktion."""
@@ -205,5 +316,455 @@ class TestDatabaseQueries(unittest.TestCase):
         mock_cursor.execute.assert_called_once()
         mock_cursor.fetchone.assert_called_once()
 
+class TestStandortIndex(unittest.TestCase):
+    """Testklasse für die Standortliste im Speicher."""
+
+    def setUp(self):
+        """Standortliste leeren."""
+        invalidate_standorte()
+        self.addCleanup(invalidate_standorte)
+
+    @patch('src.database.queries.db_connection')
+    def test_standorte_are_served_from_memory(self, mock_db_connection):
+        """Nach dem ersten Laden werden Standortliste und Einzelabfragen ohne Datenbank beantwortet."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_db_connection.return_value.__enter__.return_value = mock_conn
+        mock_cursor.description = [('ID',), ('Bezeichnung',)]
+        mock_cursor.fetchall.return_value = [(2, 'Berlin'), (1, 'München')]
+
+        self.assertEqual([s['ID'] for s in get_standorte()], [2, 1])
+        self.assertEqual(get_standort_by_id(1)['Bezeichnung'], 'München')
+        get_standorte()
+
+        mock_cursor.execute.assert_called_once()
+        mock_cursor.fetchone.assert_not_called()
+
+    def test_stale_index_refreshes_in_background(self):
+        """Eine veraltete Liste wird weiter ausgeliefert und im Hintergrund neu geladen."""
+        refreshed = threading.Event()
+        release = threading.Event()
+        names = iter(['Alt', 'Neu'])
+
+        def loader():
+            name = next(names, 'Neu')
+            if name == 'Neu':
+                release.wait(2)
+                refreshed.set()
+            return [{'ID': 1, 'Bezeichnung': name}]
+
+        index = StandortIndex(loader, refresh_interval=0)
+        self.assertEqual(index.get_all()[0]['Bezeichnung'], 'Alt')
+
+        # Während des Neuladens wird die bisherige Liste geliefert
+        self.assertEqual(index.get(1)['Bezeichnung'], 'Alt')
+        release.set()
+        self.assertTrue(refreshed.wait(2))
+        for _ in range(200):
+            if index._by_id[1]['Bezeichnung'] == 'Neu':
+                break
+            time.sleep(0.01)
+        self.assertEqual(index._by_id[1]['Bezeichnung'], 'Neu')
+
+    def test_invalidate_forces_reload(self):
+        """Nach invalidate() wird die Liste beim nächsten Zugriff neu geladen."""
+        loader = MagicMock(return_value=[{'ID': 1, 'Bezeichnung': 'Test'}])
+        index = StandortIndex(loader, refresh_interval=600)
+
+        index.get_all()
+        index.get_all()
+        index.invalidate()
+        self.assertIsNone(index.get(1))
+        index.get_all()
+
+        self.assertEqual(loader.call_count, 2)
+
+
+    def test_get_all_returns_loaded_list_despite_concurrent_invalidate(self):
+        """Ein invalidate() direkt nach dem Laden leert die bereits geladene Antwort nicht."""
+        index = StandortIndex(lambda: [{'ID': 1, 'Bezeichnung': 'Test'}], refresh_interval=600)
+
+        with patch('src.database.cache.logger') as mock_logger:
+            # Die Protokollmeldung fällt zwischen Übernahme der Liste und Rückgabe
+            mock_logger.info.side_effect = lambda *args: index.invalidate()
+            self.assertEqual(index.get_all(), [{'ID': 1, 'Bezeichnung': 'Test'}])
+
+        self.assertFalse(index.loaded)
+
+    def test_parallel_first_access_loads_once(self):
+        """Parallele Erstzugriffe warten auf eine gemeinsame Datenbankabfrage."""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            started.set()
+            release.wait(2)
+            return [{'ID': 1, 'Bezeichnung': 'Test'}]
+
+        index = StandortIndex(loader, refresh_interval=600)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(index.get_all())) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        self.assertTrue(started.wait(2))
+        release.set()
+        for thread in threads:
+            thread.join(2)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [[{'ID': 1, 'Bezeichnung': 'Test'}]] * 5)
+
+class TestRaumbuchCache(unittest.TestCase):
+    """Testklasse für den Ergebnis-Cache der Raumbuch-Daten."""
+
+    def setUp(self):
+        """Cache leeren und Mock-Verbindung vorbereiten."""
+        invalidate_raumbuch_cache()
+        self.addCleanup(invalidate_raumbuch_cache)
+
+        self.mock_conn = MagicMock()
+        self.mock_cursor = MagicMock()
+        self.mock_conn.cursor.return_value = self.mock_cursor
+        self.mock_cursor.description = [('ID',), ('Raumnummer',)]
+        self.mock_cursor.fetchone.return_value = (2, 2, 4711)
+        self.mock_cursor.fetchall.return_value = [(1, '101'), (2, '102')]
+
+        patcher = patch('src.database.queries.db_connection')
+        mock_db_connection = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock_db_connection.return_value.__enter__.return_value = self.mock_conn
+
+    def test_repeated_requests_are_served_from_cache(self):
+        """Innerhalb der TTL wird die Datenbank nur einmal abgefragt."""
+        first = get_raumbuch_data(standort_id=7)
+        second = get_raumbuch_data(standort_id=7)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.mock_cursor.execute.call_count, 1)
+        self.mock_cursor.fetchall.assert_called_once()
+
+    @patch('src.database.queries.raumbuch_cache.ttl', 0)
+    def test_unchanged_version_skips_full_query(self):
+        """Nach Ablauf der TTL genügt die Versionsabfrage, solange sich nichts geändert hat."""
+        get_raumbuch_data(standort_id=7)
+        result = get_raumbuch_data(standort_id=7)
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(self.mock_cursor.execute.call_count, 2)
+        self.mock_cursor.fetchall.assert_called_once()
+
+    @patch('src.database.queries.raumbuch_cache.ttl', 0)
+    def test_changed_version_reloads_data(self):
+        """Eine geänderte Datenversion führt zum erneuten Laden."""
+        get_raumbuch_data(standort_id=7)
+        self.mock_cursor.fetchone.return_value = (3, 3, 815)
+        self.mock_cursor.fetchall.return_value = [(1, '101'), (2, '102'), (3, '103')]
+
+        result = get_raumbuch_data(standort_id=7)
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(self.mock_cursor.fetchall.call_count, 2)
+
+    def test_version_is_taken_from_fresh_cache(self):
+        """Innerhalb der TTL liefert get_raumbuch_version die Version ohne Datenbankzugriff."""
+        get_raumbuch_data(standort_id=7)
+        self.assertEqual(get_raumbuch_version(7), (2, 2, 4711))
+        self.assertEqual(self.mock_cursor.execute.call_count, 1)
+
+        # Auch ohne Cache-Eintrag wird die Datenbank innerhalb der TTL nur einmal gefragt
+        self.assertEqual(get_raumbuch_version(8), (2, 2, 4711))
+        self.assertEqual(get_raumbuch_version(8), (2, 2, 4711))
+        self.assertEqual(self.mock_cursor.execute.call_count, 2)
+
+    @patch('src.database.queries.raumbuch_cache.ttl', 0)
+    def test_version_is_probed_after_ttl(self):
+        """Nach Ablauf der TTL wird die Datenversion erneut abgefragt."""
+        get_raumbuch_data(standort_id=7)
+        self.mock_cursor.fetchone.return_value = (3, 3, 815)
+
+        self.assertEqual(get_raumbuch_version(7), (3, 3, 815))
+        self.assertEqual(self.mock_cursor.execute.call_count, 2)
+
+    def test_filters_are_pushed_into_sql(self):
+        """Filter werden als parametrisierte WHERE-Bedingungen übergeben."""
+        filters = {'standort_id': '7', 'etage': 'EG', 'bereich': 'Büro', 'rg': ''}
+        self.assertEqual(normalize_filters(filters), (('bereich', 'Büro'), ('etage', 'EG')))
+
+        query, params = build_raumbuch_query(normalize_filters(filters))
+        self.assertIn('AND Bereich.Bezeichnung = ?', query)
+        self.assertIn('AND Etage.Bezeichnung = ?', query)
+        self.assertLess(query.index('AND Etage.Bezeichnung'), query.index('ORDER BY'))
+        self.assertEqual(params, ['Büro', 'EG'])
+
+        get_raumbuch_data(standort_id=7, filters=filters)
+        sql, sql_params = self.mock_cursor.execute.call_args[0]
+        self.assertIn('AND Bereich.Bezeichnung = ?', sql)
+        self.assertEqual(sql_params, (7, 7, 'Büro', 'EG'))
+
+    def test_filters_use_cached_unfiltered_data(self):
+        """Liegt der ganze Standort im Cache, wird ohne Datenbankzugriff gefiltert."""
+        self.mock_cursor.description = [('ID',), ('Bereich',)]
+        self.mock_cursor.fetchall.return_value = [(1, 'Küche'), (2, 'Büro')]
+        get_raumbuch_data(standort_id=7)
+
+        result = get_raumbuch_data(standort_id=7, filters={'bereich': 'Büro'})
+
+        self.assertEqual(result, [{'ID': 2, 'Bereich': 'Büro'}])
+        self.assertEqual(self.mock_cursor.execute.call_count, 1)
+
+    def test_cached_filters_match_like_sql_collation(self):
+        """Im Speicher wird wie mit der CI-Sortierfolge der Datenbank verglichen."""
+        self.mock_cursor.description = [('ID',), ('Bereich',)]
+        self.mock_cursor.fetchall.return_value = [(1, 'Küche'), (2, 'Büro '), (3, None)]
+        get_raumbuch_data(standort_id=7)
+
+        result = get_raumbuch_data(standort_id=7, filters={'bereich': 'BÜRO'})
+
+        self.assertEqual([row['ID'] for row in result], [2])
+        self.assertEqual(get_raumbuch_data(standort_id=7, filters={'bereich': 'Kuche'}), [])
+        self.assertEqual(self.mock_cursor.execute.call_count, 1)
+
+    def test_iter_raumbuch_rows_streams_in_batches(self):
+        """Zeilen werden blockweise per fetchmany gelesen und einzeln geliefert."""
+        self.mock_cursor.fetchmany.side_effect = [[(1, '101'), (2, '102')], [(3, '103')], []]
+
+        rows = iter_raumbuch_rows(standort_id=7, filters={'etage': 'EG'}, batch_size=2)
+        first = next(rows)
+
+        self.assertEqual(first, {'ID': 1, 'Raumnummer': '101'})
+        self.assertEqual(self.mock_cursor.fetchmany.call_count, 1)
+        self.assertEqual([row['ID'] for row in rows], [2, 3])
+        self.mock_cursor.fetchmany.assert_called_with(2)
+        self.mock_cursor.fetchall.assert_not_called()
+
+        sql, params = self.mock_cursor.execute.call_args[0]
+        self.assertIn('AND Etage.Bezeichnung = ?', sql)
+        self.assertEqual(params, (7, 'EG'))
+
+    def test_iter_raumbuch_rows_uses_fresh_cache(self):
+        """Liegt der Standort im Cache, wird ohne Datenbankzugriff gestreamt."""
+        self.mock_cursor.description = [('ID',), ('Bereich',)]
+        self.mock_cursor.fetchall.return_value = [(1, 'Küche'), (2, 'Büro')]
+        get_raumbuch_data(standort_id=7)
+
+        rows = list(iter_raumbuch_rows(standort_id=7, filters={'bereich': 'Küche'}))
+
+        self.assertEqual(rows, [{'ID': 1, 'Bereich': 'Küche'}])
+        self.mock_cursor.fetchmany.assert_not_called()
+
+    @patch.dict('src.database.queries.RAUMBUCH_CACHE_CONFIG', {'enabled': False})
+    def test_get_raumbuch_frame_fills_typed_columns(self):
+        """Ohne Cache werden Cursor-Blöcke direkt in float64- und Kategorie-Spalten übernommen."""
+        self.mock_cursor.description = [('ID',), ('Bereich',), ('RG',), ('qm',), ('WertMonat',)]
+        self.mock_cursor.fetchmany.side_effect = [
+            [(1, 'Küche', 'C', Decimal('20.50'), 9.82), (2, 'Büro', 'C', None, 7.33)],
+            [(3, 'Küche', None, Decimal('12.00'), None)],
+            []
+        ]
+
+        frame = get_raumbuch_frame(standort_id=7, filters={'etage': 'EG'}, batch_size=2)
+
+        self.assertEqual(list(frame.columns), ['ID', 'Bereich', 'RG', 'qm', 'WertMonat'])
+        self.assertEqual(str(frame['ID'].dtype), 'int64')
+        self.assertEqual(str(frame['qm'].dtype), 'float64')
+        self.assertEqual(frame['qm'].tolist(), [20.5, 0.0, 12.0])
+        self.assertEqual(frame['WertMonat'].tolist(), [9.82, 7.33, 0.0])
+        self.assertEqual(str(frame['Bereich'].dtype), 'category')
+        self.assertEqual(list(frame['Bereich'].cat.categories), ['Büro', 'Küche'])
+        self.assertEqual(frame['Bereich'].tolist(), ['Küche', 'Büro', 'Küche'])
+        self.assertTrue(frame['RG'].isna().iloc[2])
+
+        sql, params = self.mock_cursor.execute.call_args[0]
+        self.assertIn('AND Etage.Bezeichnung = ?', sql)
+        self.assertEqual(params, (7, 'EG'))
+        self.mock_cursor.fetchall.assert_not_called()
+
+    def test_get_raumbuch_frame_uses_fresh_cache(self):
+        """Liegt der Standort im Cache, wird der DataFrame ohne Datenbankzugriff erstellt."""
+        self.mock_cursor.description = [('ID',), ('Bereich',)]
+        self.mock_cursor.fetchall.return_value = [(1, 'Küche'), (2, 'Büro')]
+        get_raumbuch_data(standort_id=7)
+
+        frame = get_raumbuch_frame(standort_id=7, filters={'bereich': 'Büro'})
+
+        self.assertEqual(len(frame), 1)
+        self.assertEqual(frame['ID'].tolist(), [2])
+        self.assertEqual(frame['qm'].tolist(), [0.0])
+        self.mock_cursor.fetchmany.assert_not_called()
+
+    def test_get_raumbuch_frame_fills_and_reuses_cache(self):
+        """Ein Fehlzugriff legt das Ergebnis im Cache ab, danach wird der DataFrame wiederverwendet."""
+        self.mock_cursor.description = [('ID',), ('Bereich',)]
+        self.mock_cursor.fetchall.return_value = [(1, 'Küche'), (2, 'Büro')]
+
+        first = get_raumbuch_frame(standort_id=7)
+        first.loc[0, 'qm'] = 99.0
+        second = get_raumbuch_frame(standort_id=7)
+
+        self.assertEqual(second['ID'].tolist(), [1, 2])
+        self.assertEqual(second['qm'].tolist(), [0.0, 0.0])
+        self.assertEqual(self.mock_cursor.execute.call_count, 1)
+        # Die Zeilen stehen auch get_raumbuch_data zur Verfügung
+        self.assertEqual(len(get_raumbuch_data(standort_id=7)), 2)
+        self.assertEqual(self.mock_cursor.execute.call_count, 1)
+
+    @patch('src.database.queries.raumbuch_cache.ttl', 0)
+    def test_get_raumbuch_frame_revalidates_stale_cache(self):
+        """Nach Ablauf der TTL genügt die Versionsabfrage, solange sich nichts geändert hat."""
+        get_raumbuch_frame(standort_id=7)
+        frame = get_raumbuch_frame(standort_id=7)
+
+        self.assertEqual(frame['ID'].tolist(), [1, 2])
+        self.assertEqual(self.mock_cursor.execute.call_count, 2)
+        self.mock_cursor.fetchall.assert_called_once()
+
+    def test_get_raumbuch_frame_error_returns_empty_frame(self):
+        """Bei einem Datenbankfehler wird ein leerer DataFrame geliefert."""
+        self.mock_cursor.execute.side_effect = pyodbc.Error('Verbindung verloren')
+
+        frame = get_raumbuch_frame(standort_id=7)
+
+        self.assertTrue(frame.empty)
+        self.assertIn('WertMonat', frame.columns)
+
+    def test_summary_is_aggregated_in_sql(self):
+        """Die Zusammenfassung wird per GROUPING SETS berechnet und wie calculate_summary geformt."""
+        self.mock_cursor.description = [
+            ('GruppeBereich',), ('GruppeRG',), ('Bereich',), ('RG',), ('Anzahl',), ('qm',),
+            ('qmMonat',), ('WertMonat',), ('WertJahr',), ('StundenMonat',)
+        ]
+        self.mock_cursor.fetchall.return_value = [
+            (0, 1, 'Büro', None, 1, Decimal('15.30'), 66.25, 7.33, 87.96, 0.35),
+            (0, 1, 'Küche', None, 1, Decimal('20.50'), 88.77, 9.82, 117.84, 0.47),
+            (1, 0, None, 'C', 2, Decimal('35.80'), 155.02, 17.15, 205.8, 0.82),
+            (1, 1, None, None, 2, Decimal('35.80'), 155.02, 17.15, 205.8, 0.82),
+        ]
+
+        summary = get_raumbuch_summary(standort_id=7, filters={'etage': 'EG'})
+
+        sql, params = self.mock_cursor.execute.call_args[0]
+        self.assertIn('GROUPING SETS', sql)
+        self.assertIn('AND Etage.Bezeichnung = ?', sql)
+        self.assertEqual(params, (7, 7, 'EG'))
+
+        self.assertEqual(summary['total_rooms'], 2)
+        self.assertAlmostEqual(summary['total_qm'], 35.8)
+        self.assertAlmostEqual(summary['total_wert_jahr'], 205.8)
+        self.assertEqual([item['Bereich'] for item in summary['bereich_stats']], ['Büro', 'Küche'])
+        self.assertEqual(summary['rg_stats'], [
+            {'RG': 'C', 'qm': 35.8, 'WertMonat': 17.15, 'WertJahr': 205.8, 'StundenMonat': 0.82}
+        ])
+
+        # Zweiter Aufruf wird aus dem Cache beantwortet
+        get_raumbuch_summary(standort_id=7, filters={'etage': 'EG'})
+        self.mock_cursor.fetchall.assert_called_once()
+
+    def test_filter_options_are_grouped_in_sql(self):
+        """Die Filteroptionen werden per GROUPING SETS ermittelt und je Spalte sortiert."""
+        self.mock_cursor.description = [
+            ('GruppeBereich',), ('GruppeGebaeudeteil',), ('GruppeEtage',), ('GruppeRG',),
+            ('Bereich',), ('Gebaeudeteil',), ('Etage',), ('RG',)
+        ]
+        self.mock_cursor.fetchall.return_value = [
+            (0, 1, 1, 1, 'Küche', None, None, None),
+            (0, 1, 1, 1, 'Büro', None, None, None),
+            (1, 0, 1, 1, None, 'Hauptgebäude', None, None),
+            (1, 1, 0, 1, None, None, 'EG', None),
+            (1, 1, 0, 1, None, None, None, None),
+            (1, 1, 1, 0, None, None, None, 'C'),
+        ]
+
+        options = get_raumbuch_filter_options(standort_id=7, filters={'etage': 'EG'})
+
+        sql, params = self.mock_cursor.execute.call_args[0]
+        self.assertIn('GROUPING SETS', sql)
+        self.assertEqual(params, (7, 7, 'EG'))
+        self.assertEqual(options, {
+            'Bereich': ['Büro', 'Küche'],
+            'Gebaeudeteil': ['Hauptgebäude'],
+            'Etage': ['EG'],
+            'RG': ['C']
+        })
+
+    def test_version_query_covers_prices_and_lookups(self):
+        """Die Datenversion ändert sich auch mit Preisen des Standorts und verknüpften Bezeichnungen."""
+        for table_column in ('Standort.Preis,', 'Standort.Preis7Tage', 'Bereich.Bezeichnung',
+                             'Etage.Bezeichnung', 'BIRD.Reinigungsgruppe', 'BIRD.ReinigungsintervallTage'):
+            self.assertIn(table_column, RAUMBUCH_VERSION_QUERY)
+        # Die Standort-ID wird nur einmal übergeben, damit die Abfrage vorangestellt werden kann
+        self.assertEqual(RAUMBUCH_VERSION_QUERY.count('?'), 1)
+
+    def test_page_is_sorted_and_limited_in_sql(self):
+        """Eine Seite wird per ORDER BY und OFFSET/FETCH nur mit den gewählten Spalten gelesen."""
+        self.mock_cursor.description = [('Raumnummer',), ('qm',), ('Gesamt',)]
+        self.mock_cursor.fetchall.return_value = [('102', 30.0, 57), ('101', 20.5, 57)]
+
+        page = get_raumbuch_page(standort_id=7, filters={'etage': 'EG'}, sort='qm', descending=True,
+                                 offset=20, limit=2, columns=['Raumnummer', 'qm'])
+
+        sql, params = self.mock_cursor.execute.call_args[0]
+        self.assertIn('Raumbuch.qm DESC', sql)
+        self.assertIn('OFFSET ? ROWS FETCH NEXT ? ROWS ONLY', sql)
+        self.assertEqual(params, (7, 'EG', 20, 2))
+        self.assertEqual(page, {
+            'rows': [{'Raumnummer': '102', 'qm': 30.0}, {'Raumnummer': '101', 'qm': 20.5}],
+            'total': 57
+        })
+
+        with self.assertRaises(ValueError):
+            get_raumbuch_page(standort_id=7, sort='qm; DROP TABLE Raumbuch')
+
+    def test_page_of_cached_standort_is_sorted_in_memory(self):
+        """Liegt der Standort im Cache, wird die Seite ohne weitere Abfrage im Speicher gebildet."""
+        self.mock_cursor.description = [('ID',), ('Raumnummer',), ('Bereich',), ('qm',)]
+        self.mock_cursor.fetchall.return_value = [
+            (1, '101', 'Küche', 20.5), (2, '102', 'Büro', None), (3, '103', 'Büro', 20.5)
+        ]
+        get_raumbuch_data(standort_id=7)
+        self.mock_cursor.execute.reset_mock()
+
+        page = get_raumbuch_page(standort_id=7, sort='qm', descending=True, limit=2, columns=['ID'])
+        self.assertEqual(page, {'rows': [{'ID': 1}, {'ID': 3}], 'total': 3})
+
+        page = get_raumbuch_page(standort_id=7, filters={'bereich': 'Büro'}, sort='qm', offset=1)
+        self.assertEqual([row['Raumnummer'] for row in page['rows']], ['103'])
+        self.assertEqual(page['total'], 2)
+        self.mock_cursor.execute.assert_not_called()
+
+    def test_summary_of_empty_standort(self):
+        """Ein Standort ohne Räume liefert wie calculate_summary ein leeres Dictionary."""
+        self.mock_cursor.description = [
+            ('GruppeBereich',), ('GruppeRG',), ('Bereich',), ('RG',), ('Anzahl',), ('qm',),
+            ('qmMonat',), ('WertMonat',), ('WertJahr',), ('StundenMonat',)
+        ]
+        self.mock_cursor.fetchall.return_value = [(1, 1, None, None, 0, None, None, None, None, None)]
+
+        self.assertEqual(get_raumbuch_summary(standort_id=8), {})
+
+    def test_lru_eviction_respects_limits(self):
+        """Der Cache verdrängt die am längsten nicht genutzten Einträge."""
+        cache = RaumbuchCache(ttl=60, max_entries=2)
+        cache.put((1, ()), [{'ID': 1}], None)
+        cache.put((2, ()), [{'ID': 2}], None)
+        cache.get((1, ()))
+        cache.put((3, ()), [{'ID': 3}], None)
+
+        self.assertIsNotNone(cache.get((1, ())))
+        self.assertIsNone(cache.get((2, ())))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+        cache.put((1, (('etage', 'EG'),)), [{'ID': 1}], None)
+        cache.invalidate(1)
+        self.assertIsNone(cache.get((1, ())))
+        self.assertIsNone(cache.get((1, (('etage', 'EG'),))))
+
+        small_cache = RaumbuchCache(ttl=60, max_bytes=10)
+        small_cache.put((1, ()), [{'ID': 1}], None)
+        self.assertIsNone(small_cache.get((1, ())))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
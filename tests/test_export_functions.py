@@ -6,11 +6,20 @@ import unittest
 from unittest.mock import patch, MagicMock, ANY
 import os
 import tempfile
+import threading
+import re
+import time
 import pandas as pd
 import matplotlib.pyplot as plt
+import xlsxwriter
 from datetime import datetime
 
+from src.analysis import pdf_export, raumbuch_analysis
+from src.analysis.charts import ChartRenderer
+from src.analysis.templating import create_bytecode_cache, create_template_environment
+from src.analysis.export_cache import ExportCache
 from src.analysis.raumbuch_analysis import (
+    calculate_summary,
     export_to_excel,
     export_to_pdf,
     prepare_data_for_visualization
@@ -132,6 +141,121 @@ class TestExportFunctions(unittest.TestCase):
             if os.path.exists(temp_path):
                 os.unlink(temp_path)
 
+    def test_export_to_excel_from_generator(self):
+        """Der Excel-Export verarbeitet einen Zeilen-Generator in einem Durchlauf."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            rows = (dict(item) for item in self.test_data * 3)
+
+            with patch('src.analysis.raumbuch_analysis.EXPORT_CONFIG', {'excel': {'folder': temp_dir}}), \
+                 patch('src.analysis.raumbuch_analysis.frame_from_rows',
+                       wraps=raumbuch_analysis.frame_from_rows) as mock_frame:
+                result = export_to_excel(rows, 'TestStandort')
+
+            self.assertTrue(os.path.exists(result))
+            mock_frame.assert_called_once()
+            sheets = pd.read_excel(result, sheet_name=None)
+            self.assertEqual(len(sheets['Raumbuchdaten']), 6)
+            self.assertAlmostEqual(sheets['Raumbuchdaten']['qm'].sum(), 107.4, places=1)
+
+        # Leerer Generator erzeugt keine Datei
+        self.assertIsNone(export_to_excel(iter([]), 'TestStandort'))
+
+    def test_export_to_excel_streaming(self):
+        """Im Streaming-Modus wird ohne DataFrame geschrieben und im selben Durchlauf summiert."""
+        data = self.test_data * 3
+        with tempfile.TemporaryDirectory() as temp_dir:
+            rows = (dict(item, qm=None) if i == 0 else dict(item) for i, item in enumerate(data))
+
+            with patch('src.analysis.raumbuch_analysis.EXPORT_CONFIG', {'excel': {'folder': temp_dir}}), \
+                 patch('src.analysis.raumbuch_analysis.frame_from_rows') as mock_frame, \
+                 patch('src.analysis.excel_export.xlsxwriter.Workbook',
+                       wraps=xlsxwriter.Workbook) as mock_workbook:
+                result = export_to_excel(rows, 'TestStandort', streaming=True)
+
+            self.assertTrue(os.path.exists(result))
+            mock_frame.assert_not_called()
+            self.assertEqual(mock_workbook.call_args[0][1], {'constant_memory': True})
+
+            expected = calculate_summary([dict(item, qm=None) if i == 0 else item for i, item in enumerate(data)])
+            sheets = pd.read_excel(result, sheet_name=None)
+            self.assertEqual(len(sheets['Raumbuchdaten']), 6)
+            self.assertEqual(list(sheets['Raumbuchdaten'].columns), list(self.test_data[0].keys()))
+            self.assertAlmostEqual(sheets['Raumbuchdaten']['qm'].sum(), expected['total_qm'], places=2)
+            self.assertEqual(list(sheets['Zusammenfassung'].columns), ['Metrik', 'Wert'])
+            self.assertAlmostEqual(sheets['Zusammenfassung']['Wert'][3], expected['total_wert_jahr'], places=2)
+            self.assertEqual(sheets['Nach Bereich']['Bereich'].tolist(),
+                             [item['Bereich'] for item in expected['bereich_stats']])
+            self.assertEqual(sheets['Nach Reinigungsgruppe']['WertMonat'].round(2).tolist(),
+                             [round(item['WertMonat'], 2) for item in expected['rg_stats']])
+
+        # Die Quelldaten werden nicht verändert, leere Quellen erzeugen keine Datei
+        self.assertIsNone(self.test_data[0]['Reinigungstage'])
+        self.assertIsNone(export_to_excel(iter([]), 'TestStandort', streaming=True))
+
+    def test_export_to_excel_streaming_error_removes_file(self):
+        """Bricht die Zeilenquelle ab, bleibt keine unvollständige Datei im Export-Ordner."""
+        def rows():
+            # Mehr Zeilen als ein Block, damit der Fehler nach dem Anlegen der Datei auftritt
+            for i in range(1500):
+                yield dict(self.test_data[i % len(self.test_data)])
+            raise RuntimeError('Cursor-Fehler')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch('src.analysis.raumbuch_analysis.EXPORT_CONFIG', {'excel': {'folder': temp_dir}}):
+                self.assertIsNone(export_to_excel(rows(), 'TestStandort', streaming=True))
+
+            self.assertEqual(os.listdir(temp_dir), [])
+
+    def test_export_cache_keys_and_reuse(self):
+        """Exportdateien werden über Standort, Filter, Datenversion und Format adressiert."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ExportCache({'excel': temp_dir, 'pdf': temp_dir})
+            key = cache.make_key(1, (('etage', 'EG'),), (2, 2, 4711), 'excel')
+
+            self.assertNotEqual(key, cache.make_key(1, (('etage', 'EG'),), (3, 3, 815), 'excel'))
+            self.assertNotEqual(key, cache.make_key(1, (), (2, 2, 4711), 'excel'))
+            self.assertNotEqual(key, cache.make_key(1, (('etage', 'EG'),), (2, 2, 4711), 'pdf'))
+            self.assertIsNone(cache.get(key, 'excel'))
+
+            source = os.path.join(temp_dir, 'export.xlsx')
+            with open(source, 'wb') as f:
+                f.write(b'xlsx')
+            path = cache.put(key, 'excel', source)
+
+            self.assertFalse(os.path.exists(source))
+            self.assertTrue(path.endswith('.xlsx'))
+            self.assertEqual(cache.get(key, 'excel'), path)
+            self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_export_cache_eviction(self):
+        """Alte Dateien und Dateien über der Größenobergrenze werden gelöscht, auch in charts/."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            charts = os.path.join(temp_dir, 'charts')
+            os.makedirs(charts)
+            now = time.time()
+
+            def create(path, size, age):
+                with open(path, 'wb') as f:
+                    f.write(b'x' * size)
+                os.utime(path, (now - age, now - age))
+
+            create(os.path.join(charts, 'bereich_chart.png'), 10, 7200)
+            create(os.path.join(temp_dir, 'alt.xlsx'), 10, 60)
+            create(os.path.join(temp_dir, 'neuer.xlsx'), 10, 30)
+            create(os.path.join(temp_dir, 'neu.pdf'), 10, 0)
+
+            cache = ExportCache({'excel': temp_dir, 'pdf': temp_dir}, max_bytes=20, max_age=3600)
+            removed = cache.cleanup(force=True)
+
+            self.assertEqual(removed, 2)
+            self.assertFalse(os.path.exists(os.path.join(charts, 'bereich_chart.png')))
+            self.assertFalse(os.path.exists(os.path.join(temp_dir, 'alt.xlsx')))
+            self.assertTrue(os.path.exists(os.path.join(temp_dir, 'neuer.xlsx')))
+            self.assertTrue(os.path.exists(os.path.join(temp_dir, 'neu.pdf')))
+
+            # Innerhalb des Aufräumintervalls wird nicht erneut aufgeräumt
+            self.assertEqual(cache.cleanup(), 0)
+
     # Korrierte Version: Wir mocken die gesamte export_to_pdf Funktion
     @patch('src.analysis.raumbuch_analysis.export_to_pdf')
     def test_export_to_pdf_with_charts(self, mock_export_pdf):
@@ -147,6 +271,109 @@ class TestExportFunctions(unittest.TestCase):
         mock_export_pdf.assert_called_once_with(self.test_data, 'TestStandort', self.chart_data)
         self.assertEqual(result, expected_path)
 
+    def test_chart_renderer_caches_images(self):
+        """Diagramme werden ohne pyplot gezeichnet und für gleiche Daten wiederverwendet."""
+        renderer = ChartRenderer(max_entries=2, figsize=(4, 3), dpi=50)
+
+        charts = renderer.render_all(self.chart_data)
+        self.assertEqual(set(charts), {'bereich_chart', 'rg_chart', 'etage_chart'})
+        for png in charts.values():
+            self.assertTrue(png.startswith(b'\x89PNG'))
+
+        # Gleiche Daten in anderer Darstellung (Decimal/Zeichenkette) treffen denselben Eintrag
+        again = renderer.render('etage_chart', {'EG': '0.82'})
+        self.assertIs(again, charts['etage_chart'])
+        self.assertEqual(renderer.stats(), {'hits': 1, 'misses': 3, 'entries': 2})
+        self.assertIsNone(renderer.render('bereich_chart', {}))
+
+    def test_chart_renderer_is_thread_safe(self):
+        """Gleichzeitige Aufrufe aus mehreren Threads liefern vollständige Bilder."""
+        renderer = ChartRenderer(figsize=(4, 3), dpi=50)
+        results = {}
+
+        def render(i):
+            results[i] = renderer.render('bereich_chart', {f'Bereich {i}': i + 1.0, 'Flur': 2.0})
+
+        threads = [threading.Thread(target=render, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(results.values())), 8)
+        for png in results.values():
+            self.assertTrue(png.startswith(b'\x89PNG') and png.endswith(b'IEND\xaeB`\x82'))
+
+    def test_export_to_pdf_embeds_charts_as_data_uris(self):
+        """Der HTML-Export bettet die Diagramme ein und legt keine Bilddateien an."""
+        with tempfile.TemporaryDirectory() as temp_dir, \
+             patch.dict(raumbuch_analysis.EXPORT_CONFIG, {'pdf': {'folder': temp_dir}}), \
+             patch('src.analysis.raumbuch_analysis.pdf_renderer') as mock_renderer:
+            pdf_path = export_to_pdf(self.test_data, 'TestStandort', self.chart_data, engine='html')
+
+            self.assertTrue(pdf_path.startswith(temp_dir))
+            self.assertEqual(os.listdir(temp_dir), [])
+
+        html, path = mock_renderer.render_to_file.call_args[0]
+        self.assertEqual(path, pdf_path)
+        self.assertEqual(html.count('src="data:image/png;base64,'), 3)
+        self.assertIn('Raumbuch Auswertung - TestStandort', html)
+        self.assertIn('Besprechungsraum', html)
+
+    def test_template_bytecode_is_reused(self):
+        """Ein neu gestartetes Environment lädt report_pdf.html aus dem Bytecode-Cache."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = create_bytecode_cache(os.path.join(temp_dir, 'jinja2'))
+
+            first = create_template_environment(cache)
+            first.get_template('report_pdf.html')
+            self.assertTrue(os.listdir(os.path.join(temp_dir, 'jinja2')))
+
+            second = create_template_environment(cache)
+            with patch.object(second, 'compile', wraps=second.compile) as mock_compile:
+                template = second.get_template('report_pdf.html')
+                self.assertIs(second.get_template('report_pdf.html'), template)
+            mock_compile.assert_not_called()
+
+            html = template.render(title='<Test>', timestamp='', data=[], summary={}, charts={}, total_items=0)
+            self.assertIn('&lt;Test&gt;', html)
+
+    def test_export_to_pdf_native_contains_all_rows(self):
+        """Die native PDF-Engine schreibt alle Räume seitenweise und summiert die Zusammenfassung."""
+        rows = (dict(self.test_data[i % len(self.test_data)], ID=i) for i in range(95))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch.dict(raumbuch_analysis.EXPORT_CONFIG, {'pdf': {'folder': temp_dir}}):
+                pdf_path = export_to_pdf(rows, 'TestStandort', engine='native')
+
+            self.assertTrue(pdf_path.startswith(temp_dir))
+            with open(pdf_path, 'rb') as f:
+                content = f.read()
+
+        self.assertTrue(content.startswith(b'%PDF-'))
+        # 3 Tabellenseiten (40 Zeilen je Seite), Zusammenfassung, Nach Bereich, Nach Reinigungsgruppe
+        self.assertEqual(len(re.findall(rb'/Type\s*/Page\b', content)), 6)
+
+    def test_export_to_pdf_native_reads_rows_outside_lock(self):
+        """Zeilen werden gelesen, ohne die Sperre für die PDF-Schriften zu halten."""
+        locked = []
+
+        def rows():
+            for i in range(45):
+                locked.append(pdf_export._rc_lock.locked())
+                yield dict(self.test_data[i % len(self.test_data)], ID=i)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch.dict(raumbuch_analysis.EXPORT_CONFIG, {'pdf': {'folder': temp_dir}}):
+                self.assertIsNotNone(export_to_pdf(rows(), 'TestStandort', engine='native'))
+
+        self.assertEqual(len(locked), 45)
+        self.assertFalse(any(locked))
+
+    def test_export_to_pdf_unknown_engine(self):
+        """Eine unbekannte PDF-Engine liefert None."""
+        self.assertIsNone(export_to_pdf(self.test_data, 'TestStandort', engine='unbekannt'))
+
     def test_export_with_empty_data(self):
         """Test der Exportfunktionen mit leeren Daten."""
         # Export mit leeren Daten testen
@@ -222,12 +449,12 @@ class TestExportFunctions(unittest.TestCase):
             # Logger sollte den Fehler protokolliert haben
             mock_logger.error.assert_called()
 
-    @patch('pdfkit.from_string')
+    @patch('src.analysis.raumbuch_analysis.pdf_renderer')
     @patch('jinja2.Environment')
-    def test_export_to_pdf_exception_handling(self, mock_env, mock_pdfkit):
+    def test_export_to_pdf_exception_handling(self, mock_env, mock_renderer):
         """Test der Fehlerbehandlung beim PDF-Export."""
         # Simuliere eine Exception beim Erstellen des PDF
-        mock_pdfkit.side_effect = Exception("Testfehler beim PDF-Export")
+        mock_renderer.render_to_file.side_effect = Exception("Testfehler beim PDF-Export")
 
         # Protokollierung der Fehler patchen
         with patch('src.analysis.raumbuch_analysis.logger') as mock_logger:
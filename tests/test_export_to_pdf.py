@@ -0,0 +1,181 @@
+"""
+Tests für den Pool der PDF-Renderer.
+"""
+
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.analysis.pdf_renderer import (
+    FakePdfRenderer,
+    PdfRenderError,
+    PdfRenderTimeout,
+    PdfRendererPool,
+    WkhtmltopdfRenderer,
+    create_pdf_renderer_pool
+)
+
+# Ersatz für wkhtmltopdf --read-args-from-stdin: meldet wie wkhtmltopdf auf stderr
+# "Done" bzw. einen Fehler und schreibt den Pfad der HTML-Datei in das PDF
+FAKE_WKHTMLTOPDF = '''
+import shlex
+import sys
+
+for line in sys.stdin:
+    arguments = shlex.split(line)
+    html_path, output_path = arguments[-2:]
+    with open(html_path, encoding='utf-8') as f:
+        html = f.read()
+    if 'FEHLER' in html:
+        sys.stderr.write('Loading pages (1/6)\\nError: Failed loading page\\n'
+                         'Exit with code 1 due to network error: ContentNotFoundError\\n')
+    else:
+        with open(output_path, 'w') as f:
+            f.write('%PDF-1.4\\n% ' + html_path + '\\n%%EOF\\n')
+        if '--log-level' in arguments and 'info' in arguments:
+            sys.stderr.write('Done\\n')
+    sys.stderr.flush()
+'''
+
+
+class TestPdfRendererPool(unittest.TestCase):
+    """Testklasse für PdfRendererPool mit dem FakePdfRenderer."""
+
+    def setUp(self):
+        self.renderers = []
+
+    def factory(self, delay=0.0):
+        def create():
+            renderer = FakePdfRenderer(delay)
+            self.renderers.append(renderer)
+            return renderer
+        return create
+
+    def test_renderer_is_reused(self):
+        """Aufeinanderfolgende Aufträge verwenden denselben gestarteten Renderer."""
+        pool = PdfRendererPool(self.factory(), size=2)
+
+        with tempfile.TemporaryDirectory() as folder:
+            for i in range(3):
+                path = pool.render_to_file('<html></html>', os.path.join(folder, f'{i}.pdf'))
+                with open(path, 'rb') as f:
+                    content = f.read()
+                self.assertTrue(content.startswith(b'%PDF-'))
+                self.assertIn(b'%%EOF', content)
+
+        self.assertEqual(len(self.renderers), 1)
+        self.assertEqual(self.renderers[0].starts, 1)
+        self.assertEqual(self.renderers[0].renders, 3)
+        self.assertEqual(pool.stats()['rendered'], 3)
+
+        self.assertTrue(pool.render('<html></html>').startswith(b'%PDF-'))
+
+        pool.close()
+        self.assertTrue(self.renderers[0].closed)
+
+    def test_concurrency_is_capped(self):
+        """Es laufen nie mehr Aufträge gleichzeitig, als der Pool Renderer hat."""
+        pool = PdfRendererPool(self.factory(delay=0.05), size=2)
+        running = []
+        peak = []
+        lock = threading.Lock()
+        render = FakePdfRenderer.render
+
+        def tracked(renderer, html, output_path, timeout):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            try:
+                render(renderer, html, output_path, timeout)
+            finally:
+                with lock:
+                    running.pop()
+
+        with tempfile.TemporaryDirectory() as folder, \
+             patch.object(FakePdfRenderer, 'render', tracked):
+            threads = [
+                threading.Thread(target=pool.render_to_file,
+                                 args=('<html></html>', os.path.join(folder, f'{i}.pdf')))
+                for i in range(6)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertLessEqual(max(peak), 2)
+        self.assertLessEqual(len(self.renderers), 2)
+        self.assertEqual(pool.stats()['rendered'], 6)
+
+    def test_timeout_discards_renderer(self):
+        """Ein Auftrag über dem Zeitlimit bricht ab und der Renderer wird ersetzt."""
+        pool = PdfRendererPool(self.factory(delay=0.5), size=1, timeout=0.01)
+
+        with tempfile.TemporaryDirectory() as folder:
+            with self.assertRaises(PdfRenderTimeout):
+                pool.render_to_file('<html></html>', os.path.join(folder, 'a.pdf'))
+            self.assertTrue(self.renderers[0].closed)
+
+            pool.render_to_file('<html></html>', os.path.join(folder, 'b.pdf'), timeout=1)
+
+        self.assertEqual(len(self.renderers), 2)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_busy_pool_rejects_after_acquire_timeout(self):
+        """Wird kein Renderer frei, schlägt der Auftrag nach acquire_timeout fehl."""
+        pool = PdfRendererPool(self.factory(delay=0.3), size=1, acquire_timeout=0.01)
+
+        with tempfile.TemporaryDirectory() as folder:
+            thread = threading.Thread(target=pool.render_to_file,
+                                      args=('<html></html>', os.path.join(folder, 'a.pdf')))
+            thread.start()
+            time.sleep(0.05)
+            with self.assertRaises(PdfRenderError):
+                pool.render_to_file('<html></html>', os.path.join(folder, 'b.pdf'))
+            thread.join()
+
+    def test_wkhtmltopdf_errors_fail_fast(self):
+        """Fehlermeldungen von wkhtmltopdf beenden den Auftrag sofort statt nach dem Zeitlimit."""
+        with tempfile.TemporaryDirectory() as folder:
+            binary = os.path.join(folder, 'wkhtmltopdf')
+            with open(binary, 'w') as f:
+                f.write(f'#!{sys.executable}\n{FAKE_WKHTMLTOPDF}')
+            os.chmod(binary, os.stat(binary).st_mode | stat.S_IEXEC)
+
+            renderer = WkhtmltopdfRenderer(binary, {'quiet': '', 'page-size': 'A4'})
+            self.addCleanup(renderer.close)
+            output = os.path.join(folder, 'exports')
+            os.makedirs(output)
+
+            renderer.render('<html>ok</html>', os.path.join(output, 'a.pdf'), timeout=10)
+            with open(os.path.join(output, 'a.pdf')) as f:
+                html_path = f.read().splitlines()[1][2:]
+            # Die HTML-Datei liegt außerhalb des Export-Ordners und ist wieder gelöscht
+            self.assertNotEqual(os.path.dirname(html_path), output)
+            self.assertFalse(os.path.exists(html_path))
+
+            started = time.monotonic()
+            with self.assertRaises(PdfRenderError) as context:
+                renderer.render('<html>FEHLER</html>', os.path.join(output, 'b.pdf'), timeout=10)
+            self.assertLess(time.monotonic() - started, 5)
+            self.assertIn('Failed loading page', str(context.exception))
+            self.assertEqual(os.listdir(output), ['a.pdf'])
+
+    def test_create_pool_from_config(self):
+        """Der Renderer wird über die Konfiguration ausgewählt."""
+        pool = create_pdf_renderer_pool({'renderer': 'fake', 'workers': 3, 'timeout': 5})
+        pool.warm_up()
+
+        self.assertEqual(pool.size, 3)
+        self.assertEqual(pool.timeout, 5)
+        self.assertEqual(pool.stats()['idle'], 3)
+        pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
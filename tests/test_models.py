@@ -3,7 +3,16 @@ Tests für die Datenmodelle der RitterDigitalAuswertung-Anwendung.
 """
 
 import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src.analysis.raumbuch_analysis import safe_number
+from src.models.coercion import coerce_numeric, coerce_numeric_columns, coerce_numeric_rows
+from src.models.table import RaumbuchTable
 from src.models.raumbuch import (
+    RAUMBUCH_COLUMNS,
     RaumbuchEntry,
     convert_db_results_to_entries,
     validate_raumbuch_entries
@@ -208,6 +217,112 @@ class TestRaumbuchModel(unittest.TestCase):
         self.assertEqual(len(valid_errors), 0)  # Keine Fehler bei gültigen Einträgen
         self.assertGreater(len(invalid_errors), 0)  # Fehler bei ungültigen Einträgen
         self.assertIn('qm darf nicht negativ sein', invalid_errors[0])
+    def test_entry_has_no_instance_dict(self):
+        """RaumbuchEntry wird (ab Python 3.10) ohne __dict__ je Instanz angelegt."""
+        entry = RaumbuchEntry(id=1)
+        if hasattr(RaumbuchEntry, '__slots__'):
+            self.assertFalse(hasattr(entry, '__dict__'))
+        self.assertEqual(entry, RaumbuchEntry(id=1))
+
+
+class TestRaumbuchTable(unittest.TestCase):
+    """Testklasse für die spaltenweise Ablage von Raumbuch-Einträgen."""
+
+    def setUp(self):
+        """Ergebniszeilen wie aus dem Cursor vorbereiten."""
+        self.rows = [
+            (1, '101', 'Küche', 'Hauptgebäude', 'EG', 'Besprechungsraum', 'C', Decimal('20.50'), 1,
+             'Woche', 52.0, 4.33, 88.77, 9.82, 0.11, 0.47, 117.84, 187.0, None, None, None),
+            (2, '102', 'Büro', None, 'EG', 'Büro', 'C', None, 1,
+             'Woche', 52.0, None, None, 7.33, None, 0.35, 87.96, 191.0, None, None, None),
+        ]
+
+    def test_from_rows_matches_from_dict(self):
+        """Zeilenansichten entsprechen den mit from_dict erzeugten Einträgen."""
+        table = RaumbuchTable.from_rows(self.rows)
+        expected = [RaumbuchEntry.from_dict(dict(zip(RAUMBUCH_COLUMNS, row))) for row in self.rows]
+        expected[0].qm = 20.5  # Decimal wird als float abgelegt
+
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.to_entries(), expected)
+        self.assertEqual(table[-1], expected[1])
+        self.assertIsNone(table[1].qm)
+        self.assertIsInstance(table[0].anzahl, int)
+        self.assertEqual(str(table.column('qm').dtype), 'float64')
+        self.assertEqual(str(table.column('id').dtype), 'int64')
+        self.assertIs(table.column('etage')[0], table.column('etage')[1])
+        with self.assertRaises(IndexError):
+            table[2]
+
+    def test_from_cursor_reads_batches(self):
+        """Die Tabelle wird blockweise per fetchmany aus dem Cursor gefüllt."""
+        cursor = MagicMock()
+        cursor.description = [(column,) for column in RAUMBUCH_COLUMNS]
+        cursor.fetchmany.side_effect = [self.rows[:1], self.rows[1:], []]
+
+        table = RaumbuchTable.from_cursor(cursor, batch_size=1)
+
+        self.assertEqual([entry.raumnummer for entry in table], ['101', '102'])
+        self.assertEqual(table.column('wert_monat').tolist(), [9.82, 7.33])
+        cursor.fetchmany.assert_called_with(1)
+
+    def test_iteration_creates_entries_lazily(self):
+        """Beim Iterieren werden Einträge blockweise erzeugt, ohne to_entries aufzurufen."""
+        table = RaumbuchTable.from_rows(self.rows * 3)
+
+        with patch.object(RaumbuchTable, 'to_entries', side_effect=AssertionError), \
+                patch('src.models.table._ITER_CHUNK_SIZE', 4):
+            entries = iter(table)
+            self.assertEqual(next(entries).raumnummer, '101')
+            remaining = list(entries)
+
+        self.assertEqual([entry.raumnummer for entry in remaining], ['102', '101', '102', '101', '102'])
+        self.assertEqual([table[0]] + remaining, table.to_entries())
+
+    def test_from_dicts_with_missing_columns(self):
+        """Fehlende Spalten werden mit NULL aufgefüllt, leere Tabellen sind erlaubt."""
+        table = RaumbuchTable.from_dicts([{'ID': 5, 'Raumnummer': '501', 'qm': '12.5'}])
+
+        self.assertEqual(table[0], RaumbuchEntry(id=5, raumnummer='501', qm=12.5, anzahl=None,
+                                                 rg_jahr=None, rg_monat=None, qm_monat=None,
+                                                 wert_monat=None, stunden_tag=None, stunden_monat=None,
+                                                 wert_jahr=None, qm_stunde=None))
+        self.assertEqual(len(RaumbuchTable.from_dicts([])), 0)
+        self.assertEqual(RaumbuchTable.from_rows([]).to_entries(), [])
+
+
+class TestNumericCoercion(unittest.TestCase):
+    """Testklasse für die spaltenweise Umwandlung numerischer Werte."""
+
+    def test_coerce_numeric_matches_safe_number(self):
+        """Die spaltenweise Umwandlung behandelt dieselben Fälle wie safe_number."""
+        values = [Decimal('20.50'), None, 7, 3.25, '4.5', ' 1e3 ', 'ungültig', '', True, [1], '1_000']
+
+        result = coerce_numeric(values).tolist()
+
+        self.assertEqual(result, [safe_number(value) for value in values])
+        self.assertEqual(coerce_numeric([None, 'x'], default=-1.0).tolist(), [-1.0, -1.0])
+        self.assertEqual(coerce_numeric([float('nan'), Decimal('NaN')]).tolist(), [0.0, 0.0])
+
+    def test_coerce_numeric_columns(self):
+        """Nur vorhandene, noch nicht umgewandelte Spalten werden ersetzt."""
+        df = pd.DataFrame({'qm': [Decimal('1.5'), None], 'WertMonat': [2.0, None], 'Bereich': ['A', 'B']})
+
+        result = coerce_numeric_columns(df, ['qm', 'WertMonat', 'StundenTag'], copy=True)
+
+        self.assertEqual(result['qm'].tolist(), [1.5, 0.0])
+        self.assertEqual(result['WertMonat'].tolist(), [2.0, 0.0])
+        self.assertNotIn('StundenTag', result.columns)
+        self.assertIsNone(df['qm'].iloc[1])  # Original bleibt bei copy=True unverändert
+
+    def test_coerce_numeric_rows(self):
+        """Zeilen-Dictionaries werden blockweise umgewandelt, Textfelder bleiben erhalten."""
+        rows = [{'qm': '12', 'Bereich': None}, {'qm': None, 'Bereich': 'Flur'}]
+
+        coerce_numeric_rows(rows, ['qm', 'WertMonat'])
+
+        self.assertEqual(rows, [{'qm': 12.0, 'Bereich': None}, {'qm': 0.0, 'Bereich': 'Flur'}])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
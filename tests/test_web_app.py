@@ -4,9 +4,12 @@ Tests für die Web-App-Funktionen der RitterDigitalAuswertung-Anwendung.
 
 import unittest
 from unittest.mock import patch, MagicMock
+import gzip
 import os
+import zlib
 import flask
 
+from src.analysis.templating import bytecode_cache
 from src.web.app import create_app, render_error_page
 
 
@@ -30,6 +33,10 @@ class TestWebApp(unittest.TestCase):
         self.assertIn('SECRET_KEY', app.config)
         self.assertIn('DEBUG', app.config)
 
+    def test_templates_use_shared_bytecode_cache(self):
+        """Flask lädt kompilierte Templates aus demselben Bytecode-Cache wie der PDF-Export."""
+        self.assertIs(self.app.jinja_env.bytecode_cache, bytecode_cache)
+
     def test_context_processor(self):
         """Test des Kontext-Prozessors für Templates."""
         with self.app.test_request_context():
@@ -104,5 +111,46 @@ class TestWebApp(unittest.TestCase):
         self.assertIn(b'Benutzerdefinierter Testfehler', response.data)
 
 
+    def test_responses_are_gzip_compressed(self):
+        """Textantworten ab der Mindestgröße werden komprimiert, kleine und binäre nicht."""
+        html = '<tr><td>Besprechungsraum</td><td>20.50</td></tr>' * 200
+
+        @self.app.route('/test-compression/<kind>')
+        def compression_route(kind):
+            if kind == 'html':
+                return html
+            if kind == 'small':
+                return '<p>klein</p>'
+            return flask.Response(b'\x89PNG' * 500, mimetype='image/png')
+
+        response = self.client.get('/test-compression/html', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(gzip.decompress(response.data).decode('utf-8'), html)
+        self.assertLess(len(response.data), len(html) // 10)
+
+        self.assertNotIn('Content-Encoding', self.client.get('/test-compression/html').headers)
+        for kind in ('small', 'png'):
+            response = self.client.get(f'/test-compression/{kind}', headers={'Accept-Encoding': 'gzip'})
+            self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_streamed_response_is_compressed_per_chunk(self):
+        """Gestreamte Antworten werden blockweise komprimiert, jeder Block ist sofort lesbar."""
+        chunks = ['<html><body>' + 'Kopf ' * 200, '<table>' + '<tr><td>101</td></tr>' * 200, '</table></body></html>']
+
+        @self.app.route('/test-compression-stream')
+        def stream_route():
+            return flask.Response(iter(chunks), mimetype='text/html')
+
+        response = self.client.get('/test-compression-stream', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', response.headers)
+
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        parts = [decompressor.decompress(block).decode('utf-8') for block in response.response]
+        response.close()
+        self.assertEqual(parts[0], chunks[0])
+        self.assertEqual(''.join(parts), ''.join(chunks))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
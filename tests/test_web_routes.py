@@ -7,9 +7,23 @@ import unittest
 from unittest.mock import patch, MagicMock, ANY
 import json
 import io
+import os
+import tempfile
+import threading
+import time
 
+import pandas as pd
+
+from src.analysis.export_cache import ExportCache
 from src.web.app import create_app
-from src.web.routes import apply_filters, create_filter_options, preprocess_data
+from src.web.export_jobs import ExportJob, ExportJobQueue, ExportQueueFullError
+from src.web.routes import (
+    apply_filters,
+    create_filter_options,
+    preprocess_data,
+    iter_preprocessed_data,
+    iter_apply_filters
+)
 
 class TestWebRoutesExtended(unittest.TestCase):
     """Erweiterte Testklasse für die Web-Routen."""
@@ -91,6 +105,23 @@ class TestWebRoutesExtended(unittest.TestCase):
         self.assertEqual(result[0]['StundenTag'], 0.0)  # Ungültiger Wert zu 0.0 konvertiert
         self.assertIsNone(result[0]['Gebaeudeteil'])  # Textfeld bleibt None
 
+    def test_streaming_pipeline_is_lazy(self):
+        """Vorverarbeitung und Filter verarbeiten Generatoren zeilenweise."""
+        consumed = []
+
+        def source():
+            for item in self.test_raumbuch_data:
+                consumed.append(item['ID'])
+                yield dict(item, qm=None)
+
+        rows = iter_apply_filters(iter_preprocessed_data(source()), {'rg': 'B'})
+        self.assertEqual(consumed, [])
+
+        result = list(rows)
+        self.assertEqual([item['ID'] for item in result], [2])
+        self.assertEqual(result[0]['qm'], 0.0)
+        self.assertEqual(consumed, [1, 2])
+
     def test_apply_filters_without_filters(self):
         """Test von apply_filters ohne aktive Filter."""
         # ImmutableMultiDict simulieren
@@ -192,7 +223,8 @@ class TestWebRoutesExtended(unittest.TestCase):
 
         # Export-Fehler
         with patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
-             patch('src.web.routes.get_raumbuch_data', return_value=[]), \
+             patch('src.web.routes.get_raumbuch_version', return_value=None), \
+             patch('src.web.routes.iter_raumbuch_rows', return_value=iter([])), \
              patch('src.web.routes.export_to_excel', return_value=None):
             response = self.client.get('/export/excel/1')
             self.assertEqual(response.status_code, 302)  # Redirect
@@ -206,11 +238,189 @@ class TestWebRoutesExtended(unittest.TestCase):
 
         # Export-Fehler
         with patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
-             patch('src.web.routes.get_raumbuch_data', return_value=[]), \
+             patch('src.web.routes.get_raumbuch_version', return_value=None), \
+             patch('src.web.routes.get_raumbuch_frame', return_value=pd.DataFrame()), \
              patch('src.web.routes.export_to_pdf', return_value=None):
             response = self.client.get('/export/pdf/1')
             self.assertEqual(response.status_code, 302)  # Redirect
 
+    def test_export_is_served_from_export_cache(self):
+        """Eine Exportdatei wird für denselben Datenstand nur einmal erzeugt."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ExportCache({'excel': temp_dir, 'pdf': temp_dir})
+
+            def fake_export(rows, standort_name, streaming=False):
+                path = os.path.join(temp_dir, 'neu.xlsx')
+                with open(path, 'wb') as f:
+                    f.write(b'xlsx')
+                return path
+
+            with patch('src.web.routes.export_cache', cache), \
+                 patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
+                 patch('src.web.routes.get_raumbuch_version', return_value=(2, 2, 4711)) as mock_version, \
+                 patch('src.web.routes.iter_raumbuch_rows', return_value=iter([])), \
+                 patch('src.web.routes.export_to_excel', side_effect=fake_export) as mock_export:
+                first = self.client.get('/export/excel/1?etage=EG')
+                second = self.client.get('/export/excel/1?etage=EG')
+                other = self.client.get('/export/excel/1?etage=OG')
+
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(second.data, b'xlsx')
+            self.assertIn('Raumbuch_Auswertung_Test_', second.headers['Content-Disposition'])
+            self.assertEqual(other.status_code, 200)
+            self.assertEqual(mock_export.call_count, 2)
+            self.assertEqual(cache.stats()['hits'], 1)
+            # ETag und Export-Cache teilen sich eine Versionsabfrage je Request
+            self.assertEqual(mock_version.call_count, 3)
+            for response in (first, second, other):
+                response.close()
+
+    def test_pdf_export_engine_is_selectable(self):
+        """Die PDF-Engine wird je Export gewählt und ist Teil des Cache-Schlüssels."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ExportCache({'excel': temp_dir, 'pdf': temp_dir})
+            engines = []
+
+            def fake_export(rows, standort_name, charts_data=None, summary=None, engine=None):
+                engines.append(engine)
+                path = os.path.join(temp_dir, 'neu.pdf')
+                with open(path, 'wb') as f:
+                    f.write(b'%PDF')
+                return path
+
+            with patch('src.web.routes.export_cache', cache), \
+                 patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
+                 patch('src.web.routes.get_raumbuch_version', return_value=(2, 2, 4711)), \
+                 patch('src.web.routes.get_raumbuch_summary', return_value={}), \
+                 patch('src.web.routes.get_raumbuch_frame', return_value=pd.DataFrame(self.test_raumbuch_data)), \
+                 patch('src.web.routes.iter_raumbuch_rows', return_value=iter([])) as mock_rows, \
+                 patch('src.web.routes.export_to_pdf', side_effect=fake_export):
+                responses = [self.client.get('/export/pdf/1?engine=native'),
+                             self.client.get('/export/pdf/1?engine=html'),
+                             self.client.get('/export/pdf/1?engine=native')]
+
+            self.assertEqual(engines, ['native', 'html'])
+            mock_rows.assert_called_once()
+            self.assertEqual(cache.stats()['hits'], 1)
+            for response in responses:
+                self.assertEqual(response.status_code, 200)
+                response.close()
+
+    def test_export_job_lifecycle(self):
+        """Exportaufträge werden im Hintergrund erzeugt und nach Abschluss ausgeliefert."""
+        queue = ExportJobQueue(max_workers=1)
+        release = threading.Event()
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'Raumbuch.xlsx')
+
+            def build(standort_id, standort_name, filters):
+                release.wait(5)
+                with open(path, 'wb') as f:
+                    f.write(b'excel')
+                return path
+
+            with patch('src.web.routes.export_jobs', queue), \
+                 patch.dict('src.web.routes.EXPORT_BUILDERS', {'excel': build}), \
+                 patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}):
+
+                response = self.client.post('/export/excel/1/jobs?bereich=B%C3%BCro')
+                self.assertEqual(response.status_code, 202)
+                job = json.loads(response.data)
+                self.assertIn(job['status'], (ExportJob.QUEUED, ExportJob.RUNNING))
+
+                # Gleicher Auftrag wird zusammengelegt, solange er läuft
+                response = self.client.post('/export/excel/1/jobs?bereich=B%C3%BCro')
+                self.assertEqual(json.loads(response.data)['job_id'], job['job_id'])
+
+                # Download vor Abschluss wird abgelehnt
+                response = self.client.get(job['download_url'])
+                self.assertEqual(response.status_code, 409)
+
+                release.set()
+                queue.shutdown()
+
+                response = self.client.get(job['status_url'])
+                self.assertEqual(json.loads(response.data)['status'], ExportJob.DONE)
+
+                response = self.client.get(job['download_url'])
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data, b'excel')
+                response.close()
+
+                # Unbekannte Formate und Aufträge
+                self.assertEqual(self.client.post('/export/csv/1/jobs').status_code, 404)
+                self.assertEqual(self.client.get('/export/jobs/unbekannt').status_code, 404)
+
+    def test_export_job_queue_failures_and_limit(self):
+        """Fehlgeschlagene Exporte werden gemeldet, volle Warteschlangen abgewiesen."""
+        queue = ExportJobQueue(max_workers=1, max_pending=1)
+        release = threading.Event()
+
+        def fail():
+            raise RuntimeError("Testfehler")
+
+        job = queue.submit(lambda: release.wait(5) and None, key='a')
+        with self.assertRaises(ExportQueueFullError):
+            queue.submit(fail, key='b')
+
+        release.set()
+        queue.shutdown()
+        self.assertEqual(job.status, ExportJob.FAILED)
+
+        failed = queue.submit(fail, key='b')
+        queue.shutdown()
+        self.assertEqual(failed.status, ExportJob.FAILED)
+        self.assertEqual(failed.error, 'Testfehler')
+        self.assertIs(queue.get(failed.id), failed)
+
+    def test_export_job_is_never_finished_without_finished_at(self):
+        """Während ein Worker abschließt, gilt ein Auftrag erst mit finished_at als abgeschlossen."""
+        queue = ExportJobQueue(max_workers=2)
+        inconsistent = []
+        real_time = time.time
+
+        def checked_time():
+            # Wird u.a. beim Setzen von finished_at aufgerufen; dort darf noch kein Status final sein
+            inconsistent.extend(job.id for job in list(queue._jobs.values())
+                                if job.finished and job.finished_at is None)
+            return real_time()
+
+        def fail():
+            raise RuntimeError("Testfehler")
+
+        with patch('src.web.export_jobs.time') as mock_time:
+            mock_time.time.side_effect = checked_time
+            jobs = [queue.submit(lambda: 'export.xlsx'), queue.submit(lambda: None), queue.submit(fail)]
+            queue.shutdown()
+
+            self.assertEqual([job.status for job in jobs], [ExportJob.DONE, ExportJob.FAILED, ExportJob.FAILED])
+            self.assertTrue(all(job.finished_at is not None for job in jobs))
+            self.assertEqual(queue.result_paths(), {'export.xlsx'})
+        self.assertEqual(inconsistent, [])
+
+    def test_export_job_results_survive_cleanup(self):
+        """Ergebnisse abrufbarer Aufträge bleiben beim Aufräumen des Export-Ordners erhalten."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = os.path.join(temp_dir, 'auftrag.xlsx')
+            with open(result, 'wb') as f:
+                f.write(b'x' * 10)
+            os.utime(result, (0, 0))
+
+            queue = ExportJobQueue(max_workers=1)
+            job = queue.submit(lambda: result)
+            queue.shutdown()
+            self.assertEqual(queue.result_paths(), {result})
+
+            source = os.path.join(temp_dir, 'neu.xlsx')
+            with open(source, 'wb') as f:
+                f.write(b'x' * 10)
+            cache = ExportCache({'excel': temp_dir}, max_bytes=10, max_age=3600)
+            cache.put('schluessel', 'excel', source, keep=queue.result_paths())
+
+            self.assertTrue(os.path.exists(result))
+            self.assertEqual(queue.get(job.id).path, result)
+
     def test_index_with_data(self):
         """Test der Startseite mit ausgewähltem Standort und Daten."""
         # Vollständigeres Mock-Objekt für summary erstellen
@@ -240,10 +450,9 @@ class TestWebRoutesExtended(unittest.TestCase):
 
         with patch('src.web.routes.get_standorte', return_value=[{'ID': 1, 'Bezeichnung': 'Test'}]), \
              patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
-             patch('src.web.routes.get_raumbuch_data', return_value=self.test_raumbuch_data), \
-             patch('src.web.routes.preprocess_data', return_value=self.test_raumbuch_data), \
-             patch('src.web.routes.calculate_summary', return_value=mock_summary), \
-             patch('src.web.routes.prepare_data_for_visualization', return_value=viz_data):
+             patch('src.web.routes.get_raumbuch_summary', return_value=mock_summary), \
+             patch('src.web.routes.prepare_visualization_from_summary', return_value=viz_data), \
+             patch('src.web.routes.get_raumbuch_frame') as mock_data:
 
             response = self.client.get('/?standort_id=1')
 
@@ -251,12 +460,243 @@ class TestWebRoutesExtended(unittest.TestCase):
             self.assertEqual(response.status_code, 200)
             # Überprüfen, ob die Zusammenfassung angezeigt wird
             self.assertIn(b'Zusammenfassung', response.data)
+            # Die einzelnen Räume werden für die Startseite nicht geladen
+            mock_data.assert_not_called()
+
+    def test_report_passes_filters_to_query(self):
+        """Die Report-Seite übergibt die Filter an die Datenbankabfrage."""
+        with patch('src.web.routes.get_standorte', return_value=[{'ID': 1, 'Bezeichnung': 'Test'}]), \
+             patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
+             patch('src.web.routes.get_raumbuch_frame', return_value=pd.DataFrame(self.test_raumbuch_data[1:])) as mock_data:
+
+            response = self.client.get('/report?standort_id=1&bereich=B%C3%BCro')
+
+            self.assertEqual(response.status_code, 200)
+            standort_id, filters = mock_data.call_args[0]
+            self.assertEqual(standort_id, 1)
+            self.assertEqual(filters.get('bereich'), 'Büro')
+            self.assertIn('Nebengebäude'.encode('utf-8'), response.data)
+
+    def test_report_streaming_flushes_header_before_rows(self):
+        """Im Streaming-Modus werden Kopf und Zusammenfassung vor dem Lesen der Räume gesendet."""
+        started = []
+
+        def rows(standort_id, filters):
+            started.append(True)
+            yield from (dict(row) for row in self.test_raumbuch_data)
+
+        summary = {'total_rooms': 3, 'total_qm': 45.8, 'bereich_stats': [], 'rg_stats': []}
+        options = {'Bereich': ['Büro', 'Küche'], 'Gebaeudeteil': [], 'Etage': ['EG'], 'RG': ['C']}
+
+        with patch('src.web.routes.get_standorte', return_value=[{'ID': 1, 'Bezeichnung': 'Test'}]), \
+             patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
+             patch('src.web.routes.get_raumbuch_summary', return_value=summary), \
+             patch('src.web.routes.get_raumbuch_filter_options', return_value=options), \
+             patch('src.web.routes.get_raumbuch_frame') as mock_data, \
+             patch('src.web.routes.iter_raumbuch_rows', side_effect=rows):
+
+            response = self.client.get('/report?standort_id=1&stream=1', buffered=False)
+            self.assertTrue(response.is_streamed)
+
+            chunks = response.iter_encoded()
+            first = next(chunks).decode('utf-8')
+            self.assertIn('45.80', first)
+            self.assertIn('<option value="Küche"', first)
+            self.assertEqual(started, [])
+
+            rest = b''.join(chunks).decode('utf-8')
+            response.close()
+
+        self.assertEqual(started, [True])
+        self.assertIn('Besprechungsraum', rest)
+        self.assertIn('</html>', rest)
+        self.assertNotIn('<!-- flush -->', first + rest)
+        mock_data.assert_not_called()
+
+    def test_api_raumbuch_returns_sorted_page(self):
+        """Die Raumbuch-API übergibt Filter, Sortierung und Spalten und liefert eine Seite als JSON."""
+        page = {'rows': [{'Raumnummer': '102', 'qm': None}], 'total': 3}
+        with patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
+             patch('src.web.routes.get_raumbuch_page', return_value=page) as mock_page:
+
+            response = self.client.get('/api/raumbuch/1?bereich=B%C3%BCro&sort=-qm&offset=1&limit=1'
+                                       '&columns=Raumnummer,qm')
+
+            self.assertEqual(response.status_code, 200)
+            standort_id, filters = mock_page.call_args[0]
+            self.assertEqual(standort_id, 1)
+            self.assertEqual(filters.get('bereich'), 'Büro')
+            self.assertEqual(mock_page.call_args[1], {
+                'sort': 'qm', 'descending': True, 'offset': 1, 'limit': 1, 'columns': ['Raumnummer', 'qm']
+            })
+            payload = json.loads(response.data)
+            self.assertEqual(payload['rows'], [{'Raumnummer': '102', 'qm': 0.0}])
+            self.assertEqual(payload['total'], 3)
+            self.assertEqual(payload['next_offset'], 2)
+
+            mock_page.side_effect = ValueError('Unbekannte Spalte: Preis')
+            self.assertEqual(self.client.get('/api/raumbuch/1?sort=Preis').status_code, 400)
+            self.assertEqual(self.client.get('/api/raumbuch/1?limit=abc').status_code, 400)
+
+    def test_report_virtual_table_loads_rows_from_api(self):
+        """Die virtuelle Tabelle rendert keine Zeilen, sondern lädt sie als kompakte Listen über die API."""
+        summary = {'total_rooms': 2, 'total_qm': 45.5, 'bereich_stats': [], 'rg_stats': []}
+        with patch('src.web.routes.get_standorte', return_value=[{'ID': 1, 'Bezeichnung': 'Test'}]), \
+             patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
+             patch('src.web.routes.get_raumbuch_summary', return_value=summary), \
+             patch('src.web.routes.get_raumbuch_filter_options', return_value={}), \
+             patch('src.web.routes.get_raumbuch_frame') as mock_data, \
+             patch('src.web.routes.get_raumbuch_page',
+                   return_value={'rows': self.test_raumbuch_data[:1], 'total': 2}):
+
+            html = self.client.get('/report?standort_id=1&virtual=1').get_data(as_text=True)
+
+            self.assertIn('data-virtual="true"', html)
+            self.assertIn('data-api-url="/api/raumbuch/1"', html)
+            self.assertIn('data-total="2"', html)
+            self.assertNotIn('Besprechungsraum', html)
+            mock_data.assert_not_called()
+
+            payload = json.loads(self.client.get('/api/raumbuch/1?compact=1&columns=ID,Raumnummer,qm').data)
+            self.assertEqual(payload['columns'], ['ID', 'Raumnummer', 'qm'])
+            self.assertEqual(payload['rows'], [[1, '101', 20.5]])
+
+    def test_report_client_filter_loads_columnar_data(self):
+        """Bei Filterung im Browser werden alle Werte angeboten und die Spalten einmal geladen."""
+        summary = {'total_rooms': 2, 'total_qm': 45.5, 'bereich_stats': [], 'rg_stats': []}
+        with patch('src.web.routes.get_standorte', return_value=[{'ID': 1, 'Bezeichnung': 'Test'}]), \
+             patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
+             patch('src.web.routes.get_raumbuch_summary', return_value=summary), \
+             patch('src.web.routes.get_raumbuch_filter_options',
+                   return_value={'Bereich': ['Büro', 'Küche']}) as mock_options:
+
+            html = self.client.get('/report?standort_id=1&client_filter=1&bereich=B%C3%BCro').get_data(as_text=True)
+
+            self.assertIn('data-columnar-url="/api/raumbuch/1/columns"', html)
+            self.assertIn('data-summary="total_qm"', html)
+            self.assertIn('Küche', html)
+            self.assertEqual(mock_options.call_args[0], (1, None))
+
+        frame = MagicMock()
+        frame.__len__.return_value = 2
+        encoded = {'Bereich': {'dictionary': ['Büro', 'Küche'], 'codes': [1, 0]}}
+        with patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
+             patch('src.web.routes.get_raumbuch_frame', return_value=frame), \
+             patch('src.web.routes.encode_columnar', return_value=encoded) as mock_encode:
+
+            payload = json.loads(self.client.get('/api/raumbuch/1/columns?columns=Bereich').data)
+
+            self.assertEqual(payload, {'standort_id': 1, 'total': 2, 'columns': encoded})
+            mock_encode.assert_called_once_with(frame, ['Bereich'])
+            self.assertEqual(self.client.get('/api/raumbuch/1/columns?columns=Preis').status_code, 400)
+
+    def test_report_fragments_return_only_filtered_parts(self):
+        """Die Fragmente enthalten Zeilen, Zusammenfassung, Summen und Diagrammdaten ohne Layout."""
+        with patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
+             patch('src.web.routes.get_standorte') as mock_standorte, \
+             patch('src.web.routes.get_raumbuch_frame', return_value=pd.DataFrame(self.test_raumbuch_data[1:])) as mock_data:
+
+            response = self.client.get('/report/1/fragments?bereich=B%C3%BCro')
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(mock_data.call_args[0][1].get('bereich'), 'Büro')
+            mock_standorte.assert_not_called()
+
+            fragments = json.loads(response.data)
+            self.assertEqual(fragments['total'], len(self.test_raumbuch_data[1:]))
+            self.assertIn('Nebengebäude', fragments['rows'])
+            self.assertNotIn('Besprechungsraum', fragments['rows'])
+            self.assertNotIn('<html', fragments['rows'])
+            self.assertIn('data-summary="total_rooms"', fragments['summary'])
+            self.assertIn('Summen:', fragments['footer'])
+            self.assertIn('Büro', fragments['viz_data']['bereich_data'])
+
+        with patch('src.web.routes.get_standort_by_id', return_value=None):
+            self.assertEqual(self.client.get('/report/99/fragments').status_code, 404)
+
+    def test_report_page_uses_fragment_partials(self):
+        """Die vollständige Seite enthält dieselben Teilbereiche und die Adresse der Fragmente."""
+        with patch('src.web.routes.get_standorte', return_value=[{'ID': 1, 'Bezeichnung': 'Test'}]), \
+             patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
+             patch('src.web.routes.get_raumbuch_frame', return_value=pd.DataFrame(self.test_raumbuch_data)):
+
+            html = self.client.get('/report?standort_id=1').get_data(as_text=True)
+
+            self.assertIn('data-fragments-url="/report/1/fragments"', html)
+            self.assertIn('id="report-summary"', html)
+            self.assertIn('Besprechungsraum', html)
+            self.assertIn('Summen:', html)
+
+    def test_report_answers_if_none_match_before_loading_data(self):
+        """Bei unveränderter Datenversion und gleichen Filtern antwortet der Report mit 304 ohne Abfrage."""
+        with patch('src.web.routes.get_standorte', return_value=[{'ID': 1, 'Bezeichnung': 'Test'}]), \
+             patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
+             patch('src.web.routes.get_raumbuch_version', return_value=(3, 3, 4711)) as mock_version, \
+             patch('src.web.routes.get_raumbuch_frame', return_value=pd.DataFrame(self.test_raumbuch_data)) as mock_data:
+
+            response = self.client.get('/report?standort_id=1&bereich=B%C3%BCro')
+            etag = response.headers['ETag']
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('no-cache', response.headers['Cache-Control'])
+
+            response = self.client.get('/report?standort_id=1&bereich=B%C3%BCro', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.headers['ETag'], etag)
+            mock_data.assert_called_once()
+
+            # Andere Filter oder geänderte Daten ergeben einen neuen ETag
+            response = self.client.get('/report?standort_id=1&bereich=K%C3%BCche', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 200)
+            mock_version.return_value = (4, 4, 815)
+            response = self.client.get('/report?standort_id=1&bereich=B%C3%BCro', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 200)
+
+            # Ohne Datenversion wird kein ETag gesetzt
+            mock_version.return_value = None
+            self.assertNotIn('ETag', self.client.get('/report?standort_id=1').headers)
+
+    def test_standorte_and_exports_support_if_none_match(self):
+        """Standort-API und Exporte werden bei passendem ETag nicht erneut erzeugt."""
+        standorte = [{'ID': 1, 'Bezeichnung': 'Test'}]
+        with patch('src.web.routes.get_standorte', return_value=standorte):
+            etag = self.client.get('/api/standorte').headers['ETag']
+            self.assertEqual(self.client.get('/api/standorte', headers={'If-None-Match': etag}).status_code, 304)
+
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
+            tmp.write(b'excel')
+        self.addCleanup(os.remove, tmp.name)
+
+        with patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
+             patch('src.web.routes.get_raumbuch_version', return_value=(3, 3, 4711)), \
+             patch('src.web.routes.create_excel_export', return_value=tmp.name) as mock_create:
+
+            response = self.client.get('/export/excel/1?etage=EG')
+            etag = response.headers['ETag']
+            self.assertEqual(response.status_code, 200)
+            response.close()
+
+            response = self.client.get('/export/excel/1?etage=EG', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            mock_create.assert_called_once()
+
+    def test_api_etag_leaves_flash_messages_pending(self):
+        """JSON-Antworten mit ETag verbrauchen keine Flash-Meldungen der nächsten Seite."""
+        with self.client.session_transaction() as session:
+            session['_flashes'] = [('warning', 'Hinweis')]
+
+        with patch('src.web.routes.get_standorte', return_value=[{'ID': 1, 'Bezeichnung': 'Test'}]):
+            response = self.client.get('/api/standorte')
+
+        self.assertIn('ETag', response.headers)
+        self.assertNotIn('Cookie', response.headers.get('Vary', ''))
+        with self.client.session_transaction() as session:
+            self.assertEqual(session['_flashes'], [('warning', 'Hinweis')])
 
     def test_index_with_error(self):
         """Test der Startseite mit einem Fehler während der Datenverarbeitung."""
         with patch('src.web.routes.get_standorte', return_value=[{'ID': 1, 'Bezeichnung': 'Test'}]), \
              patch('src.web.routes.get_standort_by_id', return_value={'ID': 1, 'Bezeichnung': 'Test'}), \
-             patch('src.web.routes.get_raumbuch_data', side_effect=Exception("Testfehler")):
+             patch('src.web.routes.get_raumbuch_summary', side_effect=Exception("Testfehler")):
 
             response = self.client.get('/?standort_id=1')
 